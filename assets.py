@@ -0,0 +1,115 @@
+"""Process-wide cache for the logo image and its pre-scaled variants.
+
+The logo file is located and decoded once per process; the GUI header, the
+About dialog and the report engine then share resized copies instead of
+probing the file names and decoding the PNG on every use.
+"""
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image as PILImage
+
+# Logo candidates, in order of preference
+LOGO_FILES: List[str] = [
+    "inosys_logo.png", "inosys_logo.jpg", "inosys_logo.jpeg",
+    "logo.png", "logo.jpg", "logo.jpeg",
+    "icon.png", "icon.jpg", "icon.jpeg"
+]
+
+# Display heights in pixels for the GUI variants
+GUI_HEADER_LOGO_HEIGHT = 80
+ABOUT_LOGO_HEIGHT = 60
+# Variants are kept at twice their display height so they stay sharp on scaled displays
+HIDPI_FACTOR = 2
+
+
+class LogoAsset:
+    """A decoded logo image with cached resized variants"""
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        with PILImage.open(path) as image:
+            self.image: PILImage.Image = image.copy()
+        self.size: Tuple[int, int] = self.image.size
+        self.aspect_ratio: float = self.size[0] / self.size[1]
+        self._variants: Dict[Tuple[int, int], PILImage.Image] = {}
+        self._lock = threading.Lock()
+
+    def width_for_height(self, height: float) -> float:
+        """Return the width that keeps the aspect ratio at the given height"""
+        return height * self.aspect_ratio
+
+    def scaled(self, height: int, resample: int = PILImage.LANCZOS) -> PILImage.Image:
+        """Return the logo resized to the given pixel height, never upscaled"""
+        height = min(int(height), self.size[1])
+        with self._lock:
+            variant = self._variants.get((height, resample))
+            if variant is None:
+                if height == self.size[1]:
+                    variant = self.image
+                else:
+                    variant = self.image.resize((max(1, round(self.width_for_height(height))), height), resample)
+                self._variants[(height, resample)] = variant
+        return variant
+
+    def gui_image(self, display_height: int) -> Tuple[PILImage.Image, Tuple[int, int]]:
+        """Return a GUI variant and its display size for a CTkImage"""
+        image = self.scaled(display_height * HIDPI_FACTOR)
+        return image, (int(self.width_for_height(display_height)), display_height)
+
+
+_logo_paths: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], Optional[str]] = {}
+_logo_assets: Dict[str, Optional[LogoAsset]] = {}
+_cache_lock = threading.Lock()
+
+
+def find_logo_file(search_dirs: Optional[Sequence[str]] = None,
+                   candidates: Sequence[str] = LOGO_FILES) -> Optional[str]:
+    """Return the first logo file found in the search directories (default: current directory)"""
+    key = (tuple(search_dirs or [""]), tuple(candidates))
+    with _cache_lock:
+        if key in _logo_paths:
+            return _logo_paths[key]
+
+    found: Optional[str] = None
+    for directory in key[0]:
+        for logo_file in candidates:
+            candidate = os.path.join(directory, logo_file) if directory else logo_file
+            if os.path.exists(candidate):
+                found = candidate
+                break
+        if found:
+            break
+
+    with _cache_lock:
+        _logo_paths[key] = found
+    return found
+
+
+def get_logo(path: Optional[str] = None) -> Optional[LogoAsset]:
+    """Return the decoded logo for a path (default: the first logo found), or None if unavailable"""
+    path = path or find_logo_file()
+    if not path:
+        return None
+
+    with _cache_lock:
+        if path in _logo_assets:
+            return _logo_assets[path]
+
+    try:
+        asset: Optional[LogoAsset] = LogoAsset(path)
+    except Exception as e:
+        print(f"Error loading logo from {path}: {str(e)}")
+        asset = None
+
+    with _cache_lock:
+        _logo_assets[path] = asset
+    return asset
+
+
+def clear_cache() -> None:
+    """Forget resolved logo paths and decoded images"""
+    with _cache_lock:
+        _logo_paths.clear()
+        _logo_assets.clear()
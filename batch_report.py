@@ -0,0 +1,230 @@
+"""Command-line batch rendering of case description files into drilling protocol PDFs.
+
+Each case file is a JSON document such as::
+
+    {
+        "doctor_name": "Dr. Smith",
+        "patient_name": "Jane Doe",
+        "case_number": "C-1042",
+        "case_notes": "Optional notes",
+        "implants": [
+            {"tooth_number": 8, "diameter": 3.5, "length": 8.5, "offset": 10, "surgical_approach": "flapless"},
+            {"teeth": [19, 30], "diameter": 4.5, "length": 10, "offset": 11.5, "surgical_approach": "flap"}
+        ]
+    }
+
+Cases are resolved against the catalog in the parent process and the
+CPU-bound ReportLab layout is fanned out over a process pool. With --merge
+all cases are laid out into one PDF instead, one case per page group.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Optional, Tuple
+
+import catalog
+import report_engine
+from plan_store import ImplantPlan, PlanStore
+
+
+class CaseError(Exception):
+    """Raised when a case description cannot be turned into implant plans"""
+
+
+def load_case(case_path: str) -> Dict[str, Any]:
+    """Load a case description file"""
+    with open(case_path, 'r', encoding='utf-8') as f:
+        case = json.load(f)
+
+    if not isinstance(case, dict) or not case.get('implants'):
+        raise CaseError("Case file must be an object with a non-empty 'implants' list")
+
+    return case
+
+
+def resolve_case_plans(case: Dict[str, Any], implant_index: catalog.ImplantIndex) -> PlanStore:
+    """Resolve the implants of a case against the catalog into implant plans"""
+    plans = PlanStore()
+
+    if not isinstance(case['implants'], list):
+        raise CaseError("'implants' must be a list of implant entries")
+
+    for index, entry in enumerate(case['implants']):
+        if not isinstance(entry, dict):
+            raise CaseError(f"Implant entry {index} must be an object, not {entry!r}")
+
+        teeth = entry.get('teeth', [entry.get('tooth_number')])
+        if not isinstance(teeth, list):
+            raise CaseError(f"Implant entry {index}: 'teeth' must be a list of tooth numbers")
+        try:
+            diameter = float(entry['diameter'])
+            length = float(entry['length'])
+            offset = float(entry['offset'])
+        except (KeyError, TypeError, ValueError):
+            raise CaseError(f"Implant entry needs numeric diameter, length and offset: {entry}")
+
+        implant_line = entry.get('implant_line', 'Primus')
+        record = implant_index.lookup(implant_line, diameter, length, offset)
+        if record is None:
+            raise CaseError(f"No matching implant found for {diameter}mm x {length}mm (Offset: {offset}mm)")
+        if record.invalid_drills:
+            raise CaseError(f"Invalid implant/drill length combination for {diameter}mm x {length}mm "
+                            f"(Offset: {offset}mm): {', '.join(record.invalid_drills)}")
+
+        for tooth_number in teeth:
+            if not isinstance(tooth_number, int) or not 1 <= tooth_number <= 32:
+                raise CaseError(f"Invalid tooth number: {tooth_number}")
+
+            # A later entry for the same tooth replaces the earlier one, as in the GUI
+            plans.set(ImplantPlan(
+                tooth_number=tooth_number,
+                implant_line=implant_line,
+                diameter=diameter,
+                length=length,
+                offset=offset,
+                surgical_approach=entry.get('surgical_approach', 'flapless'),
+                record=record
+            ))
+
+    return plans
+
+
+def _safe_name(value: Any) -> str:
+    return re.sub(r'[^\w\-. ]', '_', str(value)).strip() or "Case"
+
+
+def get_report_filename(case: Dict[str, Any], case_path: str, qualify: bool = False) -> str:
+    """Build the output PDF filename for a case.
+
+    qualify adds the case file name, for cases that share a case number with another case file.
+    """
+    case_stem = os.path.splitext(os.path.basename(case_path))[0]
+    case_id = case.get('case_number') or case_stem
+    if qualify:
+        return f"Primus_Report_{_safe_name(case_id)}_{_safe_name(case_stem)}.pdf"
+    return f"Primus_Report_{_safe_name(case_id)}.pdf"
+
+
+RenderJob = Tuple[str, PlanStore, Dict[str, Any], Optional[str], bool]
+
+
+def build_report_case(case: Dict[str, Any], plans: PlanStore) -> report_engine.ReportCase:
+    """Fill in the default metadata for a resolved case"""
+    return report_engine.ReportCase(
+        plans,
+        case.get('doctor_name') or report_engine.DEFAULT_DOCTOR_NAME,
+        case.get('patient_name') or report_engine.DEFAULT_PATIENT_NAME,
+        case.get('case_number') or report_engine.DEFAULT_CASE_NUMBER,
+        str(case.get('case_notes', '')).replace('\n', '<br/>')
+    )
+
+
+def render_case(job: RenderJob) -> Tuple[str, int]:
+    """Render a single resolved case to its output file (runs in a worker process)"""
+    output_path, plans, case, logo_path, compact = job
+    report_case = build_report_case(case, plans)
+    size = report_engine.create_pdf_report(
+        output_path,
+        report_case.plans,
+        report_case.doctor_name,
+        report_case.patient_name,
+        report_case.case_number,
+        report_case.case_notes,
+        logo_path=logo_path,
+        compact=compact
+    )
+    return output_path, size
+
+
+def run_batch(cases_dir: str, output_dir: str, catalog_path: str, workers: Optional[int] = None,
+              logo_path: Optional[str] = None, compact: bool = False, merge_path: Optional[str] = None) -> int:
+    """Render every case file in a directory to PDF, returning the number of failed cases.
+
+    With merge_path, all cases are written to that one PDF instead of a file per case.
+    """
+    implant_index = catalog.ImplantIndex(catalog.read_catalog(catalog_path))
+    os.makedirs(output_dir, exist_ok=True)
+
+    case_files = sorted(glob.glob(os.path.join(cases_dir, '*.json')))
+    if not case_files:
+        print(f"No case files found in {cases_dir}")
+        return 0
+
+    jobs: Dict[str, RenderJob] = {}
+    claimed_paths = set()  # Output paths already assigned, so parallel renders never share a file
+    failures = 0
+    total_bytes = 0
+
+    for case_path in case_files:
+        try:
+            case = load_case(case_path)
+            plans = resolve_case_plans(case, implant_index)
+            output_path = os.path.join(output_dir, get_report_filename(case, case_path))
+            if os.path.normcase(output_path) in claimed_paths:
+                output_path = os.path.join(output_dir, get_report_filename(case, case_path, qualify=True))
+            if os.path.normcase(output_path) in claimed_paths:
+                raise CaseError(f"Output file {output_path} is already used by another case")
+            claimed_paths.add(os.path.normcase(output_path))
+            jobs[case_path] = (output_path, plans, case, logo_path, compact)
+        except (OSError, ValueError, CaseError) as e:
+            print(f"[FAILED] {case_path}: {e}")
+            failures += 1
+
+    if merge_path:
+        return failures + render_merged(jobs, merge_path, logo_path, compact)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(render_case, job): case_path for case_path, job in jobs.items()}
+        for future in as_completed(futures):
+            case_path = futures[future]
+            try:
+                output_path, size = future.result()
+                total_bytes += size
+                print(f"[OK] {case_path} -> {output_path} ({report_engine.format_file_size(size)})")
+            except Exception as e:
+                print(f"[FAILED] {case_path}: {e}")
+                failures += 1
+
+    print(f"Rendered {len(case_files) - failures} of {len(case_files)} cases to {output_dir} "
+          f"({report_engine.format_file_size(total_bytes)} total)")
+    return failures
+
+
+def render_merged(jobs: Dict[str, RenderJob], merge_path: str, logo_path: Optional[str], compact: bool) -> int:
+    """Render resolved cases into a single PDF, returning 1 if it could not be written"""
+    if not jobs:
+        print("No valid cases to merge")
+        return 0
+
+    report_cases = [build_report_case(case, plans) for _, plans, case, _, _ in jobs.values()]
+    try:
+        size = report_engine.create_merged_pdf_report(merge_path, report_cases, logo_path=logo_path,
+                                                      compact=compact)
+    except Exception as e:
+        print(f"[FAILED] {merge_path}: {e}")
+        return 1
+
+    print(f"Merged {len(report_cases)} cases into {merge_path} ({report_engine.format_file_size(size)})")
+    return 0
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser for batch mode"""
+    parser = argparse.ArgumentParser(
+        description="Render a directory of case description files into Primus drilling protocol PDFs."
+    )
+    parser.add_argument('--batch', metavar='CASES_DIR', required=True,
+                        help="Directory containing one JSON case description per file")
+    parser.add_argument('--output', metavar='OUTPUT_DIR',
+                        help="Directory for the generated PDFs (default: CASES_DIR/reports)")
+    parser.add_argument('--catalog', metavar='CSV', help="Implant catalog CSV to resolve implants against")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes (default: one per CPU)")
+    parser.add_argument('--merge', metavar='PDF',
+                        help="Write all cases into this single PDF, one case per page group")
+    parser.add_argument('--compact', action='store_true',
+                        help="Downsample embedded images and compress them at the maximum level")
+    return parser
@@ -0,0 +1,285 @@
+"""Headless benchmarks for catalog loading, implant lookup, PDF rendering and batch mode.
+
+Usage::
+
+    python benchmark.py                                   # run and print results
+    python benchmark.py --save-baseline benchmark_baseline.json
+    python benchmark.py --compare benchmark_baseline.json --threshold 0.25
+
+Compare mode exits with status 1 when any benchmark's best time is slower
+than its baseline by more than the threshold, so deploy_update.bat can stop
+before a slower build is copied to the update share. Baselines are only
+meaningful on the machine that recorded them.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+import catalog
+from plan_store import ImplantPlan
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_THRESHOLD = 0.25  # Fractional slowdown that counts as a regression
+
+LONG_NOTES = "<br/>".join(
+    f"Note {index}: verify sleeve seating and irrigation before the next drill; patient on anticoagulants, "
+    f"review bleeding protocol." for index in range(25)
+)
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Time func over repeat runs, returning median/min/max in milliseconds"""
+    func()  # Warm-up, so one-off imports and caches are not charged to the first sample
+
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'median_ms': round(statistics.median(samples), 4),
+        'min_ms': round(min(samples), 4),
+        'max_ms': round(max(samples), 4),
+        'repeat': repeat
+    }
+
+
+def write_synthetic_catalog(path: str, rows: int) -> None:
+    """Write a catalog CSV with the shipped columns and unique implant configurations"""
+    import pandas as pd
+
+    rng = random.Random(rows)
+    records = []
+    for index in range(rows):
+        drills = [str(rng.choice([8.5, 10.0, 11.5, 13.0, 'x'])) if rng.random() < 0.1 else str(11.5)
+                  for _ in catalog.DRILL_FIELDS]
+        records.append([
+            f"Line{index // 3000}", f"PBF{index:06d}", round(3.0 + (index % 40) * 0.1, 1),
+            6.0 + ((index // 40) % 25) * 0.5, f"CGSC-{index % 9999:04d}", 21.5, (10.0, 11.5, 13.0)[(index // 1000) % 3]
+        ] + drills)
+    pd.DataFrame(records, columns=catalog.REQUIRED_COLUMNS).to_csv(path, index=False)
+
+
+def bench_catalog(results: Dict[str, Any], name: str, csv_path: str, repeat: int, work_dir: str) -> None:
+    """Benchmark a cold CSV load with an index build and a warm load of the cached index"""
+    results[f"catalog.read_csv.{name}"] = measure(
+        lambda: catalog.ImplantIndex(catalog.read_catalog(csv_path)), repeat)
+
+    cache_dir = os.path.join(work_dir, f"cache_{name}")
+    os.makedirs(cache_dir, exist_ok=True)
+    results[f"catalog.load_cached.{name}"] = measure(
+        lambda: catalog.load_index(csv_path, cache_dir), repeat)
+
+
+def bench_lookup(results: Dict[str, Any], csv_path: str, repeat: int) -> None:
+    """Benchmark the per-click lookup done by add_implants_to_plan"""
+    implant_data = catalog.read_catalog(csv_path)
+    index = catalog.ImplantIndex(implant_data)
+    configurations = [
+        (row['Implant Line'], row['Implant Diameter'], row['Implant Length'], row['Offset'])
+        for row in implant_data.to_dict('records')
+    ]
+    rng = random.Random(1)
+    queries = [rng.choice(configurations) for _ in range(1000)]
+
+    def run_queries() -> int:
+        invalid = 0
+        for query in queries:
+            record = index.lookup(*query)
+            if record is not None and record.invalid_drills:
+                invalid += 1
+        return invalid
+
+    result = measure(run_queries, repeat)
+    # Report per lookup rather than per thousand
+    for field in ('median_ms', 'min_ms', 'max_ms'):
+        result[field] = round(result[field] / len(queries), 6)
+    results["lookup.add_implants"] = result
+
+
+def make_plans(index: catalog.ImplantIndex, count: int) -> List[ImplantPlan]:
+    """Build plans for the first count teeth against a valid catalog configuration"""
+    record = index.lookup('Primus', 4.0, 10.0, 11.5)
+    if record is None:
+        raise RuntimeError("Benchmark configuration Primus 4.0 x 10.0 (11.5) is missing from the catalog")
+    return [
+        ImplantPlan(tooth, 'Primus', 4.0, 10.0, 11.5, 'flapless' if tooth % 2 else 'flap', record)
+        for tooth in range(1, count + 1)
+    ]
+
+
+def bench_render(results: Dict[str, Any], csv_path: str, repeat: int) -> None:
+    """Benchmark report rendering for 1, 8 and 32 implants, with and without long notes"""
+    import report_engine
+
+    index = catalog.ImplantIndex(catalog.read_catalog(csv_path))
+    logo_path = report_engine.find_logo_file()
+
+    for count in (1, 8, 32):
+        plans = make_plans(index, count)
+        for label, notes in (("", ""), (".notes", LONG_NOTES)):
+            results[f"render.{count}_implants{label}"] = measure(
+                lambda: report_engine.render_pdf_bytes(plans, "Dr. Bench", "Patient", "B-1", notes,
+                                                       logo_path=logo_path),
+                repeat)
+
+
+def bench_batch(results: Dict[str, Any], csv_path: str, cases: int, work_dir: str) -> None:
+    """Benchmark batch mode on a directory of generated case files"""
+    import batch_report
+
+    cases_dir = os.path.join(work_dir, "cases")
+    os.makedirs(cases_dir, exist_ok=True)
+    rng = random.Random(cases)
+    for index in range(cases):
+        case = {
+            'doctor_name': "Dr. Bench",
+            'patient_name': f"Patient {index}",
+            'case_number': f"B-{index:05d}",
+            'case_notes': LONG_NOTES if index % 10 == 0 else "",
+            'implants': [{'teeth': sorted(rng.sample(range(1, 33), rng.randint(1, 8))), 'diameter': 4.0,
+                          'length': 10.0, 'offset': 11.5, 'surgical_approach': 'flapless'}]
+        }
+        with open(os.path.join(cases_dir, f"case_{index:05d}.json"), 'w', encoding='utf-8') as f:
+            json.dump(case, f)
+
+    output_dir = os.path.join(work_dir, "reports")
+
+    def run() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            failures = batch_report.run_batch(cases_dir, output_dir, csv_path)
+        if failures:
+            raise RuntimeError(f"{failures} benchmark cases failed to render")
+
+    start = time.perf_counter()
+    run()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    results[f"batch.{cases}_cases"] = {
+        'median_ms': round(elapsed_ms, 4), 'min_ms': round(elapsed_ms, 4), 'max_ms': round(elapsed_ms, 4),
+        'repeat': 1
+    }
+
+
+def run_benchmarks(csv_path: str, quick: bool = False, batch_cases: int = 1000,
+                   skip_batch: bool = False) -> Dict[str, Any]:
+    """Run every benchmark and return the results with environment metadata"""
+    results: Dict[str, Any] = {}
+    repeat = 3 if quick else 10
+
+    with tempfile.TemporaryDirectory(prefix="primus_bench_") as work_dir:
+        print("Benchmarking catalog loads...")
+        bench_catalog(results, "shipped", csv_path, repeat, work_dir)
+        for rows in (10_000, 100_000):
+            synthetic_path = os.path.join(work_dir, f"catalog_{rows}.csv")
+            write_synthetic_catalog(synthetic_path, rows)
+            bench_catalog(results, f"synthetic_{rows // 1000}k", synthetic_path, max(2, repeat // 3), work_dir)
+
+        print("Benchmarking lookups...")
+        bench_lookup(results, csv_path, repeat)
+
+        print("Benchmarking report rendering...")
+        bench_render(results, csv_path, repeat)
+
+        if not skip_batch:
+            print(f"Benchmarking a {batch_cases}-case batch...")
+            bench_batch(results, csv_path, batch_cases, work_dir)
+
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.node(),
+        'results': results
+    }
+
+
+def format_results(report: Dict[str, Any]) -> str:
+    """Format benchmark results as a fixed-width table"""
+    lines = [f"{'Benchmark':<36}{'Median (ms)':>14}{'Min (ms)':>12}{'Runs':>6}"]
+    for name, result in report['results'].items():
+        lines.append(f"{name:<36}{result['median_ms']:>14.3f}{result['min_ms']:>12.3f}{result['repeat']:>6}")
+    return "\n".join(lines)
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print a comparison against a baseline and return the names of regressed benchmarks"""
+    regressions: List[str] = []
+    # Best times are compared because they are far less noisy than medians for millisecond-scale runs
+    print(f"{'Benchmark':<36}{'Baseline':>12}{'Current':>12}{'Change':>10}")
+
+    for name, result in report['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            print(f"{name:<36}{'-':>12}{result['min_ms']:>12.3f}{'new':>10}")
+            continue
+
+        change = (result['min_ms'] - base['min_ms']) / base['min_ms'] if base['min_ms'] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<36}{base['min_ms']:>12.3f}{result['min_ms']:>12.3f}{change:>+10.1%}{flag}")
+
+    if baseline.get('machine') and baseline.get('machine') != report.get('machine'):
+        print(f"Warning: baseline was recorded on {baseline['machine']}, not {report['machine']}")
+
+    return regressions
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser"""
+    parser = argparse.ArgumentParser(description="Run the Primus Implant Report Generator benchmarks.")
+    parser.add_argument('--catalog', default=catalog.CATALOG_FILENAME, help="Shipped catalog CSV to benchmark")
+    parser.add_argument('--save-baseline', metavar='JSON', nargs='?', const=DEFAULT_BASELINE,
+                        help=f"Write the results as the new baseline (default: {DEFAULT_BASELINE})")
+    parser.add_argument('--compare', metavar='JSON', nargs='?', const=DEFAULT_BASELINE,
+                        help=f"Compare against a stored baseline (default: {DEFAULT_BASELINE})")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before a benchmark counts as a regression (default: 0.25)")
+    parser.add_argument('--output', metavar='JSON', help="Also write this run's results to a file")
+    parser.add_argument('--quick', action='store_true', help="Fewer repetitions, for a fast sanity check")
+    parser.add_argument('--batch-cases', type=int, default=1000, help="Number of cases in the batch benchmark")
+    parser.add_argument('--skip-batch', action='store_true', help="Skip the batch benchmark")
+    return parser
+
+
+def main(argv: List[str]) -> int:
+    args = build_arg_parser().parse_args(argv)
+
+    report = run_benchmarks(args.catalog, args.quick, args.batch_cases, args.skip_batch)
+    print()
+    print(format_results(report))
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"\nResults written to {path}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print()
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: "
+                  f"{', '.join(regressions)}")
+            return 1
+        print(f"\nNo regressions above {args.threshold:.0%}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,422 @@
+"""Implant catalog loading and lookup shared by the GUI and the batch renderer.
+
+pandas is imported inside the loading functions rather than at module level,
+so importing this module does not slow down application startup.
+"""
+import gc
+import hashlib
+import math
+import os
+import pickle
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+CATALOG_FILENAME = "Primus Implant List - Primus Implant List.csv"
+CATALOG_CACHE_FILENAME = "catalog_cache.pkl"
+
+# Bump when the cached payload layout changes so stale caches are rebuilt
+CATALOG_CACHE_VERSION = 2
+
+# Seconds between checks of the catalog file for changes
+CATALOG_POLL_INTERVAL = 2.0
+
+REQUIRED_COLUMNS: List[str] = [
+    'Implant Line', 'Implant Part No', 'Implant Diameter', 'Implant Length',
+    'Guide Sleeve', 'Drill Length', 'Offset', 'Starter Drill',
+    'Initial Drill 1', 'Initial Drill 2', 'Drill 1', 'Drill 2', 'Drill 3', 'Drill 4'
+]
+
+DRILL_FIELDS: List[str] = ['Starter Drill', 'Initial Drill 1', 'Initial Drill 2', 'Drill 1', 'Drill 2', 'Drill 3',
+                           'Drill 4']
+
+# Short labels for the drill fields, in the order they appear in the drilling sequence
+DRILL_LABELS: Dict[str, str] = {
+    'Starter Drill': 'Start',
+    'Initial Drill 1': 'Init1',
+    'Initial Drill 2': 'Init2',
+    'Drill 1': 'D1',
+    'Drill 2': 'D2',
+    'Drill 3': 'D3',
+    'Drill 4': 'D4'
+}
+
+NO_DRILL_SEQUENCE_TEXT = "No valid drill sequence available"
+
+
+def read_catalog(csv_filename: str) -> "pd.DataFrame":
+    """Read and validate the implant catalog CSV, raising on missing file or columns"""
+    import pandas as pd
+
+    implant_data = pd.read_csv(csv_filename)
+
+    missing_columns: List[str] = [col for col in REQUIRED_COLUMNS if col not in implant_data.columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {missing_columns}")
+
+    return implant_data
+
+
+def _file_sha256(path: str) -> str:
+    """Hash a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_catalog_cache(cache_file: str, csv_filename: str, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+    """Return the cached index state if it was built from the current CSV, otherwise None"""
+    # The payload is hundreds of thousands of small tuples; collecting while they are created only costs time
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(cache_file, 'rb') as f:
+            payload = pickle.load(f)
+    except Exception:
+        return None  # Missing, truncated or incompatible cache
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    if not isinstance(payload, dict) or payload.get('version') != CATALOG_CACHE_VERSION:
+        return None
+    if payload.get('source') != os.path.abspath(csv_filename):
+        return None
+
+    if payload.get('mtime_ns') == stat.st_mtime_ns and payload.get('size') == stat.st_size:
+        return payload['index']
+
+    # The file was touched (e.g. copied again); reuse the cache if the contents are unchanged
+    if payload.get('size') == stat.st_size and payload.get('sha256') == _file_sha256(csv_filename):
+        return payload['index']
+
+    return None
+
+
+def _write_catalog_cache(cache_file: str, csv_filename: str, stat: os.stat_result, index: "ImplantIndex") -> None:
+    """Write the built index to the binary cache, replacing it atomically"""
+    payload = {
+        'version': CATALOG_CACHE_VERSION,
+        'source': os.path.abspath(csv_filename),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': _file_sha256(csv_filename),
+        'index': index.cache_state()
+    }
+
+    temp_file = cache_file + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(temp_file, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, cache_file)
+    except OSError as e:
+        print(f"Could not write catalog cache: {e}")
+
+
+def load_index(csv_filename: str, cache_dir: Optional[str] = None, version: str = "") -> "ImplantIndex":
+    """Load the catalog index, using the binary cache in cache_dir when it is current.
+
+    The cache holds the built index as plain tuples and dicts, so a warm
+    start neither imports pandas nor rebuilds the index. It is rebuilt
+    automatically whenever the CSV's size, modification time or contents
+    change.
+    """
+    stat = os.stat(csv_filename)
+
+    if not cache_dir:
+        return ImplantIndex(read_catalog(csv_filename), version)
+
+    cache_file = os.path.join(cache_dir, CATALOG_CACHE_FILENAME)
+    state = _read_catalog_cache(cache_file, csv_filename, stat)
+    if state is not None:
+        try:
+            return ImplantIndex.from_cache_state(state, version)
+        except Exception:
+            pass  # Written by an incompatible build; rebuild it below
+
+    index = ImplantIndex(read_catalog(csv_filename), version)
+    _write_catalog_cache(cache_file, csv_filename, stat, index)
+    return index
+
+
+def catalog_key(implant_line: Any, diameter: Any, length: Any, offset: Any) -> Tuple[str, int, int, int]:
+    """Build the lookup key for an implant configuration.
+
+    Dimensions are compared in hundredths of a millimetre so that "10", "10.0"
+    and 10.000000001 all resolve to the same catalog row.
+    """
+    return (
+        str(implant_line).strip().casefold(),
+        int(round(float(diameter) * 100)),
+        int(round(float(length) * 100)),
+        int(round(float(offset) * 100))
+    )
+
+
+class ImplantRecord:
+    """Catalog row resolved for planning, with its drill sequence and invalid drill stages precomputed"""
+    __slots__ = ('part_number', 'guide_sleeve', 'drill_length', 'drill_sequence_text', 'invalid_drills')
+
+    def __init__(self, part_number: Any, guide_sleeve: Any, drill_length: Any, drill_sequence_text: str,
+                 invalid_drills: Tuple[str, ...]) -> None:
+        self.part_number: Any = part_number
+        self.guide_sleeve: Any = guide_sleeve
+        self.drill_length: Any = drill_length
+        self.drill_sequence_text: str = drill_sequence_text
+        self.invalid_drills: Tuple[str, ...] = invalid_drills
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ImplantRecord):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the record as a plain dict"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def is_valid_drill(value: Any) -> bool:
+    """Check if drill value is valid (not 'x', empty, or NaN)"""
+    if value is None:
+        return False
+    if isinstance(value, float) and math.isnan(value):
+        return False
+    value_str = str(value).lower().strip()
+    return value_str not in ['x', '', 'nan', 'none']
+
+
+def build_drill_sequence(drill_values: Sequence[Any]) -> Tuple[str, Tuple[str, ...]]:
+    """Return the drill sequence text and invalid drill stages for one row's DRILL_FIELDS values"""
+    steps = [f"{DRILL_LABELS[field]}: {value}mm" for field, value in zip(DRILL_FIELDS, drill_values)
+             if is_valid_drill(value)]
+    # Drill fields containing 'x' indicate an invalid implant/drill length combination
+    invalid_drills = tuple(field for field, value in zip(DRILL_FIELDS, drill_values)
+                           if str(value).lower().strip() == 'x')
+    return " → ".join(steps) if steps else NO_DRILL_SEQUENCE_TEXT, invalid_drills
+
+
+def build_drill_records(implant_data: "pd.DataFrame") -> List[Tuple[str, Tuple[str, ...]]]:
+    """Compute the drill sequence text and invalid drill stages for every catalog row.
+
+    Catalogs repeat a small number of drill combinations across many rows, so
+    rows are grouped by their drill values in one pass and each distinct
+    combination is resolved only once.
+    """
+    import numpy as np
+
+    drills = implant_data[DRILL_FIELDS]
+    group_ids = drills.groupby(DRILL_FIELDS, dropna=False, sort=False).ngroup().to_numpy()
+    _, first_rows = np.unique(group_ids, return_index=True)
+
+    resolved = [build_drill_sequence(values) for values in drills.iloc[first_rows].to_numpy(dtype=object)]
+    return [resolved[group_id] for group_id in group_ids]
+
+
+def source_version(csv_filename: str) -> str:
+    """Return a cheap identifier for the current contents of a catalog file"""
+    try:
+        stat = os.stat(csv_filename)
+    except OSError:
+        return ""
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def format_dimension(hundredths: int) -> str:
+    """Format a dimension in hundredths of a millimetre for display, e.g. 1000 -> 10.0 and 375 -> 3.75"""
+    text = f"{hundredths / 100:.2f}".rstrip('0')
+    return text + '0' if text.endswith('.') else text
+
+
+def _hundredths(value: Any) -> Optional[int]:
+    """Convert a dimension to hundredths of a millimetre as catalog_key does, or None if it is not numeric"""
+    try:
+        return int(round(float(value) * 100))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+class ImplantIndex:
+    """In-memory index of the catalog keyed by (line, diameter, length, offset).
+
+    Alongside the records it keeps a compatibility index of the valid
+    configurations (rows without 'x' drill stages): diameters per line,
+    lengths per line and diameter, and offsets per line, diameter and length.
+    """
+
+    def __init__(self, implant_data: Optional["pd.DataFrame"] = None, version: str = "") -> None:
+        # Records are kept as ImplantRecord field tuples so the index can be cached and loaded as plain data
+        self._records: Dict[Tuple[str, int, int, int], Tuple[Any, ...]] = {}
+        # line -> diameter -> length -> offsets, all dimensions in hundredths of a millimetre
+        self._compatibility: Dict[str, Dict[int, Dict[int, List[int]]]] = {}
+        self._line_names: Dict[str, str] = {}
+        self.version: str = version  # Identifies the catalog contents, e.g. for render cache keys
+
+        if implant_data is None or implant_data.empty:
+            return
+
+        import pandas as pd
+
+        # Dimensions in hundredths of a millimetre, as in catalog_key; rows with missing or
+        # non-numeric dimensions become NaN and are skipped
+        dimensions = [
+            pd.to_numeric(implant_data[column], errors='coerce').mul(100).round()
+            for column in ('Implant Diameter', 'Implant Length', 'Offset')
+        ]
+        line_names = [str(line).strip() for line in implant_data['Implant Line'].tolist()]
+
+        rows = zip(
+            line_names, *(dimension.tolist() for dimension in dimensions),
+            implant_data['Implant Part No'].tolist(), implant_data['Guide Sleeve'].tolist(),
+            implant_data['Drill Length'].tolist(), build_drill_records(implant_data)
+        )
+        for line_name, diameter, length, offset, part_number, guide_sleeve, drill_length, drills in rows:
+            if math.isnan(diameter) or math.isnan(length) or math.isnan(offset):
+                continue
+
+            line = line_name.casefold()
+            key = (line, int(diameter), int(length), int(offset))
+            # Keep the first row for duplicate configurations, as the old DataFrame lookup did
+            if key in self._records:
+                continue
+
+            drill_sequence_text, invalid_drills = drills
+            self._records[key] = (part_number, guide_sleeve, drill_length, drill_sequence_text, invalid_drills)
+
+            if not invalid_drills:
+                self._line_names.setdefault(line, line_name)
+                (self._compatibility.setdefault(line, {}).setdefault(key[1], {})
+                 .setdefault(key[2], []).append(key[3]))
+
+        for diameters in self._compatibility.values():
+            for lengths in diameters.values():
+                for offsets in lengths.values():
+                    offsets.sort()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def cache_state(self) -> Dict[str, Any]:
+        """Return the built index as plain tuples and dicts for the catalog cache"""
+        return {
+            'records': self._records,
+            'compatibility': self._compatibility,
+            'line_names': self._line_names
+        }
+
+    @classmethod
+    def from_cache_state(cls, state: Dict[str, Any], version: str = "") -> "ImplantIndex":
+        """Rebuild an index from cache_state() output without re-reading the catalog"""
+        if not all(isinstance(state.get(name), dict) for name in ('records', 'compatibility', 'line_names')):
+            raise ValueError("Catalog cache has an unexpected layout")
+
+        index = cls(version=version)
+        index._records = state['records']
+        index._compatibility = state['compatibility']
+        index._line_names = state['line_names']
+        return index
+
+    def lookup(self, implant_line: Any, diameter: Any, length: Any, offset: Any) -> Optional[ImplantRecord]:
+        """Return the record for an implant configuration, or None if it is not in the catalog"""
+        try:
+            values = self._records.get(catalog_key(implant_line, diameter, length, offset))
+        except (TypeError, ValueError):
+            return None
+        return ImplantRecord(*values) if values is not None else None
+
+    def implant_lines(self) -> List[str]:
+        """Return the implant lines that have at least one valid configuration"""
+        return sorted(self._line_names.values(), key=str.casefold)
+
+    def diameters(self, implant_line: Any) -> List[str]:
+        """Return the valid diameters for an implant line, formatted for display"""
+        diameters = self._compatibility.get(str(implant_line).strip().casefold(), {})
+        return [format_dimension(diameter) for diameter in sorted(diameters)]
+
+    def lengths(self, implant_line: Any, diameter: Any) -> List[str]:
+        """Return the valid lengths for an implant line and diameter, formatted for display"""
+        lengths = self._compatibility.get(str(implant_line).strip().casefold(), {}).get(_hundredths(diameter), {})
+        return [format_dimension(length) for length in sorted(lengths)]
+
+    def offsets(self, implant_line: Any, diameter: Any, length: Any) -> List[str]:
+        """Return the valid offsets for an implant line, diameter and length, formatted for display"""
+        offsets = (self._compatibility.get(str(implant_line).strip().casefold(), {})
+                   .get(_hundredths(diameter), {}).get(_hundredths(length), []))
+        return [format_dimension(offset) for offset in offsets]
+
+
+class CatalogWatcher:
+    """Watches a catalog file and rebuilds the index on a background thread when it changes.
+
+    The file's size and modification time are polled; a change is only acted
+    on once it has been stable for one poll, so a file still being copied in
+    is not read half-written. on_reload(index) receives the new
+    catalog and on_error(exception) is called instead if it fails to load, in
+    which case the caller keeps the catalog it has. Both are called on the
+    watcher thread.
+    """
+
+    def __init__(self, csv_filename: str, cache_dir: Optional[str], version: str,
+                 on_reload: Callable[[ImplantIndex], None], on_error: Callable[[Exception], None],
+                 interval: float = CATALOG_POLL_INTERVAL) -> None:
+        self.csv_filename: str = csv_filename
+        self.cache_dir: Optional[str] = cache_dir
+        self.interval: float = interval
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self._seen_version: str = version  # Last version loaded, or that failed to load
+        self._pending_version: Optional[str] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start polling on a daemon thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="CatalogWatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling; a reload already in progress still completes"""
+        self._stop_event.set()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Catalog watcher error: {e}")
+
+    def poll(self) -> bool:
+        """Check the file once, reloading it if it changed and has settled. Returns True if reloaded."""
+        version = source_version(self.csv_filename)
+        if not version or version == self._seen_version:
+            self._pending_version = None
+            return False
+
+        if version != self._pending_version:
+            self._pending_version = version  # Wait one more poll in case the file is still being written
+            return False
+
+        self._pending_version = None
+        self._seen_version = version
+        try:
+            index = load_index(self.csv_filename, self.cache_dir, version)
+            if not len(index):
+                raise ValueError("The catalog contains no implant configurations")
+        except Exception as e:
+            self.on_error(e)
+            return False
+
+        self.on_reload(index)
+        return True
@@ -2,6 +2,10 @@ REM deploy_update.bat - Updated for user-level installations
 @echo off
 echo Deploying Primus Implant Report Generator Update...
 
+REM Version being deployed, and the oldest installed version that may update to it automatically
+set "APP_VERSION=1.0.5"
+set "MINIMUM_VERSION=1.0.0"
+
 REM Build the latest version first
 call build_installer.bat
 
@@ -11,6 +15,20 @@ if %errorlevel% neq 0 (
     exit /b 1
 )
 
+REM Refuse to deploy a build that is measurably slower than the stored baseline
+REM Record a baseline on this machine with: python benchmark.py --save-baseline
+if exist "benchmark_baseline.json" (
+    echo Running performance regression check...
+    python benchmark.py --compare benchmark_baseline.json --threshold 0.25
+    if errorlevel 1 (
+        echo Performance regression detected, not deploying update
+        pause
+        exit /b 1
+    )
+) else (
+    echo No benchmark_baseline.json found, skipping performance regression check
+)
+
 REM Set update deployment paths
 REM Option 1: Network share (original method)
 set "NETWORK_DEPLOY_PATH=\\CDIMANQ30\Creoman-Active\CADCAM\Software\Primus Implant Report Generator\UserUpdates"
@@ -61,21 +79,23 @@ echo - Improved user-level installation support
 echo - Enhanced PDF report formatting
 ) > "%DEPLOY_PATH%\version.txt"
 
-REM Create update manifest for version checking
-(
-echo {
-echo   "version": "1.0.5",
-echo   "build_date": "%date% %time%",
-echo   "executable": "Primus Implant Report Generator.exe",
-echo   "size": "%~z0",
-echo   "required_files": [
-echo     "Primus Implant Report Generator.exe",
-echo     "Primus Implant List - Primus Implant List.csv",
-echo     "inosys_logo.png",
-echo     "icon.ico"
-echo   ]
-echo }
-) > "%DEPLOY_PATH%\update_manifest.json"
+REM Create chunk manifest so clients can rebuild the new executable from their installed one
+REM and download only the chunks that changed (full download remains the fallback)
+python update_delta.py --exe "dist\Primus Implant Report Generator %APP_VERSION%.exe" --output "%DEPLOY_PATH%\update_chunks.json"
+if errorlevel 1 (
+    echo Failed to write chunk manifest
+    pause
+    exit /b 1
+)
+
+REM Create update manifest for version checking (version, build date, size, sha256, minimum version)
+REM Written after the executable is in place; clients read only this file to detect updates
+python update_manifest.py --exe "dist\Primus Implant Report Generator %APP_VERSION%.exe" --version %APP_VERSION% --minimum-version %MINIMUM_VERSION% --output "%DEPLOY_PATH%\update_manifest.json"
+if errorlevel 1 (
+    echo Failed to write update manifest
+    pause
+    exit /b 1
+)
 
 REM Create deployment verification script
 (
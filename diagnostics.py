@@ -0,0 +1,92 @@
+"""Lightweight timing spans for startup phases and report builds.
+
+Each span records wall-clock and CPU time and is appended as one JSON object
+per line to the timings log, so a regression in a new build can be traced to
+the phase that got slower.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class SpanRecorder:
+    """Record wall-clock and CPU time per named span and append them to a JSON-lines log"""
+
+    def __init__(self, log_file: Optional[str] = None, max_spans: int = 500, writer: Any = None) -> None:
+        # With a LogWriter, log_file is a name inside its log directory and writes happen off-thread
+        self.log_file: Optional[str] = log_file
+        self.writer = writer
+        self.session_id: str = uuid.uuid4().hex[:12]
+        self._max_spans = max_spans
+        self._spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """Time the enclosed block; extra attributes can be added to the yielded dict"""
+        wall_start = time.perf_counter()
+        # Thread CPU time, so spans on background threads are not charged for the UI thread
+        cpu_start = time.thread_time()
+        try:
+            yield attributes
+        except BaseException as e:
+            attributes['error'] = type(e).__name__
+            raise
+        finally:
+            self.record(name, time.perf_counter() - wall_start, time.thread_time() - cpu_start, **attributes)
+
+    def record(self, name: str, wall_seconds: float, cpu_seconds: Optional[float] = None,
+               **attributes: Any) -> Dict[str, Any]:
+        """Record an already measured span"""
+        entry: Dict[str, Any] = {
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'session': self.session_id,
+            'name': name,
+            'wall_ms': round(wall_seconds * 1000, 3),
+            'cpu_ms': round(cpu_seconds * 1000, 3) if cpu_seconds is not None else None,
+            'thread': threading.current_thread().name
+        }
+        entry.update(attributes)
+
+        with self._lock:
+            self._spans.append(entry)
+            if len(self._spans) > self._max_spans:
+                del self._spans[:len(self._spans) - self._max_spans]
+
+        self._write(entry)
+        return entry
+
+    def spans(self, prefix: str = "") -> List[Dict[str, Any]]:
+        """Return the spans recorded in this session, optionally filtered by name prefix"""
+        with self._lock:
+            return [entry for entry in self._spans if entry['name'].startswith(prefix)]
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        """Append a span to the JSON-lines log"""
+        if not self.log_file:
+            return
+
+        if self.writer is not None:
+            self.writer.write(self.log_file, json.dumps(entry, default=str))
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+        except OSError as e:
+            print(f"Failed to write timing log: {e}")
+
+
+def format_spans(spans: List[Dict[str, Any]]) -> str:
+    """Format spans as a fixed-width table for display"""
+    lines = [f"{'Span':<36}{'Wall (ms)':>12}{'CPU (ms)':>12}"]
+    for entry in spans:
+        cpu = f"{entry['cpu_ms']:.1f}" if entry.get('cpu_ms') is not None else "-"
+        lines.append(f"{entry['name']:<36}{entry['wall_ms']:>12.1f}{cpu:>12}")
+    return "\n".join(lines)
@@ -0,0 +1,168 @@
+"""Queue-backed background log writer.
+
+Log calls only format a line and put it on a queue; a daemon thread drains
+the queue in batches, writes each log file once per batch and rotates files
+by size. This keeps per-message file opens off the UI thread, which matters
+on roaming profiles where every small write is a network round-trip.
+"""
+import atexit
+import os
+import queue
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+LOG_LEVELS: Dict[str, int] = {
+    "DEBUG": 10,
+    "INFO": 20,
+    "WARN": 30,
+    "WARNING": 30,
+    "ERROR": 40
+}
+
+
+class LogWriter:
+    """Write log lines asynchronously with batching, size-based rotation and a level threshold"""
+
+    def __init__(self, log_dir: str, level: str = "INFO", max_bytes: int = 1024 * 1024, backup_count: int = 3,
+                 flush_interval: float = 0.5, batch_size: int = 500, console: bool = False) -> None:
+        self.log_dir: str = log_dir
+        self.max_bytes: int = max_bytes
+        self.backup_count: int = backup_count
+        self.flush_interval: float = flush_interval
+        self.batch_size: int = batch_size
+        self.console: bool = console
+        self.set_level(level)
+
+        self._queue: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue()
+        self._created_dirs: Set[str] = set()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._closed = False
+
+        atexit.register(self.close)
+
+    def set_level(self, level: str) -> None:
+        """Set the minimum level that is written"""
+        self.level: int = LOG_LEVELS.get(str(level).upper(), LOG_LEVELS["INFO"])
+
+    def is_enabled(self, level: str) -> bool:
+        """Check whether messages at the given level are written"""
+        return LOG_LEVELS.get(level.upper(), LOG_LEVELS["INFO"]) >= self.level
+
+    def log(self, filename: str, line: str, level: str = "INFO") -> None:
+        """Queue a formatted log line for the given file if its level is enabled"""
+        if self.is_enabled(level):
+            self.write(filename, line)
+
+    def write(self, filename: str, line: str) -> None:
+        """Queue a line for the given file regardless of level"""
+        if self._closed:
+            return
+
+        if self.console:
+            print(line)
+
+        self._ensure_thread()
+        self._queue.put((filename, line))
+
+    def flush(self) -> None:
+        """Block until every queued line has been written"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Flush pending lines and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+    def _ensure_thread(self) -> None:
+        """Start the writer thread on first use"""
+        if self._thread is None:
+            with self._thread_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        """Drain the queue in batches until closed"""
+        stopping = False
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch: List[Optional[Tuple[str, str]]] = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines_by_file: Dict[str, List[str]] = {}
+            for item in batch:
+                if item is None:
+                    stopping = True
+                    continue
+                filename, line = item
+                lines_by_file.setdefault(filename, []).append(line)
+
+            for filename, lines in lines_by_file.items():
+                self._write_lines(filename, lines)
+
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write_lines(self, filename: str, lines: List[str]) -> None:
+        """Append a batch of lines to one log file, rotating whenever it would grow past max_bytes"""
+        path = os.path.join(self.log_dir, filename)
+
+        try:
+            directory = os.path.dirname(path)
+            if directory not in self._created_dirs:
+                os.makedirs(directory, exist_ok=True)
+                self._created_dirs.add(directory)
+
+            try:
+                current_size = os.path.getsize(path)
+            except OSError:
+                current_size = 0
+
+            pending: List[str] = []
+            for line in lines:
+                text = f"{line}\n"
+                size = len(text.encode('utf-8'))
+                if current_size and current_size + size > self.max_bytes:
+                    self._append(path, pending)
+                    self._rotate(path)
+                    pending, current_size = [], 0
+                pending.append(text)
+                current_size += size
+
+            self._append(path, pending)
+
+        except Exception as e:
+            print(f"Failed to write log {filename}: {e}")
+
+    def _append(self, path: str, chunks: List[str]) -> None:
+        """Append text to a file with a single open/write"""
+        if chunks:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write("".join(chunks))
+
+    def _rotate(self, path: str) -> None:
+        """Shift path -> path.1 -> path.2 ..., dropping the oldest backup"""
+        if self.backup_count <= 0:
+            os.remove(path)
+            return
+
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{path}.{index + 1}")
+        os.replace(path, f"{path}.1")
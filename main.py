@@ -1,26 +1,45 @@
+import time
+
+# Recorded before the remaining imports so the startup breakdown includes import time
+_PROCESS_START = time.perf_counter()
+
 import customtkinter as ctk
-import pandas as pd
 import tkinter as tk
 from tkinter import messagebox, filedialog, scrolledtext
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+import io
 import json
 import os
+import queue
 import sys
 import shutil
 import subprocess
 import threading
+import multiprocessing
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Callable, Tuple
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Callable, Tuple
 from PIL import Image as PILImage
 import tempfile
 import webbrowser
 from pathlib import Path
 
+# pandas and reportlab are imported lazily (catalog loads in a background thread,
+# report_engine on the first report or preview) to keep the window's cold start fast
+import assets
+import catalog
+import diagnostics
+import log_writer
+import pdf_preview
+import render_cache
+import update_delta
+import update_manifest
+import update_share
+import update_transfer
+import versioned_install
+from plan_store import ImplantPlan, PlanStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+
 # Application version information
 APP_VERSION = "1.0.5"
 APP_BUILD_DATE = "2025-08-07"
@@ -46,25 +65,25 @@ def get_user_app_directory() -> str:
         return os.path.expanduser('~/.local/share/PrimusImplant')
 
 
-def get_user_update_server_path() -> str:
-    """Get user-level update server path"""
-    # Primary: Network share for updates
-    network_path = r"\\CDIMANQ30\Creoman-Active\CADCAM\Software\Primus Implant Report Generator\UserUpdates"
+def get_app_directory() -> str:
+    """Get the directory the application (or compiled executable) runs from"""
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
 
-    # Fallback: Local shared folder
-    local_path = r"C:\Shared\PrimusUpdates"
 
-    # Check which path is accessible
-    if os.path.exists(network_path):
-        return network_path
-    elif os.path.exists(local_path):
-        return local_path
-    else:
-        # Final fallback: User directory updates subfolder
-        return os.path.join(get_user_app_directory(), 'updates')
+def get_data_file_path(filename: str) -> str:
+    """Get path to data file, checking user directory first"""
+    user_file = os.path.join(get_user_app_directory(), filename)
+
+    # Check user directory first
+    if os.path.exists(user_file):
+        return user_file
+
+    # Fall back to application directory
+    return os.path.join(get_app_directory(), filename)
 
 
-UPDATE_SERVER_PATH = get_user_update_server_path()
 UPDATE_FILENAME = "Primus Implant Report Generator.exe"
 
 # Set appearance mode and color theme
@@ -92,6 +111,12 @@ INOSYS_COLORS = {
     "background_tertiary": "#3A3A3A"  # Tertiary dark background
 }
 
+CATALOG_EVENT_POLL_MS = 100  # How often the UI thread checks for catalog loads and reloads
+
+# Live preview on the Generate Report tab
+PREVIEW_DEBOUNCE_MS = 400  # Wait for typing to pause before re-rendering
+PREVIEW_PAGE_WIDTH = 600  # Pixel width of rendered preview pages
+
 
 class ToothDiagram(ctk.CTkFrame):
     def __init__(self, parent: ctk.CTkFrame, callback: Callable[[List[int]], None]) -> None:
@@ -231,12 +256,118 @@ class ToothDiagram(ctk.CTkFrame):
         self.callback(self.selected_teeth.copy())
 
 
+class PlanListView(ctk.CTkScrollableFrame):
+    """Review Plan list that updates rows in place instead of rebuilding every widget.
+
+    Rows are keyed by tooth number. Each update diffs the plan model against
+    the rows on screen: unchanged rows are left alone, changed rows are
+    relabelled, and removed rows are hidden and returned to a pool for reuse.
+    """
+
+    def __init__(self, parent: ctk.CTkFrame, on_remove: Callable[[int], None], **kwargs: Any) -> None:
+        super().__init__(parent, **kwargs)
+        self.on_remove: Callable[[int], None] = on_remove
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.row_order: List[int] = []
+        self.row_pool: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def format_plan(plan: ImplantPlan) -> str:
+        """Build the display text for a plan row"""
+        return (
+            f"Tooth {plan.tooth_number}: {plan.implant_line} - "
+            f"{plan.diameter}mm × {plan.length}mm (Offset: {plan.offset}mm)"
+        )
+
+    def update_plans(self, plans: PlanStore) -> None:
+        """Sync the rows on screen with the given plans"""
+        new_order: List[int] = plans.teeth()
+        new_teeth = set(new_order)
+
+        # Release rows whose plan was removed
+        for tooth_number in [tooth for tooth in self.row_order if tooth not in new_teeth]:
+            row = self.rows.pop(tooth_number)
+            row['frame'].pack_forget()
+            self.row_pool.append(row)
+
+        # Create or relabel rows for new and changed plans
+        for plan in plans:
+            tooth_number = plan.tooth_number
+            text = self.format_plan(plan)
+            row = self.rows.get(tooth_number)
+
+            if row is None:
+                row = self.row_pool.pop() if self.row_pool else self.create_row()
+                row['button'].configure(command=lambda tooth=tooth_number: self.on_remove(tooth))
+                self.rows[tooth_number] = row
+
+            if row['text'] != text:
+                row['label'].configure(text=text)
+                row['text'] = text
+
+        # Only repack when existing rows changed order; new rows are appended at the end
+        kept_order = [tooth for tooth in self.row_order if tooth in new_teeth]
+        if new_order[:len(kept_order)] == kept_order:
+            to_pack = new_order[len(kept_order):]
+        else:
+            for tooth_number in kept_order:
+                self.rows[tooth_number]['frame'].pack_forget()
+            to_pack = new_order
+
+        for tooth_number in to_pack:
+            self.rows[tooth_number]['frame'].pack(fill="x", padx=10, pady=5)
+
+        self.row_order = new_order
+
+    def create_row(self) -> Dict[str, Any]:
+        """Create the widgets for one plan row"""
+        plan_frame: ctk.CTkFrame = ctk.CTkFrame(
+            self,
+            fg_color=INOSYS_COLORS["background_secondary"],
+            border_width=1,
+            border_color=INOSYS_COLORS["medium_blue"]
+        )
+
+        details_label: ctk.CTkLabel = ctk.CTkLabel(
+            plan_frame,
+            text="",
+            font=ctk.CTkFont(size=12, weight="bold"),
+            text_color=INOSYS_COLORS["text_primary"]
+        )
+        details_label.pack(side="left", padx=10, pady=10)
+
+        # Remove button
+        remove_button: ctk.CTkButton = ctk.CTkButton(
+            plan_frame,
+            text="Remove",
+            width=80,
+            fg_color=INOSYS_COLORS["dark_blue"],
+            hover_color=INOSYS_COLORS["light_blue"],
+            text_color=INOSYS_COLORS["white"]
+        )
+        remove_button.pack(side="right", padx=10, pady=10)
+
+        return {'frame': plan_frame, 'label': details_label, 'button': remove_button, 'text': None}
+
+
 class PrimusImplantApp(ctk.CTk):
     def __init__(self) -> None:
         super().__init__()
 
         self.title("Primus Implant Report Generator")
 
+        # Background log writer; PRIMUS_LOG_LEVEL=WARN quiets routine messages, PRIMUS_LOG_CONSOLE=1 echoes them
+        self.log_writer = log_writer.LogWriter(
+            os.path.join(get_user_app_directory(), 'logs'),
+            level=os.environ.get('PRIMUS_LOG_LEVEL', 'INFO'),
+            console=os.environ.get('PRIMUS_LOG_CONSOLE') == '1'
+        )
+
+        # Timing spans for startup phases and report builds (Help > Diagnostics)
+        self.profiler = diagnostics.SpanRecorder('timings.jsonl', writer=self.log_writer)
+        self.profiler.record("startup.module_imports", time.perf_counter() - _PROCESS_START, time.process_time(),
+                             version=APP_VERSION, frozen=getattr(sys, 'frozen', False))
+
         # Initialize logging first
         self.log_window_activity("=== APPLICATION STARTUP ===")
         self.log_window_activity(f"Python version: {sys.version}")
@@ -244,36 +375,77 @@ class PrimusImplantApp(ctk.CTk):
         self.log_window_activity(f"App version: 1.0.4")
 
         # Load window geometry AFTER title is set
-        self.load_window_geometry()
+        with self.profiler.span("startup.load_window_geometry"):
+            self.load_window_geometry()
 
         # Set up user installation first
-        self.setup_user_installation()
+        with self.profiler.span("startup.setup_user_installation"):
+            self.setup_user_installation()
 
         # Set window icon
-        self.set_window_icon()
+        with self.profiler.span("startup.set_window_icon"):
+            self.set_window_icon()
 
         # Set taskbar icon (Windows-specific)
-        self.set_taskbar_icon()
+        with self.profiler.span("startup.set_taskbar_icon"):
+            self.set_taskbar_icon()
 
         # Configure window colors
         self.configure(fg_color=INOSYS_COLORS["background_primary"])
 
         # Initialize instance variables
-        self.implant_data = pd.DataFrame()
-        self.implant_plans = []
+        self.implant_index = catalog.ImplantIndex()
+        self.catalog_watcher: Optional[catalog.CatalogWatcher] = None
+        self.catalog_loaded = False
+        # (handler, args) from the catalog loader and watcher threads, run on the UI thread
+        self.catalog_events: "queue.Queue[Tuple[Callable[..., None], Tuple[Any, ...]]]" = queue.Queue()
+        self.implant_plans = PlanStore()
         self.current_case_notes = ""
-
-        # Load CSV data
-        self.load_implant_data()
-
-        self.create_widgets()
-        self.create_menu()
+        self.report_job: Optional[Dict[str, Any]] = None  # Report build currently running on the worker
+        # Memory only: every entry (including each live preview) is a patient-identifying PDF that should
+        # not outlive the session
+        self.render_cache = render_cache.RenderCache()
+        threading.Thread(target=render_cache.purge_disk_cache,
+                         args=(os.path.join(get_user_app_directory(), 'render_cache'),), daemon=True).start()
+        # Update share reachability comes from a cache; stale entries are re-probed in the background
+        self.update_share = update_share.UpdateShare(get_user_app_directory())
+        if not self.update_share.is_fresh():
+            self.update_share.refresh_in_background()
+        self.update_manifests = update_manifest.ManifestCache(get_user_app_directory())
+        self.versioned_install = versioned_install.VersionedInstall(get_user_app_directory())
+        self.update_cancel_event = threading.Event()  # Set on close; a cancelled download resumes next time
+        if getattr(sys, 'frozen', False):
+            threading.Thread(target=self.versioned_install.prune, args=(APP_VERSION,), name="PruneVersions",
+                             daemon=True).start()
+
+        # Live preview state
+        self.preview_job: Optional[Dict[str, Any]] = None  # Preview render currently in flight
+        self.preview_after_id: Optional[str] = None
+        self.preview_dirty = True
+        self.preview_pdf_bytes: Optional[bytes] = None
+        self.preview_page_labels: List[ctk.CTkLabel] = []
+        self.preview_images: List[ctk.CTkImage] = []  # Keep references so Tk does not drop the images
+        self.preview_temp_files: List[str] = []
+
+        # Load CSV data in the background while the window is built
+        self.start_implant_data_load()
+
+        with self.profiler.span("startup.create_widgets"):
+            self.create_widgets()
+        self.implant_plans.subscribe(self.update_plan_display)
+        self.implant_plans.subscribe(self.schedule_preview_refresh)
+        with self.profiler.span("startup.create_menu"):
+            self.create_menu()
 
         # Bind window events
         self.protocol("WM_DELETE_WINDOW", self.on_window_close)
 
         self.log_window_activity("=== APPLICATION STARTUP COMPLETE ===")
 
+        # First paint happens once the event loop goes idle
+        self._init_finished_at = time.perf_counter()
+        self.after_idle(self.record_first_paint)
+
         # Test window memory after a short delay
         self.after(1000, self.test_window_memory)
 
@@ -298,20 +470,7 @@ class PrimusImplantApp(ctk.CTk):
 
     def get_data_file_path(self, filename: str) -> str:
         """Get path to data file, checking user directory first"""
-        user_dir = get_user_app_directory()
-        user_file = os.path.join(user_dir, filename)
-
-        # Check user directory first
-        if os.path.exists(user_file):
-            return user_file
-
-        # Fall back to application directory
-        if getattr(sys, 'frozen', False):
-            app_dir = os.path.dirname(sys.executable)
-        else:
-            app_dir = os.path.dirname(os.path.abspath(__file__))
-
-        return os.path.join(app_dir, filename)
+        return get_data_file_path(filename)
 
     def copy_data_files_to_user_directory(self) -> None:
         """Copy data files to user directory if they don't exist"""
@@ -341,8 +500,8 @@ class PrimusImplantApp(ctk.CTk):
         except Exception as e:
             print(f"Error copying data files: {e}")
 
-    def create_desktop_shortcut(self) -> None:
-        """Create desktop shortcut for user installation"""
+    def create_desktop_shortcut(self, target_exe: Optional[str] = None) -> None:
+        """Create desktop shortcut for user installation, pointing at target_exe or the running executable"""
         try:
             if not sys.platform.startswith('win'):
                 return
@@ -350,7 +509,7 @@ class PrimusImplantApp(ctk.CTk):
             if not getattr(sys, 'frozen', False):
                 return  # Only for compiled versions
 
-            current_exe = sys.executable
+            current_exe = target_exe or sys.executable
             desktop = os.path.join(os.path.expanduser('~'), 'Desktop')
             shortcut_path = os.path.join(desktop, "Primus Implant Report Generator.lnk")
 
@@ -359,7 +518,7 @@ class PrimusImplantApp(ctk.CTk):
     $WshShell = New-Object -comObject WScript.Shell
     $Shortcut = $WshShell.CreateShortcut("{shortcut_path}")
     $Shortcut.TargetPath = "{current_exe}"
-    $Shortcut.WorkingDirectory = "{os.path.dirname(current_exe)}"
+    $Shortcut.WorkingDirectory = "{self.shortcut_working_directory(current_exe)}"
     $Shortcut.IconLocation = "{current_exe}"
     $Shortcut.Description = "Primus Implant Report Generator"
     $Shortcut.Save()
@@ -376,8 +535,8 @@ class PrimusImplantApp(ctk.CTk):
         except Exception as e:
             print(f"Error creating desktop shortcut: {e}")
 
-    def create_start_menu_shortcut(self) -> None:
-        """Create Start Menu shortcut"""
+    def create_start_menu_shortcut(self, target_exe: Optional[str] = None) -> None:
+        """Create Start Menu shortcut, pointing at target_exe or the running executable"""
         try:
             if not sys.platform.startswith('win'):
                 return
@@ -385,7 +544,7 @@ class PrimusImplantApp(ctk.CTk):
             if not getattr(sys, 'frozen', False):
                 return
 
-            current_exe = sys.executable
+            current_exe = target_exe or sys.executable
             start_menu = os.path.join(os.environ.get('APPDATA', ''),
                                       'Microsoft', 'Windows', 'Start Menu', 'Programs', 'Inosys')
 
@@ -396,7 +555,7 @@ class PrimusImplantApp(ctk.CTk):
     $WshShell = New-Object -comObject WScript.Shell
     $Shortcut = $WshShell.CreateShortcut("{shortcut_path}")
     $Shortcut.TargetPath = "{current_exe}"
-    $Shortcut.WorkingDirectory = "{os.path.dirname(current_exe)}"
+    $Shortcut.WorkingDirectory = "{self.shortcut_working_directory(current_exe)}"
     $Shortcut.IconLocation = "{current_exe}"
     $Shortcut.Description = "Primus Implant Report Generator"
     $Shortcut.Save()
@@ -411,6 +570,24 @@ class PrimusImplantApp(ctk.CTk):
         except Exception as e:
             print(f"Error creating Start Menu shortcut: {e}")
 
+    @staticmethod
+    def shortcut_working_directory(exe_path: str) -> str:
+        """Installed versions run from the user directory, where the data files, logo and icon live"""
+        # Called from first-run setup too, before self.versioned_install exists
+        if versioned_install.VersionedInstall(get_user_app_directory()).is_managed(exe_path):
+            return get_user_app_directory()
+        return os.path.dirname(exe_path)
+
+    def update_shortcuts(self, target_exe: str) -> None:
+        """Point the existing desktop and Start Menu shortcuts at another installed version"""
+        desktop_shortcut = os.path.join(os.path.expanduser('~'), 'Desktop', "Primus Implant Report Generator.lnk")
+        start_menu_shortcut = os.path.join(os.environ.get('APPDATA', ''), 'Microsoft', 'Windows', 'Start Menu',
+                                           'Programs', 'Inosys', "Primus Implant Report Generator.lnk")
+        if os.path.exists(desktop_shortcut):
+            self.create_desktop_shortcut(target_exe)
+        if os.path.exists(start_menu_shortcut):
+            self.create_start_menu_shortcut(target_exe)
+
     def setup_user_installation(self) -> None:
         """Set up user-level installation on first run"""
         try:
@@ -443,84 +620,107 @@ class PrimusImplantApp(ctk.CTk):
         except Exception as e:
             print(f"Error during user installation setup: {e}")
 
-    # Update the load_implant_data method to use user directory
-    def load_implant_data(self) -> None:
-        """Load implant data from CSV file"""
-        csv_filename = self.get_data_file_path("Primus Implant List - Primus Implant List.csv")
+    def record_first_paint(self) -> None:
+        """Record the time from the end of __init__ to the first idle event loop pass"""
+        now = time.perf_counter()
+        self.profiler.record("startup.first_paint", now - self._init_finished_at)
+        self.profiler.record("startup.total", now - _PROCESS_START, time.process_time())
 
-        try:
-            if not os.path.exists(csv_filename):
-                raise FileNotFoundError(f"CSV file not found at {csv_filename}")
+    def start_implant_data_load(self) -> None:
+        """Load the implant catalog on a background thread; the result is picked up by process_catalog_events"""
+        threading.Thread(target=self.load_implant_data, name="CatalogLoad", daemon=True).start()
+        self.after(CATALOG_EVENT_POLL_MS, self.process_catalog_events)
 
-            self.implant_data = pd.read_csv(csv_filename)
-            print(f"Implant data loaded successfully from {csv_filename}!")
-            print(f"Total records: {len(self.implant_data)}")
-
-            # Validate required columns
-            required_columns = [
-                'Implant Line', 'Implant Part No', 'Implant Diameter', 'Implant Length',
-                'Guide Sleeve', 'Drill Length', 'Offset', 'Starter Drill',
-                'Initial Drill 1', 'Initial Drill 2', 'Drill 1', 'Drill 2', 'Drill 3', 'Drill 4'
-            ]
-
-            missing_columns = [col for col in required_columns if col not in self.implant_data.columns]
-            if missing_columns:
-                raise ValueError(f"Missing required columns: {missing_columns}")
-
-        except FileNotFoundError as e:
-            messagebox.showerror("File Not Found", str(e))
-            self.implant_data = pd.DataFrame()
-        except pd.errors.EmptyDataError:
-            messagebox.showerror("Error", f"The file '{csv_filename}' is empty")
-            self.implant_data = pd.DataFrame()
-        except pd.errors.ParserError as e:
-            messagebox.showerror("Error", f"Failed to parse CSV file: {str(e)}")
-            self.implant_data = pd.DataFrame()
-        except ValueError as e:
-            messagebox.showerror("Data Validation Error", str(e))
-            self.implant_data = pd.DataFrame()
-        except Exception as e:
-            messagebox.showerror("Error", f"Unexpected error loading implant data: {str(e)}")
-            self.implant_data = pd.DataFrame()
+    def process_catalog_events(self) -> None:
+        """Run the catalog results queued by the loader and watcher threads, then check again shortly"""
+        while True:
+            try:
+                handler, args = self.catalog_events.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                handler(*args)
+            except Exception as e:
+                print(f"Error applying catalog update: {e}")
+        self.after(CATALOG_EVENT_POLL_MS, self.process_catalog_events)
 
     def load_implant_data(self) -> None:
-        """Load implant data from CSV file"""
-        csv_filename: str = "Primus Implant List - Primus Implant List.csv"
+        """Load the implant catalog (on the loader thread), using the cached index when it is current"""
+        with self.profiler.span("catalog.load") as span:
+            result = self._load_implant_data()
+            span['records'] = len(result[0])
+        self.catalog_events.put((self.finish_implant_data_load, result))
+
+    def _load_implant_data(self) -> Tuple[catalog.ImplantIndex, Optional[Tuple[str, str]], str, str]:
+        """Load the catalog index, returning it with any error to report, the CSV path and its version"""
+        csv_filename = self.get_data_file_path(catalog.CATALOG_FILENAME)
+        version = catalog.source_version(csv_filename)  # Taken before reading so a concurrent edit is not missed
+        error: Optional[Tuple[str, str]] = None
+        implant_index = catalog.ImplantIndex()
 
         try:
             if not os.path.exists(csv_filename):
-                raise FileNotFoundError(f"CSV file '{csv_filename}' not found in current directory")
+                raise FileNotFoundError(f"CSV file not found at {csv_filename}")
 
-            self.implant_data = pd.read_csv(csv_filename)
+            implant_index = catalog.load_index(csv_filename, get_user_app_directory(), version)
             print(f"Implant data loaded successfully from {csv_filename}!")
-            print(f"Total records: {len(self.implant_data)}")
-
-            # Validate required columns
-            required_columns: List[str] = [
-                'Implant Line', 'Implant Part No', 'Implant Diameter', 'Implant Length',
-                'Guide Sleeve', 'Drill Length', 'Offset', 'Starter Drill',
-                'Initial Drill 1', 'Initial Drill 2', 'Drill 1', 'Drill 2', 'Drill 3', 'Drill 4'
-            ]
-
-            missing_columns: List[str] = [col for col in required_columns if col not in self.implant_data.columns]
-            if missing_columns:
-                raise ValueError(f"Missing required columns: {missing_columns}")
+            print(f"Total configurations: {len(implant_index)}")
 
         except FileNotFoundError as e:
-            messagebox.showerror("File Not Found", str(e))
-            self.implant_data = pd.DataFrame()
-        except pd.errors.EmptyDataError:
-            messagebox.showerror("Error", f"The file '{csv_filename}' is empty")
-            self.implant_data = pd.DataFrame()
-        except pd.errors.ParserError as e:
-            messagebox.showerror("Error", f"Failed to parse CSV file: {str(e)}")
-            self.implant_data = pd.DataFrame()
-        except ValueError as e:
-            messagebox.showerror("Data Validation Error", str(e))
-            self.implant_data = pd.DataFrame()
+            error = ("File Not Found", str(e))
         except Exception as e:
-            messagebox.showerror("Error", f"Unexpected error loading implant data: {str(e)}")
-            self.implant_data = pd.DataFrame()
+            # pandas is only imported on a cache miss, so only look at its error types once it failed
+            import pandas as pd
+
+            if isinstance(e, pd.errors.EmptyDataError):
+                error = ("Error", f"The file '{csv_filename}' is empty")
+            elif isinstance(e, pd.errors.ParserError):
+                error = ("Error", f"Failed to parse CSV file: {str(e)}")
+            elif isinstance(e, ValueError):
+                error = ("Data Validation Error", str(e))
+            else:
+                error = ("Error", f"Unexpected error loading implant data: {str(e)}")
+
+        return implant_index, error, csv_filename, version
+
+    def finish_implant_data_load(self, implant_index: catalog.ImplantIndex, error: Optional[Tuple[str, str]],
+                                 csv_filename: str, version: str) -> None:
+        """Install the loaded catalog and enable adding implants (on the UI thread)"""
+        self.implant_index = implant_index
+        self.catalog_loaded = True
+        self.add_implant_button.configure(state="normal", text="Add Implants to Plan")
+        self.update_implant_options()
+
+        if error:
+            messagebox.showerror(*error)
+
+        # Pick up catalog updates from the lab without a restart
+        self.catalog_watcher = catalog.CatalogWatcher(csv_filename, get_user_app_directory(), version,
+                                                      self.on_catalog_reloaded, self.on_catalog_reload_failed)
+        self.catalog_watcher.start()
+
+    def on_catalog_reloaded(self, implant_index: catalog.ImplantIndex) -> None:
+        """Hand a reloaded catalog to the UI thread (called on the watcher thread)"""
+        self.catalog_events.put((self.apply_catalog_reload, (implant_index,)))
+
+    def apply_catalog_reload(self, implant_index: catalog.ImplantIndex) -> None:
+        """Swap in a reloaded catalog; existing plans keep the records they were resolved against"""
+        self.implant_index = implant_index
+        self.update_implant_options()
+        print(f"Implant catalog reloaded: {len(implant_index)} configurations")
+
+    def on_catalog_reload_failed(self, error: Exception) -> None:
+        """Report a catalog update that could not be loaded (called on the watcher thread)"""
+        print(f"Failed to reload implant catalog: {error}")
+        self.catalog_events.put((self.show_catalog_reload_error, (error,)))
+
+    def show_catalog_reload_error(self, error: Exception) -> None:
+        """Tell the user a changed catalog could not be loaded (on the UI thread)"""
+        messagebox.showwarning(
+            "Catalog Not Reloaded",
+            f"The implant catalog changed but could not be loaded:\n\n{error}\n\n"
+            f"The previously loaded catalog is still in use."
+        )
 
     def bind_enter_keys(self) -> None:
         """Bind Enter key to appropriate actions based on current tab"""
@@ -572,7 +772,8 @@ class PrimusImplantApp(ctk.CTk):
             segmented_button_selected_hover_color=INOSYS_COLORS["medium_blue"],
             text_color=INOSYS_COLORS["text_primary"],
             segmented_button_unselected_color=INOSYS_COLORS["background_tertiary"],
-            segmented_button_unselected_hover_color=INOSYS_COLORS["background_secondary"]
+            segmented_button_unselected_hover_color=INOSYS_COLORS["background_secondary"],
+            command=self.on_tab_changed
         )
         self.notebook.pack(fill="both", expand=True, padx=20, pady=10)
 
@@ -590,35 +791,18 @@ class PrimusImplantApp(ctk.CTk):
 
     def load_and_display_logo(self, parent_frame: ctk.CTkFrame) -> None:
         """Load and display the Inosys logo in the GUI"""
-        logo_files: List[str] = [
-            "inosys_logo.png",
-            "inosys_logo.jpg",
-            "inosys_logo.jpeg",
-            "logo.png",
-            "logo.jpg",
-            "logo.jpeg"
-        ]
+        logo = assets.get_logo()
 
-        logo_path: Optional[str] = None
-        for logo_file in logo_files:
-            if os.path.exists(logo_file):
-                logo_path = logo_file
-                break
-
-        if logo_path:
+        if logo:
+            logo_path = logo.path
             try:
-                # Load logo using CTkImage
-                pil_image = PILImage.open(logo_path)
-                # Resize logo to fit nicely in header (maintain aspect ratio)
-                original_width, original_height = pil_image.size
-                max_height = 80
-                aspect_ratio = original_width / original_height
-                new_width = int(max_height * aspect_ratio)
+                # Pre-scaled variant from the asset cache, sized to fit nicely in the header
+                pil_image, display_size = logo.gui_image(assets.GUI_HEADER_LOGO_HEIGHT)
 
                 logo_image = ctk.CTkImage(
                     light_image=pil_image,
                     dark_image=pil_image,
-                    size=(new_width, max_height)
+                    size=display_size
                 )
 
                 logo_label: ctk.CTkLabel = ctk.CTkLabel(
@@ -633,7 +817,7 @@ class PrimusImplantApp(ctk.CTk):
             except Exception as e:
                 print(f"Error loading logo from {logo_path}: {str(e)}")
         else:
-            print("Logo file not found. Please ensure the logo is saved as one of: " + ", ".join(logo_files))
+            print("Logo file not found. Please ensure the logo is saved as one of: " + ", ".join(assets.LOGO_FILES))
 
     def set_window_icon(self) -> None:
         """Set the window icon"""
@@ -894,30 +1078,24 @@ class PrimusImplantApp(ctk.CTk):
 
     def add_logo_to_about(self, parent_frame: ctk.CTkFrame) -> None:
         """Add logo to about dialog if available"""
-        logo_files = ["inosys_logo.png", "logo.png", "icon.png"]
+        logo = assets.get_logo()
+        if logo is None:
+            return
 
-        for logo_file in logo_files:
-            if os.path.exists(logo_file):
-                try:
-                    pil_image = PILImage.open(logo_file)
-                    # Resize for about dialog
-                    original_width, original_height = pil_image.size
-                    aspect_ratio = original_width / original_height
-                    new_height = 60
-                    new_width = int(new_height * aspect_ratio)
-
-                    logo_image = ctk.CTkImage(
-                        light_image=pil_image,
-                        dark_image=pil_image,
-                        size=(new_width, new_height)
-                    )
-
-                    logo_label = ctk.CTkLabel(parent_frame, image=logo_image, text="")
-                    logo_label.pack(pady=(10, 0))
-                    return
-                except Exception as e:
-                    print(f"Could not load logo for about dialog: {e}")
-                    continue
+        try:
+            # Pre-scaled variant from the asset cache
+            pil_image, display_size = logo.gui_image(assets.ABOUT_LOGO_HEIGHT)
+
+            logo_image = ctk.CTkImage(
+                light_image=pil_image,
+                dark_image=pil_image,
+                size=display_size
+            )
+
+            logo_label = ctk.CTkLabel(parent_frame, image=logo_image, text="")
+            logo_label.pack(pady=(10, 0))
+        except Exception as e:
+            print(f"Could not load logo for about dialog: {e}")
 
     def check_for_updates(self) -> None:
         """Check for updates in user directory"""
@@ -927,112 +1105,9 @@ class PrimusImplantApp(ctk.CTk):
         update_thread.daemon = True
         update_thread.start()
 
-    def _user_update_check_worker(self, checking_dialog) -> None:
-        """User-level update check"""
-        try:
-            update_path = os.path.join(UPDATE_SERVER_PATH, UPDATE_FILENAME)
-
-            if not os.path.exists(update_path):
-                self.after(100, lambda: self._show_update_result(checking_dialog, "no_update"))
-                return
-
-            if getattr(sys, 'frozen', False):
-                current_exe = sys.executable
-
-                try:
-                    update_stat = os.stat(update_path)
-                    current_stat = os.stat(current_exe)
-
-                    if update_stat.st_mtime <= current_stat.st_mtime:
-                        self.after(100, lambda: self._show_update_result(checking_dialog, "up_to_date"))
-                        return
-                except:
-                    pass
-
-            self.after(100, lambda: self._show_update_result(checking_dialog, "update_available", update_path))
-
-        except Exception as e:
-            error_msg = f"Update check failed: {str(e)}"
-            self.after(100, lambda: self._show_update_result(checking_dialog, "error", error_msg))
-
-    def _update_check_worker(self, checking_dialog: ctk.CTkToplevel) -> None:
-        """Worker thread for checking and downloading updates"""
-        try:
-            # Look for version-specific files first, then fall back to generic name
-            version_specific_filename = f"Primus Implant Report Generator v{APP_VERSION}.exe"
-            generic_filename = UPDATE_FILENAME
-
-            version_specific_path = os.path.join(UPDATE_SERVER_PATH, version_specific_filename)
-            generic_path = os.path.join(UPDATE_SERVER_PATH, generic_filename)
-
-            update_path = None
-
-            # Check for newer version files (look for versions higher than current)
-            try:
-                if os.path.exists(UPDATE_SERVER_PATH):
-                    for filename in os.listdir(UPDATE_SERVER_PATH):
-                        if filename.startswith("Primus Implant Report Generator v") and filename.endswith(
-                                ".exe"):
-                            # Extract version from filename
-                            try:
-                                version_part = filename.replace("Primus Implant Report Generator v", "").replace(
-                                    ".exe", "")
-                                # Simple version comparison (works for x.y.z format)
-                                if self._is_newer_version(version_part, APP_VERSION):
-                                    update_path = os.path.join(UPDATE_SERVER_PATH, filename)
-                                    break
-                            except:
-                                continue
-            except:
-                pass
-
-            # If no version-specific newer file found, check generic file
-            if not update_path:
-                if os.path.exists(generic_path):
-                    update_path = generic_path
-                else:
-                    self.after(100, lambda: self._show_update_result(checking_dialog, "no_update"))
-                    return
-
-            # Get current executable path
-            if getattr(sys, 'frozen', False):
-                current_exe = sys.executable
-            else:
-                # For development, use a placeholder
-                current_exe = "main.py"
-
-            # Compare file sizes or modification times (simple update detection)
-            try:
-                update_stat = os.stat(update_path)
-                current_stat = os.stat(current_exe) if os.path.exists(current_exe) else None
-
-                if current_stat and update_stat.st_mtime <= current_stat.st_mtime and update_path == generic_path:
-                    self.after(100, lambda: self._show_update_result(checking_dialog, "up_to_date"))
-                    return
-            except:
-                pass  # If we can't compare, proceed with update
-
-            # Update available, start download
-            self.after(100, lambda: self._show_update_result(checking_dialog, "update_available", update_path))
-
-        except Exception as e:
-            error_msg = f"Update check failed: {str(e)}"
-            self.after(100, lambda: self._show_update_result(checking_dialog, "error", error_msg))
-
     def _is_newer_version(self, version1: str, version2: str) -> bool:
         """Compare two version strings (e.g., '1.0.2' vs '1.0.1')"""
-        try:
-            v1_parts = [int(x) for x in version1.split('.')]
-            v2_parts = [int(x) for x in version2.split('.')]
-
-            # Pad shorter version with zeros
-            max_len = max(len(v1_parts), len(v2_parts))
-            v1_parts.extend([0] * (max_len - len(v1_parts)))
-            v2_parts.extend([0] * (max_len - len(v2_parts)))
-
-            return v1_parts > v2_parts
-        except:
-            return False
+        return update_manifest.is_newer_version(version1, version2)
 
     def _show_update_result(self, checking_dialog: ctk.CTkToplevel, result: str, data: Optional[str] = None) -> None:
         """Show the result of update check"""
@@ -1067,7 +1142,6 @@ class PrimusImplantApp(ctk.CTk):
                 return
 
             current_exe = sys.executable
-            current_dir = os.path.dirname(current_exe)
             user_dir = get_user_app_directory()
 
             # Ensure we're running from user directory
@@ -1076,191 +1150,154 @@ class PrimusImplantApp(ctk.CTk):
                                                                    "Please run the application from the user installation to update."))
                 return
 
-            # Create backup
-            backup_path = current_exe + ".backup"
-            if os.path.exists(backup_path):
-                os.remove(backup_path)
-            shutil.copy2(current_exe, backup_path)
+            # Download the new version straight into its own version directory; the installed
+            # copy is never touched, so there is nothing to back up
+            manifest = self.update_manifests.read(self.update_share.path)
+            staged_exe = self.versioned_install.stage_path(manifest['version'])
 
-            # Copy new version to temporary location
-            temp_update = os.path.join(current_dir, "update_temp.exe")
-            shutil.copy2(update_path, temp_update)
+            if os.path.isfile(staged_exe) and update_manifest.file_sha256(staged_exe) == manifest['sha256'].lower():
+                print(f"Version {manifest['version']} is already staged")
+            else:
+                self._stage_update(update_path, manifest, current_exe, staged_exe, progress_dialog,
+                                   self.update_cancel_event)
 
-            # Create update script
-            update_script = self._create_user_update_script(current_exe, temp_update, backup_path)
+            # Switch the pointer file; the running version stays installed as the rollback target
+            activated = self.versioned_install.activate(manifest['version'], APP_VERSION, current_exe, manifest['sha256'])
+            self.update_shortcuts(activated['path'])
 
-            self.after(100, lambda: self._show_download_result(progress_dialog, "success", update_script))
+            self.after(100, lambda: self._show_download_result(progress_dialog, "success", activated['path']))
 
+        except update_transfer.TransferCancelled:
+            print("Update download cancelled; it will resume on the next update")
         except Exception as e:
             error_msg = f"Update failed: {str(e)}"
             self.after(100, lambda: self._show_download_result(progress_dialog, "error", error_msg))
 
-    def _create_user_update_script(self, current_exe: str, temp_update: str, backup_path: str) -> str:
-        """Create user-level update script"""
-        current_dir = os.path.dirname(current_exe)
-        script_path = os.path.join(current_dir, "perform_update.bat")
-
-        script_content = f'''@echo off
-    echo Updating Primus Implant Report Generator...
-
-    REM Wait for application to close
-    timeout /t 3 /nobreak >nul
-
-    REM Kill any remaining processes
-    taskkill /f /im "{os.path.basename(current_exe)}" 2>nul
+    def _stage_update(self, update_path: str, manifest: Dict[str, Any], current_exe: str, staged_exe: str,
+                      progress_dialog: ctk.CTkToplevel, cancel_event: threading.Event) -> None:
+        """Put the verified update executable at staged_exe, fetching as little as possible"""
+        source = update_transfer.open_source(update_path)
 
-    REM Wait a moment more
-    timeout /t 2 /nobreak >nul
-
-    REM Perform the update
-    echo Applying update...
-
-    REM Replace the executable
-    move "{temp_update}" "{current_exe}"
-
-    if %errorlevel% equ 0 (
-        echo Update successful!
-
-        REM Clean up backup
-        if exist "{backup_path}" del "{backup_path}"
-
-        REM Update shortcuts to ensure they're current
-        call :UpdateShortcuts
-
-        echo Starting updated application...
-        start "" "{current_exe}"
+        # An interrupted full download is resumed rather than replaced by a delta build
+        if update_transfer.has_partial(staged_exe, manifest['size'], manifest['sha256']):
+            print("Resuming the interrupted update download")
+            self._download_full_update(source, manifest, staged_exe, progress_dialog, cancel_event)
+            return
 
-    ) else (
-        echo Update failed, restoring backup...
-        if exist "{backup_path}" (
-            move "{backup_path}" "{current_exe}"
-            echo Backup restored.
+        # Prefer rebuilding from chunks of the installed executable, fetching only what changed
+        try:
+            chunk_manifest = update_delta.read_chunk_manifest(
+                update_delta.chunk_manifest_location(update_path), manifest['size'], manifest['sha256'])
+            _, fetched = update_delta.build_from_delta(
+                source, chunk_manifest, current_exe, staged_exe,
+                progress_callback=lambda done, total, rate: self.after(
+                    0, self.update_download_progress, progress_dialog, done / max(total, 1),
+                    f"Building update from installed version...\n{self.format_file_size(done)} of "
+                    f"{self.format_file_size(total)} ({self.format_file_size(int(rate))}/s downloaded)"),
+                cancel_event=cancel_event
+            )
+            print(f"Delta update fetched {self.format_file_size(fetched)} of {self.format_file_size(manifest['size'])}")
+        except update_transfer.TransferCancelled:
+            raise
+        except Exception as e:
+            print(f"Delta update not possible ({e}), downloading the full update")
+            self._download_full_update(source, manifest, staged_exe, progress_dialog, cancel_event)
+
+    def _download_full_update(self, source, manifest: Dict[str, Any], staged_exe: str,
+                              progress_dialog: ctk.CTkToplevel, cancel_event: threading.Event) -> None:
+        """Download the whole update executable, resuming any earlier partial download"""
+        update_transfer.download(
+            source, staged_exe, manifest['size'], manifest['sha256'],
+            progress_callback=lambda done, total, rate: self.after(
+                0, self.update_download_progress, progress_dialog, done / max(total, 1),
+                f"Downloading update...\n{self.format_file_size(done)} of {self.format_file_size(total)} "
+                f"({self.format_file_size(int(rate))}/s)"),
+            cancel_event=cancel_event
         )
 
-        REM Clean up failed update file
-        if exist "{temp_update}" del "{temp_update}"
-
-        echo Starting original application...
-        start "" "{current_exe}"
-    )
-
-    REM Clean up this script
-    timeout /t 2 /nobreak >nul
-    del "%~f0"
-    exit /b
-
-    :UpdateShortcuts
-    REM Update desktop shortcut
-    set "DESKTOP_SHORTCUT=%USERPROFILE%\\Desktop\\Primus Implant Report Generator.lnk"
-    if exist "%DESKTOP_SHORTCUT%" (
-        powershell -Command "$WshShell = New-Object -comObject WScript.Shell; $Shortcut = $WshShell.CreateShortcut('%DESKTOP_SHORTCUT%'); $Shortcut.TargetPath = '{current_exe}'; $Shortcut.WorkingDirectory = '{current_dir}'; $Shortcut.IconLocation = '{current_exe}'; $Shortcut.Save()"
-    )
-
-    REM Update Start Menu shortcut
-    set "START_MENU_SHORTCUT=%APPDATA%\\Microsoft\\Windows\\Start Menu\\Programs\\Inosys\\Primus Implant Report Generator.lnk"
-    if exist "%START_MENU_SHORTCUT%" (
-        powershell -Command "$WshShell = New-Object -comObject WScript.Shell; $Shortcut = $WshShell.CreateShortcut('%START_MENU_SHORTCUT%'); $Shortcut.TargetPath = '{current_exe}'; $Shortcut.WorkingDirectory = '{current_dir}'; $Shortcut.IconLocation = '{current_exe}'; $Shortcut.Save()"
-    )
-    exit /b
-    '''
-
-        with open(script_path, 'w') as f:
-            f.write(script_content)
+    def update_download_progress(self, progress_dialog: ctk.CTkToplevel, fraction: float, message: str) -> None:
+        """Show download progress in the update dialog"""
+        if not progress_dialog.winfo_exists():
+            return
 
-        return script_path
+        progress_bar = getattr(progress_dialog, 'progress_bar', None)
+        if progress_bar is not None:
+            if progress_bar.cget("mode") == "indeterminate":
+                progress_bar.stop()
+                progress_bar.configure(mode="determinate")
+            progress_bar.set(fraction)
+        progress_dialog.message_label.configure(text=message)
 
     def get_update_server_info(self) -> dict:
         """Get update server information - can be customized for different deployment methods"""
         return {
             'type': 'network_share',  # or 'web', 'local'
-            'path': UPDATE_SERVER_PATH,
+            'path': self.update_share.path,
             'filename': UPDATE_FILENAME,
             'version_file': 'version.txt'
         }
 
-    def get_update_info(self) -> dict:
-        """Get comprehensive update information"""
+    def get_update_info(self) -> Optional[dict]:
+        """Get the update manifest published on the update server, or None if there is none"""
         try:
-            update_manifest_path = os.path.join(UPDATE_SERVER_PATH, 'update_manifest.json')
-
-            if os.path.exists(update_manifest_path):
-                with open(update_manifest_path, 'r') as f:
-                    return json.load(f)
-            else:
-                # Fallback to basic file checking
-                update_exe_path = os.path.join(UPDATE_SERVER_PATH, UPDATE_FILENAME)
-                if os.path.exists(update_exe_path):
-                    stat_info = os.stat(update_exe_path)
-                    return {
-                        "version": "Unknown",
-                        "build_date": datetime.fromtimestamp(stat_info.st_mtime).isoformat(),
-                        "executable": UPDATE_FILENAME,
-                        "size": stat_info.st_size
-                    }
-
+            if not self.check_update_server_access():
+                return None
+            return self.update_manifests.read(self.update_share.path)
+        except FileNotFoundError:
             return None
         except Exception as e:
             print(f"Error getting update info: {e}")
             return None
 
-    def check_update_server_access(self) -> bool:
-        """Enhanced update server access check"""
-        try:
-            # Check if primary network path exists
-            network_path = r"\\CDIMANQ30\Creoman-Active\CADCAM\Software\Primus Implant Report Generator\UserUpdates"
-            if os.path.exists(network_path):
-                self.log_update_activity(f"Network update server accessible: {network_path}")
-                return True
-
-            # Check fallback local path
-            local_path = r"C:\Shared\PrimusUpdates"
-            if os.path.exists(local_path):
-                self.log_update_activity(f"Local update server accessible: {local_path}")
-                return True
-
-            # No update server accessible
-            self.log_update_activity("No update servers accessible")
-            return False
+    def find_available_update(self, refresh: bool = False) -> Tuple[str, Optional[str]]:
+        """Check the update manifest against the running version.
 
-        except Exception as e:
-            self.log_update_activity(f"Error checking update server access: {e}")
-            return False
+        Returns (result, data) for _show_update_result; data is the update
+        executable's path when an update is available. Call from a worker thread.
+        """
+        if not self.check_update_server_access(refresh=refresh):
+            self.log_update_activity("Update server not accessible")
+            return "no_server", None
 
-    def check_update_server_access(self) -> bool:
-        """Check if we can access the update server"""
+        try:
+            manifest = self.update_manifests.read(self.update_share.path)
+        except FileNotFoundError:
+            self.log_update_activity("No update manifest found")
+            return "no_update", None
+        except update_manifest.ManifestError as e:
+            self.log_update_activity(f"Invalid update manifest: {e}", "ERROR")
+            return "error", f"The update manifest on the server is invalid: {e}"
+
+        result = update_manifest.check_manifest(manifest, APP_VERSION)
+        self.log_update_activity(f"Manifest version {manifest['version']} (minimum {manifest['minimum_version']}), "
+                                 f"running {APP_VERSION}: {result}")
+        if result == "update_available":
+            return result, os.path.join(self.update_share.path, manifest['executable'])
+        if result == "unsupported":
+            return result, manifest['minimum_version']
+        return result, None
+
+    def check_update_server_access(self, refresh: bool = False) -> bool:
+        """Check if we can access the update server.
+
+        Uses the cached probe result unless it is stale or refresh is set; probes
+        are bounded by a timeout, but call this from a worker thread.
+        """
         try:
             server_info = self.get_update_server_info()
 
-            if server_info['type'] == 'network_share':
-                return os.path.exists(server_info['path'])
+            if server_info['type'] in ('network_share', 'local'):
+                path, reachable = self.update_share.resolve(refresh)
+                self.log_update_activity(f"Update server {'accessible' if reachable else 'not accessible'}: {path}")
+                return reachable
             elif server_info['type'] == 'web':
                 # Add web-based update check here if needed
                 pass
-            elif server_info['type'] == 'local':
-                return os.path.exists(server_info['path'])
 
             return False
         except:
             return False
 
-    def _show_download_result(self, progress_dialog, result: str, data: str) -> None:
-        """Show update result with user-friendly messages"""
-        progress_dialog.destroy()
-
-        if result == "error":
-            messagebox.showerror("Update Error",
-                                 f"{data}\n\nYou can manually download the latest version from the network location.")
-        elif result == "success":
-            response = messagebox.askyesno(
-                "Update Ready",
-                "Update is ready to install. The application will close and restart automatically.\n\n"
-                "Click Yes to proceed with the update, or No to update later."
-            )
-            if response:
-                # Close application and run update script
-                subprocess.Popen(data, shell=True)
-                self.quit()
-
     # Optional: Add a method to check for updates on startup
     def check_for_updates_on_startup(self) -> None:
         """Optionally check for updates when the application starts"""
@@ -1272,27 +1309,10 @@ class PrimusImplantApp(ctk.CTk):
     def _silent_update_check(self) -> None:
         """Silent update check for startup"""
         try:
-            if not self.check_update_server_access():
-                return
-
-            update_path = os.path.join(UPDATE_SERVER_PATH, UPDATE_FILENAME)
-            if not os.path.exists(update_path):
-                return
-
-            if getattr(sys, 'frozen', False):
-                current_exe = sys.executable
-
-                try:
-                    update_stat = os.stat(update_path)
-                    current_stat = os.stat(current_exe)
-
-                    if update_stat.st_mtime > current_stat.st_mtime:
-                        # Show update notification in main thread
-                        self.after(100, self._show_update_notification)
-
-                except Exception:
-                    pass
-
+            result, _ = self.find_available_update()
+            if result == "update_available":
+                # Show update notification in main thread
+                self.after(100, self._show_update_notification)
         except Exception as e:
             print(f"Silent update check failed: {e}")
 
@@ -1308,39 +1328,15 @@ class PrimusImplantApp(ctk.CTk):
             self.check_for_updates()
 
     # Add logging for better troubleshooting
-    def log_update_activity(self, message: str) -> None:
+    def log_update_activity(self, message: str, level: str = "INFO") -> None:
         """Log update activities for troubleshooting"""
-        try:
-            user_dir = get_user_app_directory()
-            log_file = os.path.join(user_dir, 'logs', 'updates.log')
-
-            os.makedirs(os.path.dirname(log_file), exist_ok=True)
-
-            with open(log_file, 'a', encoding='utf-8') as f:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                f.write(f"[{timestamp}] {message}\n")
-
-        except Exception as e:
-            print(f"Failed to write log: {e}")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.log_writer.log('updates.log', f"[{timestamp}] {message}", level)
 
     def log_window_activity(self, message: str, level: str = "INFO") -> None:
         """Log window memory activities for debugging"""
-        try:
-            user_dir = get_user_app_directory()
-            log_dir = os.path.join(user_dir, 'logs')
-            log_file = os.path.join(log_dir, 'window_memory.log')
-
-            os.makedirs(log_dir, exist_ok=True)
-
-            with open(log_file, 'a', encoding='utf-8') as f:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                f.write(f"[{timestamp}] [{level}] {message}\n")
-
-            # Also print to console for immediate feedback
-            print(f"[WINDOW_MEMORY] [{level}] {message}")
-
-        except Exception as e:
-            print(f"Failed to write window memory log: {e}")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.log_writer.log('window_memory.log', f"[{timestamp}] [{level}] {message}", level)
 
     # Enhanced update check with better error handling
     def _user_update_check_worker(self, checking_dialog) -> None:
@@ -1348,44 +1344,9 @@ class PrimusImplantApp(ctk.CTk):
         try:
             self.log_update_activity("Starting update check...")
 
-            # Check server access first
-            if not self.check_update_server_access():
-                self.log_update_activity("Update server not accessible")
-                self.after(100, lambda: self._show_update_result(checking_dialog, "no_server"))
-                return
-
-            update_path = os.path.join(UPDATE_SERVER_PATH, UPDATE_FILENAME)
-            self.log_update_activity(f"Checking for update at: {update_path}")
-
-            if not os.path.exists(update_path):
-                self.log_update_activity("No update file found")
-                self.after(100, lambda: self._show_update_result(checking_dialog, "no_update"))
-                return
-
-            if getattr(sys, 'frozen', False):
-                current_exe = sys.executable
-                self.log_update_activity(f"Current executable: {current_exe}")
-
-                try:
-                    update_stat = os.stat(update_path)
-                    current_stat = os.stat(current_exe)
-
-                    update_time = datetime.fromtimestamp(update_stat.st_mtime)
-                    current_time = datetime.fromtimestamp(current_stat.st_mtime)
-
-                    self.log_update_activity(f"Update file time: {update_time}")
-                    self.log_update_activity(f"Current file time: {current_time}")
-
-                    if update_stat.st_mtime <= current_stat.st_mtime:
-                        self.log_update_activity("Current version is up to date")
-                        self.after(100, lambda: self._show_update_result(checking_dialog, "up_to_date"))
-                        return
-
-                except Exception as e:
-                    self.log_update_activity(f"Error comparing file times: {e}")
-
-            self.log_update_activity("Update available, prompting user")
-            self.after(100, lambda: self._show_update_result(checking_dialog, "update_available", update_path))
+            # The user asked, so probe the server again rather than trust the cached reachability
+            result, data = self.find_available_update(refresh=True)
+            self.after(100, lambda: self._show_update_result(checking_dialog, result, data))
 
         except Exception as e:
             error_msg = f"Update check failed: {str(e)}"
@@ -1403,6 +1364,11 @@ class PrimusImplantApp(ctk.CTk):
         elif result == "no_server":
             messagebox.showwarning("Update Server",
                                    "Cannot connect to update server. Please check your network connection or contact IT support.")
+        elif result == "unsupported":
+            messagebox.showwarning("Update Available",
+                                   f"A new version is available, but version {APP_VERSION} is too old to update "
+                                   f"automatically (version {data} or later is required).\n\n"
+                                   "Please reinstall the application from the network location or contact IT support.")
         elif result == "error":
             messagebox.showerror("Update Error",
                                  f"{data}\n\nPlease try again later or contact support if the problem persists.")
@@ -1462,83 +1428,6 @@ class PrimusImplantApp(ctk.CTk):
             "skip_version": None
         }
 
-    def _download_worker(self, update_path: str, progress_dialog: ctk.CTkToplevel) -> None:
-        """Worker thread for downloading and installing update"""
-        try:
-            # Get current executable info
-            if getattr(sys, 'frozen', False):
-                current_exe = sys.executable
-                current_dir = os.path.dirname(current_exe)
-                current_name = os.path.basename(current_exe)
-            else:
-                # For development mode
-                self.after(100, lambda: self._show_download_result(progress_dialog, "error",
-                                                                   "Updates are only available for compiled executables."))
-                return
-
-            # Create backup of current executable
-            backup_path = os.path.join(current_dir, f"{current_name}.backup")
-            shutil.copy2(current_exe, backup_path)
-
-            # Copy new executable
-            temp_path = os.path.join(current_dir, f"{current_name}.new")
-            shutil.copy2(update_path, temp_path)
-
-            # Create update script
-            update_script = self._create_update_script(current_exe, temp_path, backup_path)
-
-            self.after(100, lambda: self._show_download_result(progress_dialog, "success", update_script))
-
-        except Exception as e:
-            error_msg = f"Update installation failed: {str(e)}"
-            self.after(100, lambda: self._show_download_result(progress_dialog, "error", error_msg))
-
-    def _create_update_script(self, current_exe: str, temp_path: str, backup_path: str) -> str:
-        """Create a batch script to complete the update"""
-        script_content = f'''@echo off
-echo Updating Primus Implant Report Generator...
-timeout /t 2 /nobreak >nul
-
-REM Replace the executable
-move "{temp_path}" "{current_exe}"
-
-REM Update shortcuts
-set "desktop_shortcut=%USERPROFILE%\\Desktop\\Primus Report Generator.lnk"
-set "startmenu_shortcut=%APPDATA%\\Microsoft\\Windows\\Start Menu\\Programs\\Inosys\\Primus Report Generator.lnk"
-
-REM Update desktop shortcut if it exists
-if exist "%desktop_shortcut%" (
-    del "%desktop_shortcut%"
-    powershell "$ws = New-Object -ComObject WScript.Shell; $s = $ws.CreateShortcut('%desktop_shortcut%'); $s.TargetPath = '{current_exe}'; $s.Save()"
-)
-
-REM Update start menu shortcut if it exists
-if exist "%startmenu_shortcut%" (
-    del "%startmenu_shortcut%"
-    powershell "$ws = New-Object -ComObject WScript.Shell; $s = $ws.CreateShortcut('%startmenu_shortcut%'); $s.TargetPath = '{current_exe}'; $s.Save()"
-)
-
-REM Clean up backup after successful update
-if exist "{current_exe}" (
-    del "{backup_path}"
-) else (
-    REM Restore backup if update failed
-    move "{backup_path}" "{current_exe}"
-)
-
-REM Restart the application
-start "" "{current_exe}"
-
-REM Delete this script
-del "%~f0"
-'''
-
-        script_path = os.path.join(os.path.dirname(current_exe), "update_primus.bat")
-        with open(script_path, 'w') as f:
-            f.write(script_content)
-
-        return script_path
-
     def _show_download_result(self, progress_dialog: ctk.CTkToplevel, result: str, data: str) -> None:
         """Show the result of download/installation"""
         progress_dialog.destroy()
@@ -1546,17 +1435,48 @@ del "%~f0"
         if result == "error":
             messagebox.showerror("Update Error", data)
         elif result == "success":
-            if messagebox.showinfo("Update Ready",
-                                   "Update downloaded successfully. The application will now restart to complete the installation."):
-                # Execute the update script and exit
-                subprocess.Popen(data, shell=True)
-                self.quit()
+            if messagebox.askyesno("Update Ready",
+                                   "Update is installed. Click Yes to restart now, "
+                                   "or No to start the new version next time."):
+                self.restart_into(data)
+
+    def restart_into(self, exe_path: str) -> None:
+        """Close this window and start another installed version straight away"""
+        self.on_window_close()
+        try:
+            versioned_install.launch(exe_path, get_user_app_directory())
+        except OSError as e:
+            messagebox.showerror("Update Error", f"Could not start {exe_path}: {e}")
+
+    def roll_back_update(self) -> None:
+        """Switch back to the version that was installed before the last update"""
+        if not getattr(sys, 'frozen', False):
+            messagebox.showinfo("Roll Back", "Rolling back is only available for compiled executables.")
+            return
+
+        previous = self.versioned_install.previous()
+        if previous is None or not os.path.isfile(previous['path']):
+            messagebox.showinfo("Roll Back", "No previous version is installed.")
+            return
+
+        if not messagebox.askyesno("Roll Back",
+                                   f"Switch back to version {previous['version']}?\n\n"
+                                   "The application will restart."):
+            return
+
+        try:
+            restored = self.versioned_install.rollback()
+            self.update_shortcuts(restored['path'])
+        except Exception as e:
+            messagebox.showerror("Roll Back", f"Could not roll back: {e}")
+            return
+        self.restart_into(restored['path'])
 
     def show_update_dialog(self, message: str, show_progress: bool = False) -> ctk.CTkToplevel:
         """Show a dialog for update operations"""
         dialog = ctk.CTkToplevel(self)
         dialog.title("Update")
-        dialog.geometry("300x150")
+        dialog.geometry("340x170")
         dialog.resizable(False, False)
         dialog.configure(fg_color=INOSYS_COLORS["background_primary"])
 
@@ -1576,6 +1496,7 @@ del "%~f0"
             text_color=INOSYS_COLORS["text_primary"]
         )
         message_label.pack(pady=20)
+        dialog.message_label = message_label
 
         # Progress bar (if requested)
         if show_progress:
@@ -1583,6 +1504,7 @@ del "%~f0"
             progress.pack(pady=10)
             progress.configure(mode="indeterminate")
             progress.start()
+            dialog.progress_bar = progress
 
         return dialog
 
@@ -1629,6 +1551,7 @@ del "%~f0"
             input_frame,
             values=["Primus"],
             variable=self.implant_line_var,
+            command=self.update_implant_options,
             state="readonly",
             fg_color=INOSYS_COLORS["background_secondary"],
             button_color=INOSYS_COLORS["medium_blue"],
@@ -1648,8 +1571,10 @@ del "%~f0"
         self.implant_diameter_var = ctk.StringVar()
         self.implant_diameter_combo = ctk.CTkComboBox(
             input_frame,
-            values=["3.5", "4.0", "4.5", "5.0"],
+            values=[],
             variable=self.implant_diameter_var,
+            command=self.update_implant_options,
+            state="disabled",
             fg_color=INOSYS_COLORS["background_secondary"],
             button_color=INOSYS_COLORS["medium_blue"],
             button_hover_color=INOSYS_COLORS["light_blue"],
@@ -1668,8 +1593,10 @@ del "%~f0"
         self.implant_length_var = ctk.StringVar()
         self.implant_length_combo = ctk.CTkComboBox(
             input_frame,
-            values=["7.5", "8.5", "10.0", "11.5", "13.0"],
+            values=[],
             variable=self.implant_length_var,
+            command=self.update_implant_options,
+            state="disabled",
             fg_color=INOSYS_COLORS["background_secondary"],
             button_color=INOSYS_COLORS["medium_blue"],
             button_hover_color=INOSYS_COLORS["light_blue"],
@@ -1688,8 +1615,9 @@ del "%~f0"
         self.offset_var = ctk.StringVar()
         self.offset_combo = ctk.CTkComboBox(
             input_frame,
-            values=["10", "11.5", "13"],
+            values=[],
             variable=self.offset_var,
+            state="disabled",
             fg_color=INOSYS_COLORS["background_secondary"],
             button_color=INOSYS_COLORS["medium_blue"],
             button_hover_color=INOSYS_COLORS["light_blue"],
@@ -1736,10 +1664,11 @@ del "%~f0"
         # Configure grid weights
         input_frame.columnconfigure(1, weight=1)
 
-        # Add implant button
-        add_button: ctk.CTkButton = ctk.CTkButton(
+        # Add implant button, enabled once the catalog has loaded
+        self.add_implant_button: ctk.CTkButton = ctk.CTkButton(
             scrollable_frame,
-            text="Add Implants to Plan",
+            text="Add Implants to Plan" if self.catalog_loaded else "Loading catalog...",
+            state="normal" if self.catalog_loaded else "disabled",
             command=self.add_implants_to_plan,
             height=40,
             font=ctk.CTkFont(size=14, weight="bold"),
@@ -1747,7 +1676,7 @@ del "%~f0"
             hover_color=INOSYS_COLORS["medium_blue"],
             text_color=INOSYS_COLORS["white"]
         )
-        add_button.pack(pady=20)
+        self.add_implant_button.pack(pady=20)
 
     def setup_review_plan_tab(self) -> None:
         tab: ctk.CTkFrame = self.notebook.tab("Review Plan")
@@ -1766,8 +1695,9 @@ del "%~f0"
         title_label.pack(pady=10)
 
         # Scrollable frame for plan items
-        self.plan_scrollable_frame = ctk.CTkScrollableFrame(
+        self.plan_scrollable_frame = PlanListView(
             plan_frame,
+            on_remove=self.remove_tooth_plan,
             fg_color=INOSYS_COLORS["background_tertiary"]
         )
         self.plan_scrollable_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -1856,6 +1786,10 @@ del "%~f0"
 
         info_frame.columnconfigure(1, weight=1)
 
+        # Any edit to the case details refreshes the live preview
+        for entry in (self.doctor_name_entry, self.patient_name_entry, self.case_number_entry):
+            entry.bind("<KeyRelease>", lambda event: self.schedule_preview_refresh(), add="+")
+
         # Case Notes section
         notes_frame: ctk.CTkFrame = ctk.CTkFrame(main_scrollable, fg_color=INOSYS_COLORS["background_tertiary"])
         notes_frame.pack(fill="x", padx=20, pady=10)
@@ -1889,13 +1823,14 @@ del "%~f0"
 
         # Placeholder text functionality
         self.setup_notes_placeholder()
+        self.case_notes_text.bind("<KeyRelease>", lambda event: self.schedule_preview_refresh(), add="+")
 
         # Button frame
         button_frame: ctk.CTkFrame = ctk.CTkFrame(main_scrollable, fg_color="transparent")
         button_frame.pack(pady=20)
 
         # Print Preview button
-        preview_button: ctk.CTkButton = ctk.CTkButton(
+        self.preview_button: ctk.CTkButton = ctk.CTkButton(
             button_frame,
             text="View Report",
             command=self.show_print_preview,
@@ -1906,10 +1841,10 @@ del "%~f0"
             hover_color=INOSYS_COLORS["light_blue"],
             text_color=INOSYS_COLORS["white"]
         )
-        preview_button.pack(side="left", padx=10)
+        self.preview_button.pack(side="left", padx=10)
 
         # Generate PDF button
-        generate_button: ctk.CTkButton = ctk.CTkButton(
+        self.generate_button: ctk.CTkButton = ctk.CTkButton(
             button_frame,
             text="Save Report",
             command=self.generate_pdf_report,
@@ -1920,7 +1855,89 @@ del "%~f0"
             hover_color=INOSYS_COLORS["medium_blue"],
             text_color=INOSYS_COLORS["white"]
         )
-        generate_button.pack(side="left", padx=10)
+        self.generate_button.pack(side="left", padx=10)
+
+        # Output size option for saved reports
+        self.compact_pdf_var = tk.BooleanVar(value=False)
+        self.compact_pdf_checkbox: ctk.CTkCheckBox = ctk.CTkCheckBox(
+            main_scrollable,
+            text="Compact PDF (downsample logo, smaller files for the case archive)",
+            variable=self.compact_pdf_var,
+            command=self.schedule_preview_refresh,
+            font=ctk.CTkFont(size=12),
+            text_color=INOSYS_COLORS["text_primary"],
+            fg_color=INOSYS_COLORS["light_blue"],
+            hover_color=INOSYS_COLORS["medium_blue"]
+        )
+        self.compact_pdf_checkbox.pack(pady=(0, 20))
+
+        # Report progress, shown only while a report is being built
+        self.report_progress_frame: ctk.CTkFrame = ctk.CTkFrame(main_scrollable, fg_color="transparent")
+
+        self.report_status_label: ctk.CTkLabel = ctk.CTkLabel(
+            self.report_progress_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=INOSYS_COLORS["text_primary"]
+        )
+        self.report_status_label.pack(pady=(0, 5))
+
+        self.report_progress_bar: ctk.CTkProgressBar = ctk.CTkProgressBar(self.report_progress_frame, width=300)
+        self.report_progress_bar.set(0)
+        self.report_progress_bar.pack(side="left", padx=10)
+
+        self.report_cancel_button: ctk.CTkButton = ctk.CTkButton(
+            self.report_progress_frame,
+            text="Cancel",
+            command=self.cancel_report_job,
+            width=100,
+            fg_color=INOSYS_COLORS["dark_blue"],
+            hover_color=INOSYS_COLORS["medium_blue"]
+        )
+        self.report_cancel_button.pack(side="left", padx=10)
+
+        # Live preview pane
+        preview_frame: ctk.CTkFrame = ctk.CTkFrame(main_scrollable, fg_color=INOSYS_COLORS["background_tertiary"])
+        preview_frame.pack(fill="x", padx=20, pady=10)
+
+        preview_header = ctk.CTkFrame(preview_frame, fg_color="transparent")
+        preview_header.pack(fill="x", padx=10, pady=(10, 5))
+
+        ctk.CTkLabel(
+            preview_header,
+            text="Live Preview",
+            font=ctk.CTkFont(size=12, weight="bold"),
+            text_color=INOSYS_COLORS["text_primary"]
+        ).pack(side="left")
+
+        ctk.CTkButton(
+            preview_header,
+            text="Print",
+            command=self.print_preview,
+            width=100,
+            fg_color=INOSYS_COLORS["medium_blue"],
+            hover_color=INOSYS_COLORS["light_blue"]
+        ).pack(side="right", padx=(10, 0))
+
+        ctk.CTkButton(
+            preview_header,
+            text="Open in PDF Viewer",
+            command=self.open_preview_in_viewer,
+            width=140,
+            fg_color=INOSYS_COLORS["dark_blue"],
+            hover_color=INOSYS_COLORS["medium_blue"]
+        ).pack(side="right")
+
+        self.preview_status_label: ctk.CTkLabel = ctk.CTkLabel(
+            preview_frame,
+            text="Add implants to the plan to see a preview.",
+            font=ctk.CTkFont(size=11),
+            text_color=INOSYS_COLORS["text_secondary"]
+        )
+        self.preview_status_label.pack(anchor="w", padx=10)
+
+        self.preview_pages_frame: ctk.CTkFrame = ctk.CTkFrame(preview_frame, fg_color="transparent")
+        self.preview_pages_frame.pack(fill="x", padx=10, pady=(5, 10))
 
     def setup_notes_placeholder(self) -> None:
         """Setup placeholder text for case notes"""
@@ -1982,146 +1999,221 @@ del "%~f0"
             return None
 
     def show_print_preview(self) -> None:
-        """Generate and show print preview"""
+        """Render the preview now instead of waiting for the debounce"""
         if not self.implant_plans:
             messagebox.showerror("Error", "No implant plans to preview!")
             return
 
-        try:
-            # Get form data
-            doctor_name: str = self.doctor_name_entry.get() or "Dr. [Name]"
-            patient_name: str = self.patient_name_entry.get() or "[Patient Name]"
-            case_number: str = self.case_number_entry.get() or "[Case Number]"
-            case_notes: str = self.get_case_notes()
+        if pdf_preview.is_available():
+            if self.preview_after_id is not None:
+                self.after_cancel(self.preview_after_id)
+            self.refresh_preview()
+        else:
+            # No in-process renderer, fall back to the default PDF viewer
+            self.open_preview_in_viewer()
 
-            # Create temporary PDF
-            temp_dir = tempfile.gettempdir()
-            temp_filename = os.path.join(temp_dir, f"primus_preview_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
+    def on_tab_changed(self) -> None:
+        """Catch up on preview changes made while the Generate Report tab was hidden"""
+        if self.notebook.get() == "Generate Report" and self.preview_dirty:
+            self.refresh_preview()
 
-            # Generate preview PDF
-            self.create_pdf_report(temp_filename, doctor_name, patient_name, case_number, case_notes, is_preview=True)
+    def schedule_preview_refresh(self) -> None:
+        """Re-render the preview once edits pause for PREVIEW_DEBOUNCE_MS"""
+        self.preview_dirty = True
 
-            # Open with default PDF viewer
-            if sys.platform.startswith('win'):
-                os.startfile(temp_filename)
-            elif sys.platform.startswith('darwin'):  # macOS
-                subprocess.run(['open', temp_filename])
-            else:  # Linux
-                subprocess.run(['xdg-open', temp_filename])
+        # A newer edit makes any render still in flight stale
+        self.cancel_preview_render()
 
-            # Show preview dialog
-            self.show_preview_dialog(temp_filename)
+        if self.preview_after_id is not None:
+            self.after_cancel(self.preview_after_id)
+        self.preview_after_id = self.after(PREVIEW_DEBOUNCE_MS, self.refresh_preview)
 
-        except Exception as e:
-            messagebox.showerror("Preview Error", f"Failed to generate preview: {str(e)}")
+    def cancel_preview_render(self) -> None:
+        """Stop the preview render in flight, if any"""
+        if self.preview_job is not None:
+            self.preview_job['cancel_event'].set()
+            self.preview_job = None
 
-    def show_preview_dialog(self, temp_filename: str) -> None:
-        """Show preview dialog with options"""
-        preview_dialog = ctk.CTkToplevel(self)
-        preview_dialog.title("Print Preview")
-        preview_dialog.geometry("400x200")
-        preview_dialog.resizable(False, False)
-        preview_dialog.configure(fg_color=INOSYS_COLORS["background_primary"])
+    def refresh_preview(self) -> None:
+        """Render the current case into the preview pane on a background thread"""
+        self.preview_after_id = None
 
-        # Center the dialog
-        preview_dialog.transient(self)
-        preview_dialog.grab_set()
+        # Rendering for a hidden tab is wasted work; on_tab_changed picks it up later
+        if self.notebook.get() != "Generate Report":
+            return
 
-        # Main frame
-        main_frame = ctk.CTkFrame(preview_dialog, fg_color=INOSYS_COLORS["background_secondary"])
-        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        self.preview_dirty = False
+        self.cancel_preview_render()
 
-        # Message
-        message_label = ctk.CTkLabel(
-            main_frame,
-            text="Preview opened in your default PDF viewer.\n\nHow would you like to proceed?",
-            font=ctk.CTkFont(size=12),
-            text_color=INOSYS_COLORS["text_primary"]
+        if not self.implant_plans:
+            self.preview_pdf_bytes = None
+            self.show_preview_pages([])
+            self.preview_status_label.configure(text="Add implants to the plan to see a preview.")
+            return
+
+        job: Dict[str, Any] = {'cancel_event': threading.Event()}
+        self.preview_job = job
+        self.preview_status_label.configure(text="Updating preview...")
+
+        thread = threading.Thread(
+            target=self._preview_worker,
+            args=(job, list(self.implant_plans), self.doctor_name_entry.get() or "Dr. [Name]",
+                  self.patient_name_entry.get() or "[Patient Name]",
+                  self.case_number_entry.get() or "[Case Number]", self.get_case_notes(),
+                  self.compact_pdf_var.get()),
+            name="PreviewWorker",
+            daemon=True
         )
-        message_label.pack(pady=20)
+        thread.start()
 
-        # Button frame
-        button_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
-        button_frame.pack(pady=10)
+    def _preview_worker(self, job: Dict[str, Any], plans: List[ImplantPlan], doctor_name: str,
+                        patient_name: str, case_number: str, case_notes: str, compact: bool) -> None:
+        """Render the preview PDF in memory and rasterize its pages (runs on the worker thread)"""
+        import report_engine
 
-        # Save As button
-        save_button = ctk.CTkButton(
-            button_frame,
-            text="Save As...",
-            command=lambda: self.save_preview_as(temp_filename, preview_dialog),
-            width=100,
-            fg_color=INOSYS_COLORS["light_blue"],
-            hover_color=INOSYS_COLORS["medium_blue"]
-        )
-        save_button.pack(side="left", padx=10)
+        cancel_event: threading.Event = job['cancel_event']
+        try:
+            # Rendered exactly as Save Report would, so saving right after previewing is a render cache hit
+            buffer = io.BytesIO()
+            self.create_pdf_report(buffer, doctor_name, patient_name, case_number, case_notes, plans=plans,
+                                   cancel_event=cancel_event, compact=compact)
+            pdf_bytes = buffer.getvalue()
 
-        # Print button (opens print dialog)
-        print_button = ctk.CTkButton(
-            button_frame,
-            text="Print",
-            command=lambda: self.print_preview(temp_filename, preview_dialog),
-            width=100,
-            fg_color=INOSYS_COLORS["medium_blue"],
-            hover_color=INOSYS_COLORS["light_blue"]
-        )
-        print_button.pack(side="left", padx=10)
+            images: List[Any] = []
+            if pdf_preview.is_available():
+                images = pdf_preview.render_pages(pdf_bytes, PREVIEW_PAGE_WIDTH, cancel_event=cancel_event)
 
-        # Close button
-        close_button = ctk.CTkButton(
-            button_frame,
-            text="Close",
-            command=lambda: self.close_preview(temp_filename, preview_dialog),
-            width=100,
-            fg_color=INOSYS_COLORS["dark_blue"],
-            hover_color=INOSYS_COLORS["medium_blue"]
-        )
-        close_button.pack(side="left", padx=10)
+        except report_engine.ReportCancelled:
+            return
+
+        except Exception as e:
+            error_message = str(e)
+            self.after(0, self.finish_preview_render, job, None, [], error_message)
+            return
+
+        if not cancel_event.is_set():
+            self.after(0, self.finish_preview_render, job, pdf_bytes, images, None)
+
+    def finish_preview_render(self, job: Dict[str, Any], pdf_bytes: Optional[bytes], images: List[Any],
+                              error_message: Optional[str]) -> None:
+        """Show a finished preview render unless a newer edit superseded it"""
+        if job is not self.preview_job:
+            return
+        self.preview_job = None
+
+        if error_message:
+            self.preview_status_label.configure(text=f"Preview failed: {error_message}")
+            return
+
+        self.preview_pdf_bytes = pdf_bytes
+        self.show_preview_pages(images)
+
+        if images:
+            page_text = "page" if len(images) == 1 else "pages"
+            status = f"Preview updated at {datetime.now().strftime('%I:%M:%S %p')} ({len(images)} {page_text})"
+        else:
+            status = "Preview ready. Install pypdfium2 to show it here, or open it in your PDF viewer."
+        self.preview_status_label.configure(text=status)
+
+    def show_preview_pages(self, images: List[Any]) -> None:
+        """Show rendered pages in the preview pane, reusing the page labels"""
+        self.preview_images = [
+            ctk.CTkImage(light_image=image, dark_image=image, size=image.size) for image in images
+        ]
+
+        while len(self.preview_page_labels) < len(self.preview_images):
+            label = ctk.CTkLabel(self.preview_pages_frame, text="")
+            self.preview_page_labels.append(label)
+
+        for index, label in enumerate(self.preview_page_labels):
+            if index < len(self.preview_images):
+                label.configure(image=self.preview_images[index])
+                label.pack(pady=(0, 10))
+            else:
+                label.pack_forget()
+
+    def write_preview_temp_file(self) -> Optional[str]:
+        """Write the current preview to a temp file that is removed when the app closes"""
+        if self.preview_pdf_bytes is None or self.preview_dirty or self.preview_job is not None:
+            return None
+
+        fd, temp_filename = tempfile.mkstemp(prefix="primus_preview_", suffix=".pdf")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self.preview_pdf_bytes)
+        self.preview_temp_files.append(temp_filename)
+        return temp_filename
+
+    def open_preview_in_viewer(self) -> None:
+        """Open the current preview in the default PDF viewer"""
+        if not self.implant_plans:
+            messagebox.showerror("Error", "No implant plans to preview!")
+            return
 
-    def save_preview_as(self, temp_filename: str, dialog: ctk.CTkToplevel) -> None:
-        """Save preview as permanent file"""
         try:
-            case_number = self.case_number_entry.get() or "Case"
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".pdf",
-                filetypes=[("PDF files", "*.pdf")],
-                title="Save Report As",
-                initialfile=f"Primus_Report_{case_number}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            )
+            temp_filename = self.write_preview_temp_file()
+            if temp_filename:
+                self.open_preview_file(temp_filename)
+                return
+
+            # Preview is out of date, render a fresh copy on the worker first
+            fd, temp_filename = tempfile.mkstemp(prefix="primus_preview_", suffix=".pdf")
+            os.close(fd)
+            self.preview_temp_files.append(temp_filename)
+
+            self.start_report_job(temp_filename, self.doctor_name_entry.get() or "Dr. [Name]",
+                                  self.patient_name_entry.get() or "[Patient Name]",
+                                  self.case_number_entry.get() or "[Case Number]", self.get_case_notes(),
+                                  lambda path, size: self.open_preview_file(path), is_preview=True)
+
+        except Exception as e:
+            messagebox.showerror("Preview Error", f"Failed to generate preview: {str(e)}")
 
-            if filename:
-                shutil.copy2(temp_filename, filename)
-                messagebox.showinfo("Success", f"Report saved successfully!\nSaved as: {filename}")
-                dialog.destroy()
+    def open_preview_file(self, temp_filename: str) -> None:
+        """Open a generated preview in the default PDF viewer"""
+        try:
+            if sys.platform.startswith('win'):
+                os.startfile(temp_filename)
+            elif sys.platform.startswith('darwin'):  # macOS
+                subprocess.run(['open', temp_filename])
+            else:  # Linux
+                subprocess.run(['xdg-open', temp_filename])
 
         except Exception as e:
-            messagebox.showerror("Save Error", f"Failed to save report: {str(e)}")
+            messagebox.showerror("Preview Error", f"Failed to open preview: {str(e)}")
+
+    def print_preview(self) -> None:
+        """Send the current preview to the printer"""
+        if not self.implant_plans:
+            messagebox.showerror("Error", "No implant plans to print!")
+            return
 
-    def print_preview(self, temp_filename: str, dialog: ctk.CTkToplevel) -> None:
-        """Send preview to printer"""
         try:
+            temp_filename = self.write_preview_temp_file()
+            if not temp_filename:
+                messagebox.showinfo("Print", "The preview is still updating. Please try again in a moment.")
+                return
+
             if sys.platform.startswith('win'):
                 # Use Windows print command
                 subprocess.run(
                     f'rundll32 advapi32.dll,ProcessIdleTasks & ping 127.0.0.1 -n 2 > nul & "{temp_filename}"',
                     shell=True)
             else:
+                self.open_preview_file(temp_filename)
                 messagebox.showinfo("Print", "Please use your PDF viewer's print function to print the document.")
 
-            dialog.destroy()
-
         except Exception as e:
             messagebox.showerror("Print Error", f"Failed to print: {str(e)}")
 
-    def close_preview(self, temp_filename: str, dialog: ctk.CTkToplevel) -> None:
-        """Close preview and cleanup"""
-        try:
-            # Clean up temporary file
-            if os.path.exists(temp_filename):
-                os.remove(temp_filename)
-        except:
-            pass  # Ignore cleanup errors
-
-        dialog.destroy()
+    def cleanup_preview_files(self) -> None:
+        """Delete the temp files handed to external viewers"""
+        for temp_filename in self.preview_temp_files:
+            try:
+                if os.path.exists(temp_filename):
+                    os.remove(temp_filename)
+            except OSError:
+                pass  # Still open in a viewer; the OS temp cleanup will get it
+        self.preview_temp_files.clear()
 
     def on_teeth_selected(self, selected_teeth: List[int]) -> None:
         if selected_teeth:
@@ -2131,6 +2223,11 @@ del "%~f0"
             self.selected_teeth_label.configure(text="Selected Teeth: None")
 
     def add_implants_to_plan(self) -> None:
+        # The button is disabled until the catalog has loaded, but Enter still reaches this
+        if not self.catalog_loaded:
+            messagebox.showinfo("Please Wait", "The implant catalog is still loading.")
+            return
+
         # Validate inputs
         if not self.tooth_diagram.selected_teeth:
             messagebox.showerror("Error", "Please select at least one tooth first!")
@@ -2146,32 +2243,17 @@ del "%~f0"
         length: float = float(self.implant_length_var.get())
         offset: float = float(self.offset_var.get())
 
-        matching_implant: pd.DataFrame = self.implant_data[
-            (self.implant_data['Implant Diameter'] == diameter) &
-            (self.implant_data['Implant Length'] == length) &
-            (self.implant_data['Offset'] == offset)
-            ]
+        record = self.implant_index.lookup(self.implant_line_var.get(), diameter, length, offset)
 
-        if matching_implant.empty:
+        if record is None:
             messagebox.showerror("Error", "No matching implant found in database for the selected specifications!")
             return
 
-        # Check if the implant/drill length combination is valid
-        implant_row = matching_implant.iloc[0]
-        drill_fields = ['Starter Drill', 'Initial Drill 1', 'Initial Drill 2', 'Drill 1', 'Drill 2', 'Drill 3',
-                        'Drill 4']
-
-        # Check if any drill field contains 'x' (indicating invalid combination)
-        invalid_drills = []
-        for field in drill_fields:
-            if str(implant_row[field]).lower().strip() == 'x':
-                invalid_drills.append(field)
-
-        if invalid_drills:
-            invalid_fields_text = ", ".join(invalid_drills)
+        if record.invalid_drills:
+            invalid_fields_text = ", ".join(record.invalid_drills)
             messagebox.showerror(
                 "Invalid Implant/Drill Length Combination",
-                f"The selected implant length ({length}mm) and drill length ({implant_row['Drill Length']}mm) "
+                f"The selected implant length ({length}mm) and drill length ({record.drill_length}mm) "
                 f"combination is not compatible.\n\n"
                 f"Invalid drill stages: {invalid_fields_text}\n\n"
                 f"Please select a different implant length or offset to find a valid drilling protocol."
@@ -2182,34 +2264,24 @@ del "%~f0"
         added_teeth: List[int] = []
         replaced_teeth: List[int] = []
 
-        # Create implant plans for each selected tooth
-        for tooth_number in self.tooth_diagram.selected_teeth:
-            implant_plan: Dict[str, Any] = {
-                'tooth_number': tooth_number,
-                'implant_line': self.implant_line_var.get(),
-                'diameter': diameter,
-                'length': length,
-                'offset': offset,
-                'surgical_approach': self.surgical_approach_var.get(),
-                'implant_data': implant_row.to_dict()
-            }
-
-            # Check if tooth already has an implant planned
-            existing_plan: Optional[Dict[str, Any]] = next(
-                (plan for plan in self.implant_plans if plan['tooth_number'] == tooth_number),
-                None
-            )
-
-            if existing_plan:
-                self.implant_plans.remove(existing_plan)
-                replaced_teeth.append(tooth_number)
-            else:
-                added_teeth.append(tooth_number)
-
-            self.implant_plans.append(implant_plan)
+        # Create implant plans for each selected tooth; the plan display refreshes once at the end
+        with self.implant_plans.batch_updates():
+            for tooth_number in self.tooth_diagram.selected_teeth:
+                implant_plan = ImplantPlan(
+                    tooth_number=tooth_number,
+                    implant_line=self.implant_line_var.get(),
+                    diameter=diameter,
+                    length=length,
+                    offset=offset,
+                    surgical_approach=self.surgical_approach_var.get(),
+                    record=record
+                )
 
-        # Update display and show success message
-        self.update_plan_display()
+                # Replaces any implant already planned for this tooth
+                if self.implant_plans.set(implant_plan):
+                    replaced_teeth.append(tooth_number)
+                else:
+                    added_teeth.append(tooth_number)
 
         # Create success message
         message_parts: List[str] = []
@@ -2226,56 +2298,44 @@ del "%~f0"
         self.offset_var.set("")
         self.surgical_approach_var.set("flapless")
         self.tooth_diagram.clear_selection()
+        self.update_implant_options()
+
+    def update_implant_options(self, *_args: Any) -> None:
+        """Narrow the Add Implant option lists to the valid catalog configurations for the current choices"""
+        index = self.implant_index
+
+        implant_lines = index.implant_lines()
+        if implant_lines:
+            self.implant_line_combo.configure(values=implant_lines)
+            if self.implant_line_var.get() not in implant_lines:
+                self.implant_line_var.set(implant_lines[0])
+        implant_line = self.implant_line_var.get()
+
+        diameter = self.set_combo_options(self.implant_diameter_combo, self.implant_diameter_var,
+                                          index.diameters(implant_line))
+        length = self.set_combo_options(self.implant_length_combo, self.implant_length_var,
+                                        index.lengths(implant_line, diameter) if diameter else [])
+        self.set_combo_options(self.offset_combo, self.offset_var,
+                               index.offsets(implant_line, diameter, length) if length else [])
+
+    @staticmethod
+    def set_combo_options(combo: ctk.CTkComboBox, variable: ctk.StringVar, values: List[str]) -> str:
+        """Set a combobox's options, clearing a selection that is no longer valid, and return the selection"""
+        if variable.get() not in values:
+            variable.set(values[0] if len(values) == 1 else "")
+        combo.configure(values=values, state="readonly" if values else "disabled")
+        return variable.get()
 
     def update_plan_display(self) -> None:
-        # Clear existing plan display
-        for widget in self.plan_scrollable_frame.winfo_children():
-            widget.destroy()
-
-        # Add each implant plan to display
-        for i, plan in enumerate(self.implant_plans):
-            plan_frame: ctk.CTkFrame = ctk.CTkFrame(
-                self.plan_scrollable_frame,
-                fg_color=INOSYS_COLORS["background_secondary"],
-                border_width=1,
-                border_color=INOSYS_COLORS["medium_blue"]
-            )
-            plan_frame.pack(fill="x", padx=10, pady=5)
-
-            # Plan details
-            details_text: str = (
-                f"Tooth {plan['tooth_number']}: {plan['implant_line']} - "
-                f"{plan['diameter']}mm × {plan['length']}mm (Offset: {plan['offset']}mm)"
-            )
-            details_label: ctk.CTkLabel = ctk.CTkLabel(
-                plan_frame,
-                text=details_text,
-                font=ctk.CTkFont(size=12, weight="bold"),
-                text_color=INOSYS_COLORS["text_primary"]
-            )
-            details_label.pack(side="left", padx=10, pady=10)
-
-            # Remove button
-            remove_button: ctk.CTkButton = ctk.CTkButton(
-                plan_frame,
-                text="Remove",
-                width=80,
-                command=lambda idx=i: self.remove_implant_plan(idx),
-                fg_color=INOSYS_COLORS["dark_blue"],
-                hover_color=INOSYS_COLORS["light_blue"],
-                text_color=INOSYS_COLORS["white"]
-            )
-            remove_button.pack(side="right", padx=10, pady=10)
+        self.plan_scrollable_frame.update_plans(self.implant_plans)
 
-    def remove_implant_plan(self, index: int) -> None:
-        if 0 <= index < len(self.implant_plans):
-            self.implant_plans.pop(index)
-            self.update_plan_display()
+    def remove_tooth_plan(self, tooth_number: int) -> None:
+        """Remove the implant plan for a tooth"""
+        self.implant_plans.remove(tooth_number)
 
     def clear_all_plans(self) -> None:
         if messagebox.askyesno("Clear All Plans", "Are you sure you want to clear all implant plans?"):
             self.implant_plans.clear()
-            self.update_plan_display()
 
     def generate_pdf_report(self) -> None:
         """Enhanced PDF report generation with case notes"""
@@ -2300,393 +2360,186 @@ del "%~f0"
         if not filename:
             return
 
-        try:
-            self.create_pdf_report(filename, doctor_name, patient_name, case_number, case_notes)
-            messagebox.showinfo("Success", f"Report generated successfully!\nSaved as: {filename}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to generate report: {str(e)}")
-
-    def create_pdf_report(self, filename: str, doctor_name: str, patient_name: str, case_number: str,
-                          case_notes: str = "", is_preview: bool = False) -> None:
-        """Enhanced PDF report creation with compressed layout"""
-        doc: SimpleDocTemplate = SimpleDocTemplate(
-            filename,
-            pagesize=letter,
-            topMargin=0.4 * inch,  # Reduced from 0.5
-            bottomMargin=0.4 * inch,  # Reduced from 0.5
-            leftMargin=0.5 * inch,
-            rightMargin=0.5 * inch,
-            title="Primus Implant Report" + (" - Preview" if is_preview else "")
-        )
-        styles = getSampleStyleSheet()
-        story: List[Any] = []
-
-        # Custom styles - more compressed
-        title_style: ParagraphStyle = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,  # Reduced from 18
-            textColor=colors.Color(30 / 255, 58 / 255, 138 / 255),
-            alignment=TA_CENTER,
-            spaceAfter=12  # Reduced from 20
-        )
-
-        header_style: ParagraphStyle = ParagraphStyle(
-            'CustomHeader',
-            parent=styles['Heading2'],
-            fontSize=11,  # Reduced from 12
-            textColor=colors.Color(30 / 255, 58 / 255, 138 / 255),
-            spaceBefore=8,  # Reduced from 10
-            spaceAfter=6  # Reduced from 8
-        )
-
-        # Header section with logo and title - more compressed
-        header_data = []
-        logo_added: bool = self.add_logo_to_report_header(header_data)
-
-        if header_data:
-            # Create header table with smaller dimensions
-            header_table = Table(header_data, colWidths=[2.5 * inch, 4.5 * inch])  # Reduced logo space
-            header_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-                ('ALIGN', (1, 0), (1, 0), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 0),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-                ('TOPPADDING', (0, 0), (-1, -1), 0),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
-            ]))
-            story.append(header_table)
-        else:
-            # No logo, just title
-            story.append(Paragraph("PRIMUS IMPLANT SURGICAL DRILLING PROTOCOL", title_style))
-
-        story.append(Spacer(1, 10))  # Reduced from 15
-
-        # Case information in more compact format
-        case_info: List[List[str]] = [
-            ["Doctor:", doctor_name, "Date:", datetime.now().strftime("%B %d, %Y")],
-            ["Patient:", patient_name, "Time:", datetime.now().strftime("%I:%M %p")],
-            ["Case Number:", case_number, "Total Implants:", str(len(self.implant_plans))]
-        ]
-
-        case_table: Table = Table(case_info,
-                                  colWidths=[0.9 * inch, 2.1 * inch, 1.1 * inch, 1.4 * inch])  # Slightly smaller
-        case_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),  # Reduced from 10
-            ('TOPPADDING', (0, 0), (-1, -1), 3),  # Reduced from 4
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 3),  # Reduced from 4
-            ('LEFTPADDING', (0, 0), (-1, -1), 4),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-            ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey),
-            ('BACKGROUND', (0, 0), (0, -1), colors.Color(0 / 255, 181 / 255, 216 / 255)),
-            ('BACKGROUND', (2, 0), (2, -1), colors.Color(0 / 255, 181 / 255, 216 / 255)),
-        ]))
-
-        story.append(case_table)
-        story.append(Spacer(1, 10))  # Reduced from 15
-
-        # Horizontal line separator
-        from reportlab.platypus import HRFlowable
-        story.append(
-            HRFlowable(width="100%", thickness=1.5, color=colors.Color(30 / 255, 58 / 255, 138 / 255)))  # Thinner
-        story.append(Spacer(1, 8))  # Reduced from 10
-
-        # Sort implant plans by tooth number
-        sorted_plans: List[Dict[str, Any]] = sorted(self.implant_plans, key=lambda x: x['tooth_number'])
-
-        # Create comprehensive implant summary table
-        story.append(Paragraph("IMPLANT SPECIFICATIONS & DRILLING PROTOCOL", header_style))
-
-        # Main implant data table - keep existing column sizing
-        implant_data = [
-            ["Tooth", "Part Number", "Dia.", "Len.", "Offset", "Guide Sleeve", "Drill Length", "Drilling Sequence"]]
-
-        for i, plan in enumerate(sorted_plans):
-            def is_valid_drill(value):
-                """Check if drill value is valid (not 'x', empty, or NaN)"""
-                if pd.isna(value):
-                    return False
-                value_str = str(value).lower().strip()
-                return value_str not in ['x', '', 'nan', 'none']
-
-            def format_drill_value(value):
-                """Format drill value only if it's valid"""
-                if not is_valid_drill(value):
-                    return None
-                return f"{value}mm"
-
-            is_flapless = plan.get('surgical_approach', 'flapless') == 'flapless'
-            approach_instruction = "Tissue punch → Drill to bone → clear tissue" if is_flapless else "Open flap and reflect tissue prior to seating surgical guide"
-
-            # Build drill sequence dynamically, only including valid drills
-            drill_steps = []
-
-            # Check each drill in sequence and only add if valid
-            drill_mapping = [
-                ('Start', plan['implant_data']['Starter Drill']),
-                ('Init1', plan['implant_data']['Initial Drill 1']),
-                ('Init2', plan['implant_data']['Initial Drill 2']),
-                ('D1', plan['implant_data']['Drill 1']),
-                ('D2', plan['implant_data']['Drill 2']),
-                ('D3', plan['implant_data']['Drill 3']),
-                ('D4', plan['implant_data']['Drill 4'])
-            ]
-
-            for drill_name, drill_value in drill_mapping:
-                formatted_value = format_drill_value(drill_value)
-                if formatted_value:  # Only add if drill is valid
-                    drill_steps.append(f"{drill_name}: {formatted_value}")
-
-            # Join the valid drill steps
-            drill_sequence_text = " → ".join(drill_steps) if drill_steps else "No valid drill sequence available"
-
-            drill_sequence = f"<b>{approach_instruction}</b><br/>{drill_sequence_text}"
-
-            implant_data.append([
-                str(plan['tooth_number']),
-                plan['implant_data']['Implant Part No'],
-                f"{plan['diameter']}mm",
-                f"{plan['length']}mm",
-                f"{plan['offset']}mm",
-                plan['implant_data']['Guide Sleeve'],
-                f"{plan['implant_data']['Drill Length']}mm",
-                Paragraph(drill_sequence, ParagraphStyle('DrillSeq',
-                                                         parent=styles['Normal'],
-                                                         fontSize=7,
-                                                         fontName='Helvetica',
-                                                         leading=8))
-            ])
-
-        # Keep existing column widths
-        col_widths = [
-            0.35 * inch, 0.7 * inch, 0.35 * inch, 0.45 * inch,
-            0.4 * inch, 0.8 * inch, 0.65 * inch, 2.9 * inch
-        ]
+        self.start_report_job(filename, doctor_name, patient_name, case_number, case_notes,
+                              lambda path, size: messagebox.showinfo(
+                                  "Success", f"Report generated successfully!\nSaved as: {path}\n"
+                                             f"File size: {self.format_file_size(size)}"),
+                              compact=self.compact_pdf_var.get())
+
+    def start_report_job(self, filename: str, doctor_name: str, patient_name: str, case_number: str,
+                         case_notes: str, on_success: Callable[[str, int], None], is_preview: bool = False,
+                         compact: bool = False) -> bool:
+        """Build a report on a background thread, returning False if another build is still running.
+
+        on_success is called on the UI thread with the written filename and its size in bytes.
+        """
+        job_key = (filename if not is_preview else None, doctor_name, patient_name, case_number, case_notes,
+                   is_preview, compact, self.implant_plans.version)
+
+        if self.report_job is not None:
+            if self.report_job['key'] == job_key:
+                messagebox.showinfo("Report In Progress", "This report is already being generated.")
+            else:
+                messagebox.showinfo("Report In Progress",
+                                    "Another report is still being generated.\n\n"
+                                    "Please wait for it to finish or cancel it first.")
+            return False
 
-        implant_table: Table = Table(implant_data, colWidths=col_widths, repeatRows=1)
-        implant_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, 0), 8),
-            ('FONTSIZE', (0, 1), (6, -1), 7),
-            ('TOPPADDING', (0, 0), (-1, -1), 2),  # Reduced from 3
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),  # Reduced from 3
-            ('LEFTPADDING', (0, 0), (-1, -1), 2),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 2),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.Color(30 / 255, 58 / 255, 138 / 255)),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('WORDWRAP', (1, 1), (1, -1), True),
-            ('WORDWRAP', (5, 1), (5, -1), True),
-            ('WORDWRAP', (7, 1), (7, -1), True),
-            ('OVERFLOW', (0, 0), (-1, -1), 'CLIP'),
-        ]))
-
-        story.append(implant_table)
-        story.append(Spacer(1, 10))  # Reduced from 15
-
-        # Add case notes if they exist - with proper line break handling
-        if case_notes:
-            story.append(Spacer(1, 10))
-
-            story.append(Paragraph("CASE NOTES", header_style))
-
-            # Create case notes style that handles HTML line breaks
-            case_notes_style = ParagraphStyle(
-                'CaseNotes',
-                parent=styles['Normal'],
-                fontSize=10,
-                leading=12,
-                leftIndent=10,
-                rightIndent=10,
-                spaceBefore=6,  # Reduced from 8
-                spaceAfter=6,  # Reduced from 8
-                borderWidth=1,
-                borderColor=colors.Color(14 / 255, 165 / 255, 233 / 255),
-                borderPadding=8,  # Reduced from 10
-                backColor=colors.Color(248 / 255, 249 / 255, 250 / 255)
-            )
+        job: Dict[str, Any] = {
+            'key': job_key,
+            'cancel_event': threading.Event(),
+            'is_preview': is_preview,
+            'compact': compact
+        }
+        self.report_job = job
+        self.show_report_progress("Generating preview..." if is_preview else "Generating report...")
 
-            story.append(Paragraph(case_notes, case_notes_style))
-            story.append(Spacer(1, 10))
-
-        # Horizontal line separator
-        story.append(HRFlowable(width="100%", thickness=1, color=colors.Color(14 / 255, 165 / 255, 233 / 255)))
-        story.append(Spacer(1, 8))  # Reduced from 10
-
-        # Compact surgical protocol in two columns
-        story.append(Paragraph("SURGICAL PROTOCOL", header_style))
-
-        protocol_data = [
-            ["PRE-SURGICAL PREPARATION", "DRILLING PROTOCOL"],
-            [
-                "• Verify patient identity and surgical site\n"
-                "• Confirm implant specifications\n"
-                "• Prepare sterile surgical field\n"
-                "• Check all instruments and drill bits\n"
-                "• Ensure proper guide sleeve placement",
-
-                "• Begin with the point drill in D4 bone\n"
-                "• Use intermittent drilling (15-30 sec intervals)\n"
-                "• Speeds: 300-800 RPM tissue punch, cortical perforator, shaping drills\n"
-                "• Apply light pressure - let drill do the work\n"
-                "• Use copious irrigation (minimum 50ml/min)"
-            ],
-            ["POST-DRILLING VERIFICATION", "IMPORTANT NOTES"],
-            [
-                "• Irrigate osteotomy thoroughly\n"
-                "• Check final depth and angulation\n"
-                "• Verify diameter with sizing gauge\n"
-                "• Proceed with implant placement protocol\n"
-                "• Implant placement speed & torque: 20 RPM 35 Ncm ",
-
-                "• Follow manufacturer drilling guidelines\n"
-                "• Maintain sterile technique throughout\n"
-                "• Account for offset measurements\n"
-                "• Document any deviations from protocol"
-            ]
-        ]
+        # Snapshot the plans so edits made while the worker runs do not affect this report
+        plans = list(self.implant_plans)
 
-        protocol_table = Table(protocol_data, colWidths=[3.75 * inch, 3.75 * inch])
-        protocol_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 2), (-1, 2), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),  # Reduced from 9
-            ('TOPPADDING', (0, 0), (-1, -1), 6),  # Reduced from 8
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),  # Reduced from 8
-            ('LEFTPADDING', (0, 0), (-1, -1), 6),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-            ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.Color(14 / 255, 165 / 255, 233 / 255)),
-            ('BACKGROUND', (0, 2), (-1, 2), colors.Color(14 / 255, 165 / 255, 233 / 255)),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('TEXTCOLOR', (0, 2), (-1, 2), colors.white),
-        ]))
-
-        story.append(protocol_table)
-        story.append(Spacer(1, 10))  # Reduced from 15
-
-        # Final horizontal line
-        story.append(HRFlowable(width="100%", thickness=1.5, color=colors.Color(30 / 255, 58 / 255, 138 / 255)))
-        story.append(Spacer(1, 8))  # Reduced from 10
-
-        # Disclaimer section - smaller font, no heading
-        disclaimer_style: ParagraphStyle = ParagraphStyle(
-            'Disclaimer',
-            parent=styles['Normal'],
-            fontSize=6,  # Reduced from 8 to 6
-            textColor=colors.Color(60 / 255, 60 / 255, 60 / 255),
-            spaceBefore=6,  # Reduced from 10
-            spaceAfter=3,  # Reduced from 5
-            alignment=TA_LEFT,
-            leading=7  # Reduced from 10
+        thread = threading.Thread(
+            target=self._report_worker,
+            args=(job, filename, plans, doctor_name, patient_name, case_number, case_notes, on_success),
+            name="ReportWorker",
+            daemon=True
         )
+        thread.start()
+        return True
 
-        # REMOVED: The disclaimer title paragraph is no longer added
-        # story.append(Paragraph("<b>LIMITATION OF LIABILITY:</b>",
-        #                        ParagraphStyle('DisclaimerTitle', parent=disclaimer_style, fontSize=7,  # Reduced from 9
-        #                                       textColor=colors.Color(30 / 255, 58 / 255, 138 / 255))))
-
-        disclaimer_text = """This instruction incorporates a custom document that is based on a surgical plan proposed by the surgeon before operation. The surgeon, therefore, takes full medical responsibility for the design and the application of the surgical guide, the intended used surgical tray kit, implants and sleeves – all as specified on the order form received by the supplier. The custom document shall be considered as an addition to all other documents sent with and pertaining to the case, and it does not replace any of those other documents."""
-
-        story.append(Paragraph(disclaimer_text, disclaimer_style))
+    def _report_worker(self, job: Dict[str, Any], filename: str, plans: List[ImplantPlan], doctor_name: str,
+                       patient_name: str, case_number: str, case_notes: str,
+                       on_success: Callable[[str, int], None]) -> None:
+        """Render a report in memory and write it out (runs on the worker thread)"""
+        import report_engine
 
-        # Footer removed entirely as requested
+        def on_progress(done: int, total: int) -> None:
+            # Layout is most of the work; the last tenth is left for writing the file
+            self.after(0, self.update_report_progress, job, 0.9 * done / max(total, 1))
 
-        # Build PDF
-        doc.build(story)
+        try:
+            buffer = io.BytesIO()
+            size = self.create_pdf_report(buffer, doctor_name, patient_name, case_number, case_notes,
+                                          is_preview=job['is_preview'], plans=plans, progress_callback=on_progress,
+                                          cancel_event=job['cancel_event'], compact=job['compact'])
 
-    def add_logo_to_report_header(self, header_data: List[List[Any]]) -> bool:
-        """Add logo to header data for table layout - more compact version"""
-        logo_files: List[str] = [
-            "inosys_logo.png", "inosys_logo.jpg", "inosys_logo.jpeg",
-            "logo.png", "logo.jpg", "logo.jpeg",
-            "icon.png", "icon.jpg", "icon.jpeg"
-        ]
+            if job['cancel_event'].is_set():
+                raise report_engine.ReportCancelled()
 
-        for logo_file in logo_files:
-            if os.path.exists(logo_file):
-                try:
-                    with PILImage.open(logo_file) as pil_image:
-                        original_width, original_height = pil_image.size
-                        aspect_ratio = original_width / original_height
+            # Only touch the destination once the whole PDF is built, so a cancel or
+            # failure never leaves a truncated file behind
+            self.after(0, self.update_report_progress, job, 0.9, "Saving file...")
+            with open(filename, 'wb') as f:
+                f.write(buffer.getvalue())
 
-                        # Smaller logo for more compact layout
-                        desired_height = 0.5 * inch  # Reduced from 0.6
-                        calculated_width = desired_height * aspect_ratio
+            self.after(0, self.finish_report_job, job, lambda: on_success(filename, size))
 
-                        logo_image = Image(logo_file, width=calculated_width, height=desired_height)
+        except report_engine.ReportCancelled:
+            self.after(0, self.finish_report_job, job, None)
 
-                        # More compact title paragraph
-                        title_para = Paragraph("PRIMUS IMPLANT<br/>SURGICAL DRILLING PROTOCOL",
-                                               ParagraphStyle('HeaderTitle',
-                                                              fontSize=14,  # Reduced from 16
-                                                              textColor=colors.Color(30 / 255, 58 / 255, 138 / 255),
-                                                              alignment=TA_CENTER,
-                                                              fontName='Helvetica-Bold',
-                                                              leading=16))  # Reduced from 20
+        except Exception as e:
+            error_message = str(e)
+            title = "Preview Error" if job['is_preview'] else "Error"
+            action = "generate preview" if job['is_preview'] else "generate report"
+            self.after(0, self.finish_report_job, job,
+                       lambda: messagebox.showerror(title, f"Failed to {action}: {error_message}"))
+
+    def show_report_progress(self, message: str) -> None:
+        """Show the progress bar and lock the report buttons while a report is built"""
+        self.preview_button.configure(state="disabled")
+        self.generate_button.configure(state="disabled")
+        self.report_cancel_button.configure(state="normal")
+        self.report_status_label.configure(text=message)
+        self.report_progress_bar.set(0)
+        self.report_progress_frame.pack(pady=(0, 20), after=self.compact_pdf_checkbox)
+
+    def update_report_progress(self, job: Dict[str, Any], fraction: float, message: Optional[str] = None) -> None:
+        """Update the progress bar for the running report"""
+        if job is not self.report_job:
+            return
+        self.report_progress_bar.set(fraction)
+        if message:
+            self.report_status_label.configure(text=message)
+
+    def cancel_report_job(self) -> None:
+        """Ask the running report build to stop at its next flowable"""
+        if self.report_job is not None:
+            self.report_job['cancel_event'].set()
+            self.report_cancel_button.configure(state="disabled")
+            self.report_status_label.configure(text="Cancelling...")
+
+    def finish_report_job(self, job: Dict[str, Any], on_done: Optional[Callable[[], None]]) -> None:
+        """Hide the progress UI, unlock the buttons and report the outcome"""
+        if job is self.report_job:
+            self.report_job = None
+            self.report_progress_frame.pack_forget()
+            self.preview_button.configure(state="normal")
+            self.generate_button.configure(state="normal")
+
+        if on_done is not None:
+            on_done()
+
+    def create_pdf_report(self, filename: Any, doctor_name: str, patient_name: str, case_number: str,
+                          case_notes: str = "", is_preview: bool = False, plans: Optional[List[ImplantPlan]] = None,
+                          progress_callback: Optional[Callable[[int, int], None]] = None,
+                          cancel_event: Optional[threading.Event] = None, compact: bool = False) -> int:
+        """Enhanced PDF report creation with compressed layout, returning the PDF size in bytes.
+
+        Requests with identical content on the same day are served from the render cache, so a
+        saved report prints the time its content was first rendered (e.g. when it was previewed).
+        """
+        plans = self.implant_plans if plans is None else plans
+
+        with self.profiler.span("report.build", implants=len(plans), preview=is_preview,
+                                notes_chars=len(case_notes), compact=compact) as span:
+            import report_engine
+
+            # Keyed on the full content; only the printed date is part of the key, never the time
+            generated_at = datetime.now()
+            cache_key = render_cache.make_render_key(
+                plans, doctor_name, patient_name, case_number, case_notes,
+                generated_on=generated_at.date().isoformat(),
+                is_preview=is_preview,
+                compact=compact,
+                logo=render_cache.file_signature(report_engine.find_logo_file()),
+                catalog_version=self.implant_index.version,
+                template_version=report_engine.ReportTemplate.VERSION
+            )
 
-                        header_data.append([logo_image, title_para])
-                        print(f"Logo added to PDF header from {logo_file}")
-                        return True
+            pdf_bytes = self.render_cache.get(cache_key)
+            span['cache'] = "hit" if pdf_bytes is not None else "miss"
+
+            if pdf_bytes is None:
+                buffer = io.BytesIO()
+                report_engine.create_pdf_report(buffer, plans, doctor_name, patient_name, case_number,
+                                                case_notes, is_preview=is_preview,
+                                                progress_callback=progress_callback,
+                                                cancel_event=cancel_event, compact=compact,
+                                                generated_at=generated_at)
+                pdf_bytes = buffer.getvalue()
+                self.render_cache.put(cache_key, pdf_bytes)
+            elif progress_callback is not None:
+                progress_callback(1, 1)
+
+            if isinstance(filename, str):
+                with open(filename, 'wb') as f:
+                    f.write(pdf_bytes)
+            else:
+                filename.write(pdf_bytes)
 
-                except Exception as e:
-                    print(f"Error adding logo to PDF header from {logo_file}: {str(e)}")
-                    continue
+            span['bytes'] = len(pdf_bytes)
+            return len(pdf_bytes)
 
-        return False
-
-    def add_logo_to_report(self, story: List[Any]) -> bool:
-        """Add the Inosys logo to the PDF report"""
-        logo_files: List[str] = [
-            "inosys_logo.png",
-            "inosys_logo.jpg",
-            "inosys_logo.jpeg",
-            "logo.png",
-            "logo.jpg",
-            "logo.jpeg",
-            "icon.png",
-            "icon.jpg",
-            "icon.jpeg"
-        ]
+    def format_file_size(self, size: int) -> str:
+        """Format a byte count for display"""
+        import report_engine
 
-        for logo_file in logo_files:
-            if os.path.exists(logo_file):
-                try:
-                    # Get original image dimensions to maintain aspect ratio
-                    with PILImage.open(logo_file) as pil_image:
-                        original_width, original_height = pil_image.size
-                        aspect_ratio = original_width / original_height
-
-                        # Set desired height and calculate width to maintain aspect ratio
-                        desired_height = 0.8 * inch
-                        calculated_width = desired_height * aspect_ratio
-
-                        # Create logo image for PDF with proper aspect ratio
-                        logo_image = Image(logo_file, width=calculated_width, height=desired_height)
-                        logo_image.hAlign = 'LEFT'
-                        story.append(logo_image)
-
-                        print(f"Logo added to PDF report from {logo_file}")
-                        print(f"Original dimensions: {original_width}x{original_height}")
-                        print(f"PDF dimensions: {calculated_width / inch:.2f}\" x {desired_height / inch:.2f}\"")
-                        print(f"Aspect ratio maintained: {aspect_ratio:.2f}")
-                        return True
+        return report_engine.format_file_size(size)
 
-                except Exception as e:
-                    print(f"Error adding logo to PDF from {logo_file}: {str(e)}")
-                    continue
+    def add_logo_to_report_header(self, header_data: List[List[Any]]) -> bool:
+        """Add logo to header data for table layout - more compact version"""
+        import report_engine
 
-        print("Logo file not found for PDF report")
-        return False
+        return report_engine.add_logo_to_report_header(header_data)
 
     def save_window_geometry(self) -> None:
         """Save window size and position with extensive logging"""
@@ -2959,6 +2812,15 @@ del "%~f0"
     def on_window_close(self) -> None:
         """Handle window close event with logging"""
         self.log_window_activity("=== WINDOW CLOSING ===")
+
+        # Stop any report still being built on the worker
+        if self.report_job is not None:
+            self.report_job['cancel_event'].set()
+        self.cancel_preview_render()
+        self.cleanup_preview_files()
+        if self.catalog_watcher is not None:
+            self.catalog_watcher.stop()
+        self.update_cancel_event.set()
         try:
             self.save_window_geometry()
             self.log_window_activity("Window geometry saved on close")
@@ -2970,6 +2832,9 @@ del "%~f0"
         except Exception as e:
             self.log_window_activity(f"Error during quit: {e}", "ERROR")
 
+        # Write out anything still queued before the process exits
+        self.log_writer.close()
+
     def test_window_memory(self) -> None:
         """Test function to verify window memory is working"""
         try:
@@ -2997,9 +2862,13 @@ del "%~f0"
 
     def open_window_log(self) -> None:
         """Open the window memory log file"""
+        self.open_log_file('window_memory.log')
+
+    def open_log_file(self, filename: str) -> None:
+        """Open a file from the user logs directory"""
         try:
             user_dir = get_user_app_directory()
-            log_file = os.path.join(user_dir, 'logs', 'window_memory.log')
+            log_file = os.path.join(user_dir, 'logs', filename)
 
             if os.path.exists(log_file):
                 if sys.platform.startswith('win'):
@@ -3025,8 +2894,10 @@ del "%~f0"
         help_menu.add_command(label="About", command=self.show_about_dialog)
         help_menu.add_separator()
         help_menu.add_command(label="Check for Updates", command=self.check_for_updates)
+        help_menu.add_command(label="Roll Back to Previous Version", command=self.roll_back_update)
         help_menu.add_separator()
         help_menu.add_command(label="Test Window Memory", command=self.show_window_memory_test)
+        help_menu.add_command(label="Diagnostics", command=self.show_diagnostics_dialog)
 
     def show_window_memory_test(self) -> None:
         """Show window memory test dialog"""
@@ -3082,6 +2953,84 @@ del "%~f0"
         )
         close_button.pack(pady=10)
 
+    def show_diagnostics_dialog(self) -> None:
+        """Show the startup and report timing spans recorded in this session"""
+        diag_dialog = ctk.CTkToplevel(self)
+        diag_dialog.title("Diagnostics")
+        diag_dialog.geometry("560x420")
+        diag_dialog.configure(fg_color=INOSYS_COLORS["background_primary"])
+
+        # Center the dialog
+        diag_dialog.transient(self)
+        diag_dialog.grab_set()
+
+        # Main frame
+        main_frame = ctk.CTkFrame(diag_dialog, fg_color=INOSYS_COLORS["background_secondary"])
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+
+        # Title
+        title_label = ctk.CTkLabel(
+            main_frame,
+            text=f"Timings - Version {APP_VERSION} (session {self.profiler.session_id})",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            text_color=INOSYS_COLORS["light_blue"]
+        )
+        title_label.pack(pady=10)
+
+        # Span table
+        spans_text = ctk.CTkTextbox(
+            main_frame,
+            font=ctk.CTkFont(family="Courier New", size=11),
+            fg_color=INOSYS_COLORS["background_tertiary"],
+            text_color=INOSYS_COLORS["text_primary"]
+        )
+        spans_text.pack(fill="both", expand=True, padx=10, pady=5)
+
+        def refresh() -> None:
+            spans_text.configure(state="normal")
+            spans_text.delete("1.0", tk.END)
+            spans_text.insert("1.0", diagnostics.format_spans(self.profiler.spans()))
+            cache_stats = self.render_cache.stats()
+            spans_text.insert(tk.END, f"\n\nRender cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                                      f"{cache_stats['memory_items']} in memory")
+            spans_text.configure(state="disabled")
+
+        refresh()
+
+        # Button frame
+        button_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        button_frame.pack(pady=10)
+
+        refresh_button = ctk.CTkButton(
+            button_frame,
+            text="Refresh",
+            command=refresh,
+            width=100,
+            fg_color=INOSYS_COLORS["medium_blue"],
+            hover_color=INOSYS_COLORS["light_blue"]
+        )
+        refresh_button.pack(side="left", padx=10)
+
+        log_button = ctk.CTkButton(
+            button_frame,
+            text="Show Log File",
+            command=lambda: self.open_log_file('timings.jsonl'),
+            width=100,
+            fg_color=INOSYS_COLORS["dark_blue"],
+            hover_color=INOSYS_COLORS["medium_blue"]
+        )
+        log_button.pack(side="left", padx=10)
+
+        close_button = ctk.CTkButton(
+            button_frame,
+            text="Close",
+            command=diag_dialog.destroy,
+            width=100,
+            fg_color=INOSYS_COLORS["dark_blue"],
+            hover_color=INOSYS_COLORS["medium_blue"]
+        )
+        close_button.pack(side="left", padx=10)
+
     # Also add this method to handle window resize/move events
     def on_window_configure(self, event=None) -> None:
         """Handle window configure events (resize/move)"""
@@ -3111,6 +3060,47 @@ del "%~f0"
         return getattr(self, 'current_case_notes', '')
 
 
+def run_cli(argv: List[str]) -> int:
+    """Run the headless batch renderer, returning the process exit code"""
+    import batch_report
+    import report_engine
+
+    args = batch_report.build_arg_parser().parse_args(argv)
+
+    catalog_path = args.catalog or get_data_file_path(catalog.CATALOG_FILENAME)
+    output_dir = args.output or os.path.join(args.batch, 'reports')
+    logo_path = report_engine.find_logo_file([os.getcwd(), get_user_app_directory(), get_app_directory()])
+
+    try:
+        failures = batch_report.run_batch(args.batch, output_dir, catalog_path, args.workers, logo_path,
+                                          compact=args.compact, merge_path=args.merge)
+    except (OSError, ValueError) as e:
+        print(f"Batch rendering failed: {e}")
+        return 2
+
+    return 1 if failures else 0
+
+
 if __name__ == "__main__":
+    # Required for the process pool in the frozen executable
+    multiprocessing.freeze_support()
+
+    # Only --batch selects the headless renderer; anything else (a file association path, a stray flag)
+    # must still open the window, since a --windowed build has nowhere to show a usage error
+    if any(arg == '--batch' or arg.startswith('--batch=') for arg in sys.argv[1:]):
+        sys.exit(run_cli(sys.argv[1:]))
+
+    # A shortcut left pointing at an older installed version hands over to the active one
+    if getattr(sys, 'frozen', False):
+        installs = versioned_install.VersionedInstall(get_user_app_directory())
+        if installs.is_managed(sys.executable):
+            active_exe = installs.launch_target(sys.executable)
+            if active_exe is not None:
+                versioned_install.launch(active_exe, get_user_app_directory())
+                sys.exit(0)
+            # Data files, the logo and the icon are looked up relative to the user directory, as they were
+            # when the executable itself lived there; a double-click in versions/<version>/ must not change that
+            os.chdir(get_user_app_directory())
+
     app: PrimusImplantApp = PrimusImplantApp()
     app.mainloop()
@@ -0,0 +1,47 @@
+"""Rasterize rendered report PDFs for the in-app preview pane.
+
+Uses pypdfium2 when it is installed; without it the preview pane falls back
+to opening the report in the default PDF viewer.
+"""
+import threading
+from typing import Any, List, Optional
+
+# pdfium is not thread-safe, so page rendering is serialized across workers
+_pdfium_lock = threading.Lock()
+
+
+def is_available() -> bool:
+    """Check whether PDF pages can be rendered in-process"""
+    try:
+        import pypdfium2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def render_pages(pdf_bytes: bytes, width: int, max_pages: int = 4,
+                 cancel_event: Optional[threading.Event] = None) -> List[Any]:
+    """Render the first pages of an in-memory PDF to PIL images of the given pixel width.
+
+    Returns an empty list if cancel_event is set before rendering finishes.
+    """
+    import pypdfium2 as pdfium
+
+    images: List[Any] = []
+    with _pdfium_lock:
+        document = pdfium.PdfDocument(pdf_bytes)
+        try:
+            for index in range(min(len(document), max_pages)):
+                if cancel_event is not None and cancel_event.is_set():
+                    return []
+                page = document[index]
+                try:
+                    scale = width / page.get_width()
+                    bitmap = page.render(scale=scale)
+                    images.append(bitmap.to_pil())
+                finally:
+                    page.close()
+        finally:
+            document.close()
+
+    return images
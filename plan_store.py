@@ -0,0 +1,142 @@
+"""Implant plan model shared by the Review Plan list, the preview and the report engine."""
+import bisect
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from catalog import ImplantRecord
+
+
+class ImplantPlan:
+    """One planned implant, resolved against its catalog record"""
+    __slots__ = ('tooth_number', 'implant_line', 'diameter', 'length', 'offset', 'surgical_approach',
+                 'record')
+
+    def __init__(self, tooth_number: int, implant_line: str, diameter: float, length: float, offset: float,
+                 surgical_approach: str, record: ImplantRecord) -> None:
+        self.tooth_number: int = tooth_number
+        self.implant_line: str = implant_line
+        self.diameter: float = diameter
+        self.length: float = length
+        self.offset: float = offset
+        self.surgical_approach: str = surgical_approach
+        self.record: ImplantRecord = record  # Shared by the plans added together for one configuration
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ImplantPlan):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    def __repr__(self) -> str:
+        return (f"ImplantPlan(tooth_number={self.tooth_number}, diameter={self.diameter}, length={self.length}, "
+                f"offset={self.offset}, surgical_approach={self.surgical_approach!r})")
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the plan as a plain dict"""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['record'] = self.record.as_dict()
+        return data
+
+
+class PlanStore:
+    """Implant plans keyed by tooth number, iterated in tooth order.
+
+    Listeners registered with subscribe() are called after every change; use
+    batch_updates() to coalesce several changes into a single notification.
+    """
+
+    def __init__(self) -> None:
+        self._plans: Dict[int, ImplantPlan] = {}
+        self._teeth: List[int] = []  # Kept sorted so iteration never re-sorts
+        self._listeners: List[Callable[[], None]] = []
+        self._batch_depth = 0
+        self._pending_notify = False
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def __iter__(self) -> Iterator[ImplantPlan]:
+        return (self._plans[tooth_number] for tooth_number in self._teeth)
+
+    def __contains__(self, tooth_number: object) -> bool:
+        return tooth_number in self._plans
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Listeners are UI callbacks and are not carried into worker processes
+        return {'plans': list(self)}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__()
+        for plan in state['plans']:
+            self.set(plan)
+
+    def get(self, tooth_number: int) -> Optional[ImplantPlan]:
+        """Return the plan for a tooth, if any"""
+        return self._plans.get(tooth_number)
+
+    def teeth(self) -> List[int]:
+        """Return the planned tooth numbers in order"""
+        return list(self._teeth)
+
+    def set(self, plan: ImplantPlan) -> bool:
+        """Add or replace the plan for a tooth, returning True if a plan was replaced"""
+        replaced = plan.tooth_number in self._plans
+        if not replaced:
+            bisect.insort(self._teeth, plan.tooth_number)
+        self._plans[plan.tooth_number] = plan
+        self._changed()
+        return replaced
+
+    def remove(self, tooth_number: int) -> bool:
+        """Remove the plan for a tooth, returning True if there was one"""
+        if self._plans.pop(tooth_number, None) is None:
+            return False
+        del self._teeth[bisect.bisect_left(self._teeth, tooth_number)]
+        self._changed()
+        return True
+
+    def clear(self) -> None:
+        """Remove all plans"""
+        if self._plans:
+            self._plans.clear()
+            self._teeth.clear()
+            self._changed()
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        """Call listener after every change to the plans"""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[], None]) -> None:
+        """Stop notifying a listener"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    @contextmanager
+    def batch_updates(self) -> Iterator["PlanStore"]:
+        """Defer change notifications until the outermost batch finishes"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending_notify:
+                self._pending_notify = False
+                self._notify()
+
+    def _changed(self) -> None:
+        self.version += 1
+        if self._batch_depth:
+            self._pending_notify = True
+        else:
+            self._notify()
+
+    def _notify(self) -> None:
+        for listener in list(self._listeners):
+            listener()
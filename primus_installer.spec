@@ -21,6 +21,7 @@ a = Analysis(
         'pandas',
         'reportlab',
         'PIL',
+        'pypdfium2',
     ],
     hookspath=[],
     hooksconfig={},
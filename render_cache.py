@@ -0,0 +1,195 @@
+"""Content-addressed cache of rendered report PDFs.
+
+A report is keyed by a hash of everything that affects its content: the
+normalized plans, the case metadata and notes, the output options, the logo
+file, the catalog version and the report template version. Recent PDFs are
+kept in memory (LRU), so previewing and then saving the same case lays it
+out only once. A size-capped disk tier is available for callers whose PDFs
+may outlive the session; the app does not use it, because its PDFs contain
+patient details.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Bump when the key layout changes so old disk entries are never matched
+RENDER_CACHE_VERSION = 3
+
+
+def make_render_key(plans: Iterable[Any], doctor_name: str, patient_name: str, case_number: str, case_notes: str,
+                    **options: Any) -> str:
+    """Hash a report request into a cache key.
+
+    options carries everything else that changes the output (printed date,
+    preview/compact flags, logo, catalog and template versions).
+    """
+    payload = {
+        'cache_version': RENDER_CACHE_VERSION,
+        'plans': sorted((plan.as_dict() for plan in plans), key=lambda plan: plan['tooth_number']),
+        'doctor_name': doctor_name,
+        'patient_name': patient_name,
+        'case_number': case_number,
+        'case_notes': case_notes,
+        'options': options
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def file_signature(path: Optional[str]) -> str:
+    """Identify a file's current contents by path, size and modification time, or "" if it is missing"""
+    if not path:
+        return ""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ""
+    return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def purge_disk_cache(cache_dir: str) -> None:
+    """Delete the PDFs left in a disk tier by earlier versions"""
+    RenderCache(cache_dir).clear()
+
+
+class RenderCache:
+    """Two-tier cache of PDF bytes: an in-memory LRU backed by a size-capped directory"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_memory_items: int = 16,
+                 max_disk_bytes: int = 50 * 1024 * 1024) -> None:
+        self.cache_dir: Optional[str] = cache_dir
+        self.max_memory_items: int = max_memory_items
+        self.max_disk_bytes: int = max_disk_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached PDF for a key, or None"""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return data
+
+        data = self._read_disk(key)
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store a rendered PDF in both tiers"""
+        with self._lock:
+            self._remember(key, data)
+        self._write_disk(key, data)
+
+    def clear(self) -> None:
+        """Drop every cached PDF"""
+        with self._lock:
+            self._memory.clear()
+        for path, _, _ in self._disk_entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current tier sizes"""
+        with self._lock:
+            memory_items = len(self._memory)
+        disk_entries = self._disk_entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'memory_items': memory_items,
+            'disk_items': len(disk_entries),
+            'disk_bytes': sum(size for _, size, _ in disk_entries)
+        }
+
+    def _remember(self, key: str, data: bytes) -> None:
+        """Add to the memory tier, evicting the least recently used entries (lock held)"""
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        """Read an entry from the disk tier and mark it recently used"""
+        if not self.cache_dir:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # Eviction goes by modification time
+            return data
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        """Write an entry to the disk tier atomically, then evict down to the size cap"""
+        if not self.cache_dir or len(data) > self.max_disk_bytes:
+            return
+
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Failed to write render cache entry: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+
+        self._evict_disk()
+
+    def _disk_entries(self) -> List[Tuple[str, int, float]]:
+        """List (path, size, mtime) for every entry in the disk tier"""
+        if not self.cache_dir:
+            return []
+
+        entries: List[Tuple[str, int, float]] = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.pdf'):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((entry.path, stat.st_size, stat.st_mtime))
+        except OSError:
+            pass
+        return entries
+
+    def _evict_disk(self) -> None:
+        """Delete the least recently used disk entries until the tier fits max_disk_bytes"""
+        entries = self._disk_entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,683 @@
+"""Headless PDF report engine for the Primus Implant Report Generator.
+
+Builds the drilling-protocol PDF from a list of implant plans and case
+metadata without touching Tk, so reports can be rendered from the GUI, the
+command line or a worker process alike.
+"""
+import copy
+import io
+import math
+import os
+import zlib
+import threading
+from datetime import datetime
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Union
+
+from PIL import Image as PILImage
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfdoc import PDFDocument, PDFImageXObject, PDFObjectReference
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, HRFlowable, PageBreak
+from reportlab.platypus.flowables import Flowable
+
+import assets
+from plan_store import ImplantPlan, PlanStore
+
+# Placeholders used when the case metadata fields are left empty
+DEFAULT_DOCTOR_NAME = "Dr. [Name]"
+DEFAULT_PATIENT_NAME = "[Patient Name]"
+DEFAULT_CASE_NUMBER = "[Case Number]"
+
+# Logo candidates for the PDF header, in order of preference
+REPORT_LOGO_FILES: List[str] = assets.LOGO_FILES
+
+# Logo height in the PDF header
+REPORT_LOGO_HEIGHT = 0.5 * inch  # Reduced from 0.6
+
+# Compact output: embedded images are downsampled to this resolution at their printed size
+COMPACT_IMAGE_DPI = 300
+
+DARK_BLUE = colors.Color(30 / 255, 58 / 255, 138 / 255)
+LIGHT_BLUE = colors.Color(0 / 255, 181 / 255, 216 / 255)
+MEDIUM_BLUE = colors.Color(14 / 255, 165 / 255, 233 / 255)
+
+DISCLAIMER_TEXT = """This instruction incorporates a custom document that is based on a surgical plan proposed by the surgeon before operation. The surgeon, therefore, takes full medical responsibility for the design and the application of the surgical guide, the intended used surgical tray kit, implants and sleeves – all as specified on the order form received by the supplier. The custom document shall be considered as an addition to all other documents sent with and pertaining to the case, and it does not replace any of those other documents."""
+
+
+def find_logo_file(search_dirs: Optional[List[str]] = None) -> Optional[str]:
+    """Return the first logo file found in the search directories (default: current directory)"""
+    return assets.find_logo_file(search_dirs, REPORT_LOGO_FILES)
+
+
+class ReportTemplate:
+    """Styles, table styles and static flowables shared by every report.
+
+    Built once per process by get_report_template(); each report only builds
+    its case-specific flowables. Static flowables are handed out as shallow
+    copies because platypus keeps layout state on the flowable itself.
+    """
+    # Bump when the layout changes so cached renders are not reused
+    VERSION = 1
+
+    def __init__(self) -> None:
+        styles = getSampleStyleSheet()
+
+        # Custom styles - more compressed
+        self.title_style: ParagraphStyle = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=16,  # Reduced from 18
+            textColor=DARK_BLUE,
+            alignment=TA_CENTER,
+            spaceAfter=12  # Reduced from 20
+        )
+
+        self.header_style: ParagraphStyle = ParagraphStyle(
+            'CustomHeader',
+            parent=styles['Heading2'],
+            fontSize=11,  # Reduced from 12
+            textColor=DARK_BLUE,
+            spaceBefore=8,  # Reduced from 10
+            spaceAfter=6  # Reduced from 8
+        )
+
+        # More compact title used next to the logo
+        self.header_title_style: ParagraphStyle = ParagraphStyle(
+            'HeaderTitle',
+            fontSize=14,  # Reduced from 16
+            textColor=DARK_BLUE,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold',
+            leading=16  # Reduced from 20
+        )
+
+        self.drill_sequence_style: ParagraphStyle = ParagraphStyle(
+            'DrillSeq',
+            parent=styles['Normal'],
+            fontSize=7,
+            fontName='Helvetica',
+            leading=8
+        )
+
+        # Case notes style that handles HTML line breaks
+        self.case_notes_style: ParagraphStyle = ParagraphStyle(
+            'CaseNotes',
+            parent=styles['Normal'],
+            fontSize=10,
+            leading=12,
+            leftIndent=10,
+            rightIndent=10,
+            spaceBefore=6,  # Reduced from 8
+            spaceAfter=6,  # Reduced from 8
+            borderWidth=1,
+            borderColor=MEDIUM_BLUE,
+            borderPadding=8,  # Reduced from 10
+            backColor=colors.Color(248 / 255, 249 / 255, 250 / 255)
+        )
+
+        # Disclaimer section - smaller font, no heading
+        self.disclaimer_style: ParagraphStyle = ParagraphStyle(
+            'Disclaimer',
+            parent=styles['Normal'],
+            fontSize=6,  # Reduced from 8 to 6
+            textColor=colors.Color(60 / 255, 60 / 255, 60 / 255),
+            spaceBefore=6,  # Reduced from 10
+            spaceAfter=3,  # Reduced from 5
+            alignment=TA_LEFT,
+            leading=7  # Reduced from 10
+        )
+
+        self.header_table_style = TableStyle([
+            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+            ('ALIGN', (1, 0), (1, 0), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+            ('TOPPADDING', (0, 0), (-1, -1), 0),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+        ])
+
+        self.case_table_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),  # Reduced from 10
+            ('TOPPADDING', (0, 0), (-1, -1), 3),  # Reduced from 4
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 3),  # Reduced from 4
+            ('LEFTPADDING', (0, 0), (-1, -1), 4),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+            ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey),
+            ('BACKGROUND', (0, 0), (0, -1), LIGHT_BLUE),
+            ('BACKGROUND', (2, 0), (2, -1), LIGHT_BLUE),
+        ])
+
+        self.implant_table_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, 0), 8),
+            ('FONTSIZE', (0, 1), (6, -1), 7),
+            ('TOPPADDING', (0, 0), (-1, -1), 2),  # Reduced from 3
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),  # Reduced from 3
+            ('LEFTPADDING', (0, 0), (-1, -1), 2),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 2),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('BACKGROUND', (0, 0), (-1, 0), DARK_BLUE),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('WORDWRAP', (1, 1), (1, -1), True),
+            ('WORDWRAP', (5, 1), (5, -1), True),
+            ('WORDWRAP', (7, 1), (7, -1), True),
+            ('OVERFLOW', (0, 0), (-1, -1), 'CLIP'),
+        ])
+
+        # Keep existing column widths
+        self.implant_col_widths: List[float] = [
+            0.35 * inch, 0.7 * inch, 0.35 * inch, 0.45 * inch,
+            0.4 * inch, 0.8 * inch, 0.65 * inch, 2.9 * inch
+        ]
+
+        # Static flowables - parsed once, copied per report
+        self.title_paragraph = Paragraph("PRIMUS IMPLANT SURGICAL DRILLING PROTOCOL", self.title_style)
+        self.header_title_paragraph = Paragraph("PRIMUS IMPLANT<br/>SURGICAL DRILLING PROTOCOL",
+                                                self.header_title_style)
+        self.implant_heading = Paragraph("IMPLANT SPECIFICATIONS & DRILLING PROTOCOL", self.header_style)
+        self.case_notes_heading = Paragraph("CASE NOTES", self.header_style)
+        self.protocol_heading = Paragraph("SURGICAL PROTOCOL", self.header_style)
+        self.protocol_table = self._build_protocol_table()
+        self.disclaimer = Paragraph(DISCLAIMER_TEXT, self.disclaimer_style)
+
+        # Drill sequence prefixes per surgical approach
+        self.approach_instructions: Dict[str, str] = {
+            'flapless': "Tissue punch → Drill to bone → clear tissue",
+            'flap': "Open flap and reflect tissue prior to seating surgical guide"
+        }
+
+    def _build_protocol_table(self) -> Table:
+        """Build the compact two-column surgical protocol table"""
+        protocol_data = [
+            ["PRE-SURGICAL PREPARATION", "DRILLING PROTOCOL"],
+            [
+                "• Verify patient identity and surgical site\n"
+                "• Confirm implant specifications\n"
+                "• Prepare sterile surgical field\n"
+                "• Check all instruments and drill bits\n"
+                "• Ensure proper guide sleeve placement",
+
+                "• Begin with the point drill in D4 bone\n"
+                "• Use intermittent drilling (15-30 sec intervals)\n"
+                "• Speeds: 300-800 RPM tissue punch, cortical perforator, shaping drills\n"
+                "• Apply light pressure - let drill do the work\n"
+                "• Use copious irrigation (minimum 50ml/min)"
+            ],
+            ["POST-DRILLING VERIFICATION", "IMPORTANT NOTES"],
+            [
+                "• Irrigate osteotomy thoroughly\n"
+                "• Check final depth and angulation\n"
+                "• Verify diameter with sizing gauge\n"
+                "• Proceed with implant placement protocol\n"
+                "• Implant placement speed & torque: 20 RPM 35 Ncm ",
+
+                "• Follow manufacturer drilling guidelines\n"
+                "• Maintain sterile technique throughout\n"
+                "• Account for offset measurements\n"
+                "• Document any deviations from protocol"
+            ]
+        ]
+
+        protocol_table = Table(protocol_data, colWidths=[3.75 * inch, 3.75 * inch])
+        protocol_table.setStyle(TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 2), (-1, 2), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),  # Reduced from 9
+            ('TOPPADDING', (0, 0), (-1, -1), 6),  # Reduced from 8
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),  # Reduced from 8
+            ('LEFTPADDING', (0, 0), (-1, -1), 6),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey),
+            ('BACKGROUND', (0, 0), (-1, 0), MEDIUM_BLUE),
+            ('BACKGROUND', (0, 2), (-1, 2), MEDIUM_BLUE),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('TEXTCOLOR', (0, 2), (-1, 2), colors.white),
+        ]))
+        return protocol_table
+
+    def protocol_flowables(self) -> List[Any]:
+        """Return the surgical protocol and disclaimer section that closes every report"""
+        return [
+            # Horizontal line separator
+            HRFlowable(width="100%", thickness=1, color=MEDIUM_BLUE),
+            Spacer(1, 8),  # Reduced from 10
+            copy.copy(self.protocol_heading),
+            copy.copy(self.protocol_table),
+            Spacer(1, 10),  # Reduced from 15
+            # Final horizontal line
+            HRFlowable(width="100%", thickness=1.5, color=DARK_BLUE),
+            Spacer(1, 8),  # Reduced from 10
+            copy.copy(self.disclaimer)
+        ]
+
+
+class ReportCancelled(Exception):
+    """Raised inside a report build when its cancel event is set"""
+
+
+class ProtocolDocTemplate(SimpleDocTemplate):
+    """Document template that reports layout progress and honours cancellation between flowables"""
+
+    def __init__(self, destination: Union[str, BinaryIO],
+                 progress_callback: Optional[Callable[[int, int], None]] = None,
+                 cancel_event: Optional[threading.Event] = None, **kwargs: Any) -> None:
+        super().__init__(destination, **kwargs)
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.total_flowables = 0
+        self.flowables_done = 0
+
+    def build(self, flowables: List[Any], **kwargs: Any) -> None:
+        self.total_flowables = len(flowables)
+        self.flowables_done = 0
+        self.check_cancelled()
+        super().build(flowables, **kwargs)
+
+    def afterFlowable(self, flowable: Any) -> None:
+        self.flowables_done += 1
+        if self.progress_callback is not None:
+            self.progress_callback(min(self.flowables_done, self.total_flowables), self.total_flowables)
+        self.check_cancelled()
+
+    def check_cancelled(self) -> None:
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ReportCancelled()
+
+
+_report_template: Optional[ReportTemplate] = None
+_report_template_lock = threading.Lock()
+
+
+def get_report_template() -> ReportTemplate:
+    """Return the process-wide report template, building it on first use"""
+    global _report_template
+    if _report_template is None:
+        with _report_template_lock:
+            if _report_template is None:
+                _report_template = ReportTemplate()
+    return _report_template
+
+
+_encoded_images: Dict[tuple, PDFImageXObject] = {}
+_encoded_images_lock = threading.Lock()
+
+# Pre-encoded images rely on ReportLab internals; fall back to the Image flowable if a release drops them
+try:
+    from reportlab.pdfbase.pdfdoc import _mode2CS
+    from reportlab.pdfgen.canvas import _digester
+except ImportError:
+    _mode2CS = _digester = None
+
+
+def _supports_cached_images() -> bool:
+    """Check that the ReportLab internals used by CachedImage are present"""
+    if _mode2CS is None or _digester is None:
+        return False
+    try:
+        probe = PDFImageXObject('probe')
+        document = PDFDocument()
+    except Exception:
+        return False
+    image_fields = ('name', 'width', 'height', 'bitsPerComponent', 'colorSpace', '_filters', 'streamContent', 'mask')
+    document_fields = ('idToObject', 'addForm', 'Reference', 'getXObjectName')
+    return (all(hasattr(probe, field) for field in image_fields)
+            and all(hasattr(document, field) for field in document_fields))
+
+
+CACHED_IMAGES_SUPPORTED = _supports_cached_images()
+
+
+def pixels_for_points(points: float, dpi: int) -> int:
+    """Return the pixel count that covers a printed length at the given resolution"""
+    return max(1, math.ceil(points / 72 * dpi))
+
+
+def _encode_binary_image(name: str, reader: ImageReader) -> PDFImageXObject:
+    """Build an image object with a maximum-level binary Flate stream (no ASCII85 wrapper)"""
+    data = reader.getRGBData()  # Also sets reader.mode and splits off any alpha channel
+    encoded = PDFImageXObject(name)
+    encoded.name = name
+    encoded.width, encoded.height = reader.getSize()
+    encoded.bitsPerComponent = 8
+    encoded.colorSpace = _mode2CS[reader.mode]
+    encoded.streamContent = zlib.compress(data, 9)
+    encoded._filters = ('FlateDecode',)
+    encoded.mask = None
+    return encoded
+
+
+def get_encoded_logo(logo: assets.LogoAsset, max_height_px: Optional[int] = None,
+                     compact: bool = False) -> PDFImageXObject:
+    """Return the PDF image object for a logo, compressing its pixel data only once per process.
+
+    max_height_px downsamples the logo first; compact writes binary streams at
+    maximum compression instead of ReportLab's default ASCII85 encoding.
+    """
+    # Box (area-average) filtering adds far fewer new colours than Lanczos, so the result deflates better
+    image = logo.scaled(max_height_px, PILImage.BOX) if max_height_px else logo.image
+    key = (logo.path, image.size, compact)
+
+    with _encoded_images_lock:
+        encoded = _encoded_images.get(key)
+        if encoded is None:
+            name = _digester(f"{logo.path}:{image.size}:{compact}".encode('utf-8'))
+            reader = ImageReader(image)
+            if compact:
+                encoded = _encode_binary_image(name, reader)
+                if reader._dataA:
+                    alpha = reader._dataA
+                    encoded._smask = _encode_binary_image(_digester(alpha.getRGBData()), alpha)
+                    encoded._smask._decode = [0, 1]
+            else:
+                encoded = PDFImageXObject(name, reader, mask='auto')
+                encoded.name = name
+            _encoded_images[key] = encoded
+    return encoded
+
+
+class CachedImage(Flowable):
+    """Image flowable that draws a pre-encoded PDF image object.
+
+    The encoded object is registered with each document the first time it is
+    drawn, so building a report never decodes or recompresses the image.
+    """
+
+    def __init__(self, encoded: PDFImageXObject, width: float, height: float, hAlign: str = 'CENTER') -> None:
+        super().__init__()
+        self.encoded = encoded
+        self.drawWidth = width
+        self.drawHeight = height
+        self.hAlign = hAlign
+
+    def wrap(self, availWidth: float, availHeight: float) -> tuple:
+        return self.drawWidth, self.drawHeight
+
+    def draw(self) -> None:
+        name = self.encoded.name
+        document = self.canv._doc
+        reg_name = document.getXObjectName(name)
+
+        if reg_name not in document.idToObject:
+            # Mirror Canvas.drawImage's registration, using per-document copies of the cached objects
+            image_obj = copy.copy(self.encoded)
+            smask = getattr(image_obj, '_smask', None)
+            if smask is not None:
+                del image_obj._smask
+            document.Reference(image_obj, reg_name)
+            document.addForm(name, image_obj)
+            if smask is not None:
+                mask_reg_name = document.getXObjectName(smask.name)
+                if mask_reg_name not in document.idToObject:
+                    document.Reference(copy.copy(smask), mask_reg_name)
+                image_obj.smask = PDFObjectReference(mask_reg_name)
+
+        self.canv.saveState()
+        self.canv.scale(self.drawWidth, self.drawHeight)
+        self.canv.doForm(name)
+        self.canv.restoreState()
+
+
+def add_logo_to_report_header(header_data: List[List[Any]], logo_path: Optional[str] = None,
+                              compact: bool = False) -> bool:
+    """Add logo to header data for table layout - more compact version"""
+    logo_files = [logo_path] if logo_path else [path for path in [find_logo_file()] if path]
+
+    for logo_file in logo_files:
+        try:
+            logo = assets.get_logo(logo_file)
+            if logo is None:
+                continue
+
+            # Smaller logo for more compact layout
+            desired_height = REPORT_LOGO_HEIGHT
+            calculated_width = logo.width_for_height(desired_height)
+
+            max_height_px = pixels_for_points(desired_height, COMPACT_IMAGE_DPI) if compact else None
+            if CACHED_IMAGES_SUPPORTED:
+                logo_image = CachedImage(get_encoded_logo(logo, max_height_px, compact),
+                                         width=calculated_width, height=desired_height)
+            elif max_height_px:
+                # Without the cached encoder compact mode can still downsample before ReportLab encodes the logo
+                buffer = io.BytesIO()
+                logo.scaled(max_height_px, PILImage.BOX).save(buffer, 'PNG')
+                buffer.seek(0)
+                logo_image = Image(buffer, width=calculated_width, height=desired_height)
+            else:
+                logo_image = Image(logo_file, width=calculated_width, height=desired_height)
+
+            # More compact title paragraph
+            title_para = copy.copy(get_report_template().header_title_paragraph)
+
+            header_data.append([logo_image, title_para])
+            return True
+
+        except Exception as e:
+            print(f"Error adding logo to PDF header from {logo_file}: {str(e)}")
+            continue
+
+    return False
+
+
+class ReportCase:
+    """Plans and metadata for one case in a merged report"""
+    __slots__ = ('plans', 'doctor_name', 'patient_name', 'case_number', 'case_notes')
+
+    def __init__(self, plans: Iterable[ImplantPlan], doctor_name: str, patient_name: str, case_number: str,
+                 case_notes: str = "") -> None:
+        self.plans: Iterable[ImplantPlan] = plans
+        self.doctor_name: str = doctor_name
+        self.patient_name: str = patient_name
+        self.case_number: str = case_number
+        self.case_notes: str = case_notes
+
+
+class CaseBookmark(Flowable):
+    """Zero-size flowable that adds an outline entry for the page it lands on"""
+
+    def __init__(self, key: str, title: str) -> None:
+        super().__init__()
+        self.key = key
+        self.title = title
+
+    def wrap(self, availWidth: float, availHeight: float) -> tuple:
+        return 0, 0
+
+    def draw(self) -> None:
+        self.canv.bookmarkPage(self.key)
+        self.canv.addOutlineEntry(self.title, self.key, level=0)
+
+
+def create_doc_template(destination: Union[str, BinaryIO], title: str,
+                        progress_callback: Optional[Callable[[int, int], None]] = None,
+                        cancel_event: Optional[threading.Event] = None) -> ProtocolDocTemplate:
+    """Create the letter-size document template shared by single and merged reports"""
+    return ProtocolDocTemplate(
+        destination,
+        progress_callback=progress_callback,
+        cancel_event=cancel_event,
+        pagesize=letter,
+        topMargin=0.4 * inch,  # Reduced from 0.5
+        bottomMargin=0.4 * inch,  # Reduced from 0.5
+        leftMargin=0.5 * inch,
+        rightMargin=0.5 * inch,
+        title=title,
+        pageCompression=1
+    )
+
+
+def build_case_story(plans: Iterable[ImplantPlan], doctor_name: str, patient_name: str, case_number: str,
+                     case_notes: str = "", logo_path: Optional[str] = None, compact: bool = False,
+                     generated_at: Optional[datetime] = None) -> List[Any]:
+    """Build the flowables for one case, from the header through the disclaimer"""
+    template = get_report_template()
+
+    # A PlanStore already iterates in tooth order
+    sorted_plans: List[ImplantPlan] = (list(plans) if isinstance(plans, PlanStore)
+                                       else sorted(plans, key=lambda plan: plan.tooth_number))
+    story: List[Any] = []
+
+    # Header section with logo and title - more compressed
+    header_data = []
+    add_logo_to_report_header(header_data, logo_path, compact=compact)
+
+    if header_data:
+        # Create header table with smaller dimensions
+        header_table = Table(header_data, colWidths=[2.5 * inch, 4.5 * inch])  # Reduced logo space
+        header_table.setStyle(template.header_table_style)
+        story.append(header_table)
+    else:
+        # No logo, just title
+        story.append(copy.copy(template.title_paragraph))
+
+    story.append(Spacer(1, 10))  # Reduced from 15
+
+    # Case information in more compact format
+    now = generated_at or datetime.now()
+    case_info: List[List[str]] = [
+        ["Doctor:", doctor_name, "Date:", now.strftime("%B %d, %Y")],
+        ["Patient:", patient_name, "Time:", now.strftime("%I:%M %p")],
+        ["Case Number:", case_number, "Total Implants:", str(len(sorted_plans))]
+    ]
+
+    case_table: Table = Table(case_info,
+                              colWidths=[0.9 * inch, 2.1 * inch, 1.1 * inch, 1.4 * inch])  # Slightly smaller
+    case_table.setStyle(template.case_table_style)
+
+    story.append(case_table)
+    story.append(Spacer(1, 10))  # Reduced from 15
+
+    # Horizontal line separator
+    story.append(HRFlowable(width="100%", thickness=1.5, color=DARK_BLUE))  # Thinner
+    story.append(Spacer(1, 8))  # Reduced from 10
+
+    # Create comprehensive implant summary table
+    story.append(copy.copy(template.implant_heading))
+
+    # Main implant data table - keep existing column sizing
+    implant_data = [
+        ["Tooth", "Part Number", "Dia.", "Len.", "Offset", "Guide Sleeve", "Drill Length", "Drilling Sequence"]]
+
+    for plan in sorted_plans:
+        approach_instruction = template.approach_instructions[
+            'flapless' if plan.surgical_approach == 'flapless' else 'flap']
+
+        drill_sequence = f"<b>{approach_instruction}</b><br/>{plan.record.drill_sequence_text}"
+
+        implant_data.append([
+            str(plan.tooth_number),
+            plan.record.part_number,
+            f"{plan.diameter}mm",
+            f"{plan.length}mm",
+            f"{plan.offset}mm",
+            plan.record.guide_sleeve,
+            f"{plan.record.drill_length}mm",
+            Paragraph(drill_sequence, template.drill_sequence_style)
+        ])
+
+    implant_table: Table = Table(implant_data, colWidths=template.implant_col_widths, repeatRows=1)
+    implant_table.setStyle(template.implant_table_style)
+
+    story.append(implant_table)
+    story.append(Spacer(1, 10))  # Reduced from 15
+
+    # Add case notes if they exist - with proper line break handling
+    if case_notes:
+        story.append(Spacer(1, 10))
+        story.append(copy.copy(template.case_notes_heading))
+        story.append(Paragraph(case_notes, template.case_notes_style))
+        story.append(Spacer(1, 10))
+
+    # Static surgical protocol and disclaimer
+    story.extend(template.protocol_flowables())
+    return story
+
+
+def build_document(doc: ProtocolDocTemplate, story: List[Any], destination: Union[str, BinaryIO]) -> int:
+    """Build a story into its document and return the size of the written PDF in bytes"""
+    start_position = None if isinstance(destination, str) else destination.tell()
+    doc.build(story)
+
+    if start_position is None:
+        return os.path.getsize(destination)
+    return destination.tell() - start_position
+
+
+def create_pdf_report(destination: Union[str, BinaryIO], plans: Iterable[ImplantPlan], doctor_name: str,
+                      patient_name: str, case_number: str, case_notes: str = "", is_preview: bool = False,
+                      logo_path: Optional[str] = None,
+                      progress_callback: Optional[Callable[[int, int], None]] = None,
+                      cancel_event: Optional[threading.Event] = None, compact: bool = False,
+                      generated_at: Optional[datetime] = None) -> int:
+    """Render the drilling protocol PDF for the given plans to a filename or binary file object.
+
+    progress_callback is called with (flowables laid out, total flowables) and
+    setting cancel_event aborts the build with ReportCancelled. compact
+    downsamples embedded images to COMPACT_IMAGE_DPI and compresses them at the
+    maximum level. generated_at is the date and time printed on the report
+    (default: now). Returns the size of the written PDF in bytes.
+    """
+    doc = create_doc_template(destination, "Primus Implant Report" + (" - Preview" if is_preview else ""),
+                              progress_callback, cancel_event)
+    story = build_case_story(plans, doctor_name, patient_name, case_number, case_notes, logo_path, compact,
+                             generated_at)
+    return build_document(doc, story, destination)
+
+
+def create_merged_pdf_report(destination: Union[str, BinaryIO], cases: Iterable[ReportCase],
+                             logo_path: Optional[str] = None,
+                             progress_callback: Optional[Callable[[int, int], None]] = None,
+                             cancel_event: Optional[threading.Event] = None, compact: bool = False) -> int:
+    """Render several cases into one PDF, each starting on a new page with its own outline entry.
+
+    All cases are laid out into a single document, so the logo image and the
+    standard fonts are written once and referenced from every page.
+    Returns the size of the written PDF in bytes.
+    """
+    doc = create_doc_template(destination, "Primus Implant Reports", progress_callback, cancel_event)
+    story: List[Any] = []
+
+    for index, case in enumerate(cases):
+        if index:
+            story.append(PageBreak())
+        story.append(CaseBookmark(f"case-{index}", f"{case.case_number} - {case.patient_name}"))
+        story.extend(build_case_story(case.plans, case.doctor_name, case.patient_name, case.case_number,
+                                      case.case_notes, logo_path, compact))
+
+    if not story:
+        raise ValueError("No cases to render")
+
+    return build_document(doc, story, destination)
+
+
+def format_file_size(size: int) -> str:
+    """Format a byte count for display"""
+    if size < 1024:
+        return f"{size} bytes"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def render_pdf_bytes(plans: Iterable[ImplantPlan], doctor_name: str, patient_name: str, case_number: str,
+                     case_notes: str = "", is_preview: bool = False, logo_path: Optional[str] = None,
+                     progress_callback: Optional[Callable[[int, int], None]] = None,
+                     cancel_event: Optional[threading.Event] = None, compact: bool = False) -> bytes:
+    """Render the drilling protocol PDF in memory and return its bytes"""
+    buffer = io.BytesIO()
+    create_pdf_report(buffer, plans, doctor_name, patient_name, case_number, case_notes,
+                      is_preview=is_preview, logo_path=logo_path, progress_callback=progress_callback,
+                      cancel_event=cancel_event, compact=compact)
+    return buffer.getvalue()
@@ -0,0 +1,47 @@
+import json
+import os
+
+import pytest
+
+import batch_report
+import catalog
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), catalog.CATALOG_FILENAME)
+IMPLANT = {"tooth_number": 8, "diameter": 4.0, "length": 10, "offset": 11.5}
+
+
+def write_case(directory, name, case):
+    with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+        json.dump(case, f)
+
+
+@pytest.mark.parametrize('implants', [["oops"], [None], [IMPLANT, 3], "not a list"])
+def test_malformed_implant_entries_raise_case_error(implants):
+    index = catalog.ImplantIndex(catalog.read_catalog(CATALOG_PATH))
+    with pytest.raises(batch_report.CaseError):
+        batch_report.resolve_case_plans({'implants': implants}, index)
+
+
+def test_bad_case_file_does_not_stop_the_batch(tmp_path, capsys):
+    cases = tmp_path / "cases"
+    cases.mkdir()
+    write_case(str(cases), "bad.json", {"case_number": "C-1", "implants": ["oops"]})
+    write_case(str(cases), "good.json", {"case_number": "C-2", "implants": [IMPLANT]})
+
+    failures = batch_report.run_batch(str(cases), str(tmp_path / "out"), CATALOG_PATH, workers=1)
+
+    assert failures == 1
+    assert "bad.json: Implant entry 0" in capsys.readouterr().out
+    assert os.listdir(str(tmp_path / "out")) == ["Primus_Report_C-2.pdf"]
+
+
+def test_cases_sharing_a_case_number_get_separate_files(tmp_path):
+    cases = tmp_path / "cases"
+    cases.mkdir()
+    write_case(str(cases), "first.json", {"case_number": "C-1", "implants": [IMPLANT]})
+    write_case(str(cases), "second.json", {"case_number": "C-1", "implants": [IMPLANT]})
+
+    failures = batch_report.run_batch(str(cases), str(tmp_path / "out"), CATALOG_PATH, workers=2)
+
+    assert failures == 0
+    assert sorted(os.listdir(str(tmp_path / "out"))) == ["Primus_Report_C-1.pdf", "Primus_Report_C-1_second.pdf"]
@@ -0,0 +1,64 @@
+import pytest
+
+import catalog
+
+HEADER = ",".join(catalog.REQUIRED_COLUMNS)
+ROWS = [
+    "Primus,P-1,3.5,10,S-1,20,11.5,10,10,10,10,,,",
+    "Primus,P-2,3.75,10,S-1,20,11.5,10,10,10,10,,,",
+    "Primus,P-3,3.5,10,S-1,20,13,x,10,10,10,,,",
+    "Primus,P-dup,3.5,10.0,S-2,20,11.50,10,10,10,10,,,",
+    " Other ,O-1,4,8.5,S-3,18.5,10,8.5,,,,,,",
+    "Other,O-bad,abc,8.5,S-3,18.5,10,8.5,,,,,,",
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / "catalog.csv"
+    path.write_text("\n".join([HEADER] + ROWS) + "\n", encoding='utf-8')
+    return catalog.ImplantIndex(catalog.read_catalog(str(path)))
+
+
+@pytest.mark.parametrize('query', [
+    ("Primus", 3.5, 10, 11.5),
+    ("primus ", "3.5", "10", "11.5"),
+    ("PRIMUS", 3.5000000001, 10.0, 11.499999999),
+])
+def test_lookup_matches_in_hundredths_of_a_millimetre(index, query):
+    record = index.lookup(*query)
+    assert record is not None
+    assert record.part_number == "P-1"
+
+
+def test_lookup_keeps_the_first_row_for_duplicate_configurations(index):
+    assert index.lookup("Primus", 3.5, 10, 11.5).guide_sleeve == "S-1"
+
+
+def test_lookup_distinguishes_hundredths(index):
+    assert index.lookup("Primus", 3.75, 10, 11.5).part_number == "P-2"
+    assert index.lookup("Primus", 3.7, 10, 11.5) is None
+
+
+def test_lookup_of_unknown_or_non_numeric_configuration_returns_none(index):
+    assert index.lookup("Primus", 5, 10, 11.5) is None
+    assert index.lookup("Primus", "wide", 10, 11.5) is None
+    assert index.lookup("Missing", 3.5, 10, 11.5) is None
+
+
+def test_rows_with_non_numeric_dimensions_are_skipped(index):
+    assert len(index) == 4
+    assert index.lookup("Other", 4, 8.5, 10).part_number == "O-1"
+
+
+def test_invalid_drill_stages_are_recorded_but_not_offered(index):
+    record = index.lookup("Primus", 3.5, 10, 13)
+    assert record.invalid_drills == ('Starter Drill',)
+    assert index.offsets("Primus", 3.5, 10) == ["11.5"]
+
+
+def test_compatibility_lists_are_formatted_for_display(index):
+    assert index.implant_lines() == ["Other", "Primus"]
+    assert index.diameters("primus") == ["3.5", "3.75"]
+    assert index.lengths("Primus", "3.50") == ["10.0"]
+    assert index.lengths("Primus", "not a number") == []
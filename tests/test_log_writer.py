@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+import log_writer
+
+
+@pytest.fixture
+def make_writer(tmp_path):
+    writers = []
+
+    def make(**kwargs):
+        writer = log_writer.LogWriter(str(tmp_path), flush_interval=0.01, **kwargs)
+        writers.append(writer)
+        return writer
+
+    yield make
+    for writer in writers:
+        writer.close()
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+def test_files_rotate_before_growing_past_max_bytes(tmp_path, make_writer):
+    writer = make_writer(max_bytes=100, backup_count=3)
+    lines = [f"line {index:02d} " + "x" * 12 for index in range(12)]  # 21 bytes with the newline
+    for line in lines:
+        writer.write("app.log", line)
+    writer.flush()
+
+    path = str(tmp_path / "app.log")
+    files = [path] + [f"{path}.{index}" for index in (1, 2)]
+    assert all(os.path.getsize(name) <= 100 for name in files)
+    assert not os.path.exists(f"{path}.3")
+    # Newest lines are in the live file; backups hold older ones in order and nothing is lost across them
+    assert read_lines(f"{path}.2") + read_lines(f"{path}.1") + read_lines(path) == lines
+
+
+def test_oldest_backup_is_dropped(tmp_path, make_writer):
+    writer = make_writer(max_bytes=30, backup_count=2)
+    for index in range(10):
+        writer.write("app.log", f"message {index:02d} padding")  # 19 bytes each, so one per file
+    writer.flush()
+
+    path = str(tmp_path / "app.log")
+    assert read_lines(path) == ["message 09 padding"]
+    assert read_lines(f"{path}.1") == ["message 08 padding"]
+    assert read_lines(f"{path}.2") == ["message 07 padding"]
+    assert not os.path.exists(f"{path}.3")
+
+
+def test_no_backups_truncates_the_file(tmp_path, make_writer):
+    writer = make_writer(max_bytes=30, backup_count=0)
+    for index in range(3):
+        writer.write("app.log", f"message {index:02d} padding")
+    writer.flush()
+
+    assert os.listdir(tmp_path) == ["app.log"]
+    assert read_lines(str(tmp_path / "app.log")) == ["message 02 padding"]
+
+
+def test_rotation_counts_existing_file_size(tmp_path, make_writer):
+    path = tmp_path / "app.log"
+    path.write_text("x" * 95 + "\n", encoding='utf-8')
+
+    writer = make_writer(max_bytes=100, backup_count=1)
+    writer.write("app.log", "new line")
+    writer.flush()
+
+    assert read_lines(f"{path}.1") == ["x" * 95]
+    assert read_lines(str(path)) == ["new line"]
+
+
+def test_level_threshold_filters_before_queueing(tmp_path, make_writer):
+    writer = make_writer(level="WARN")
+    writer.log("app.log", "debug", "DEBUG")
+    writer.log("app.log", "warning", "WARNING")
+    writer.log("app.log", "error", "ERROR")
+    writer.flush()
+
+    assert read_lines(str(tmp_path / "app.log")) == ["warning", "error"]
@@ -0,0 +1,94 @@
+import pickle
+
+import pytest
+
+from catalog import ImplantRecord
+from plan_store import ImplantPlan, PlanStore
+
+RECORD = ImplantRecord("P-1", "S-1", 20, "Start: 10mm", ())
+
+
+def make_plan(tooth_number, diameter=4.0):
+    return ImplantPlan(tooth_number, "Primus", diameter, 10.0, 11.5, "flapless", RECORD)
+
+
+@pytest.fixture
+def store():
+    store = PlanStore()
+    store.notifications = []
+    store.subscribe(lambda: store.notifications.append(store.teeth()))
+    return store
+
+
+def test_plans_iterate_in_tooth_order(store):
+    for tooth_number in (14, 3, 30, 8):
+        store.set(make_plan(tooth_number))
+
+    assert [plan.tooth_number for plan in store] == [3, 8, 14, 30]
+    assert store.teeth() == [3, 8, 14, 30]
+
+
+def test_every_change_notifies_subscribers(store):
+    assert store.set(make_plan(8)) is False
+    assert store.set(make_plan(8, diameter=4.5)) is True
+    assert store.remove(8) is True
+    assert store.remove(8) is False
+    store.clear()  # Already empty, so not a change
+
+    assert store.notifications == [[8], [8], []]
+    assert store.version == 3
+
+
+def test_batch_updates_notify_once_after_the_outermost_batch(store):
+    with store.batch_updates():
+        store.set(make_plan(3))
+        with store.batch_updates():
+            store.set(make_plan(4))
+            store.set(make_plan(5))
+        assert store.notifications == []
+        store.remove(4)
+
+    assert store.notifications == [[3, 5]]
+    assert store.version == 4
+
+
+def test_batch_without_changes_does_not_notify(store):
+    with store.batch_updates():
+        store.remove(1)
+
+    assert store.notifications == []
+
+
+def test_batch_notifies_even_if_the_body_raises(store):
+    with pytest.raises(RuntimeError):
+        with store.batch_updates():
+            store.set(make_plan(3))
+            raise RuntimeError("stop")
+
+    assert store.notifications == [[3]]
+
+
+def test_unsubscribed_listener_is_not_called(store):
+    calls = []
+
+    def listener():
+        calls.append(True)
+
+    store.subscribe(listener)
+    store.set(make_plan(3))
+    store.unsubscribe(listener)
+    store.unsubscribe(listener)  # Unknown listeners are ignored
+    store.set(make_plan(4))
+
+    assert calls == [True]
+
+
+def test_pickling_keeps_plans_but_not_listeners(store):
+    store.set(make_plan(8))
+    store.set(make_plan(3))
+
+    copy = pickle.loads(pickle.dumps(store))
+    copy.set(make_plan(4))
+
+    assert [plan.tooth_number for plan in copy] == [3, 4, 8]
+    assert store.notifications == [[8], [3, 8]]
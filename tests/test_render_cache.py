@@ -0,0 +1,59 @@
+import os
+
+import render_cache
+from catalog import ImplantRecord
+from plan_store import ImplantPlan
+
+RECORD = ImplantRecord("P-1", "S-1", 20, "Start: 10mm", ())
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = render_cache.RenderCache(max_memory_items=2)
+    cache.put("a", b"A")
+    cache.put("b", b"B")
+    assert cache.get("a") == b"A"  # Now "b" is the least recently used
+    cache.put("c", b"C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"A"
+    assert cache.get("c") == b"C"
+    assert cache.stats() == {'hits': 3, 'misses': 1, 'memory_items': 2, 'disk_items': 0, 'disk_bytes': 0}
+
+
+def test_putting_an_existing_key_refreshes_it():
+    cache = render_cache.RenderCache(max_memory_items=2)
+    cache.put("a", b"A")
+    cache.put("b", b"B")
+    cache.put("a", b"A2")
+    cache.put("c", b"C")
+
+    assert cache.get("a") == b"A2"
+    assert cache.get("b") is None
+
+
+def test_memory_only_cache_writes_nothing_to_disk(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = render_cache.RenderCache()
+    cache.put("a", b"A")
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_purge_disk_cache_removes_old_entries(tmp_path):
+    disk_cache = render_cache.RenderCache(str(tmp_path))
+    disk_cache.put("a", b"A" * 10)
+    assert os.listdir(tmp_path) == ["a.pdf"]
+
+    render_cache.purge_disk_cache(str(tmp_path))
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_render_key_covers_plan_content():
+    plans = [ImplantPlan(8, "Primus", 4.0, 10.0, 11.5, "flapless", RECORD)]
+    changed = [ImplantPlan(8, "Primus", 4.0, 10.0, 11.5, "flap", RECORD)]
+    key = render_cache.make_render_key(plans, "Dr", "Patient", "C-1", "", compact=False)
+
+    assert render_cache.make_render_key(list(plans), "Dr", "Patient", "C-1", "", compact=False) == key
+    assert render_cache.make_render_key(changed, "Dr", "Patient", "C-1", "", compact=False) != key
+    assert render_cache.make_render_key(plans, "Dr", "Patient", "C-1", "", compact=True) != key
@@ -0,0 +1,165 @@
+import hashlib
+import itertools
+import json
+import os
+import random
+
+import pytest
+
+import update_delta
+import update_transfer
+
+
+def make_data(seed, size):
+    return random.Random(seed).randbytes(size)
+
+
+def chunk_hashes(data):
+    return [hashlib.sha256(data[offset:offset + length]).digest()
+            for offset, length in update_delta.chunk_boundaries(data)]
+
+
+def test_chunks_cover_data_within_size_limits():
+    data = make_data(1, 2_000_000)
+    chunks = update_delta.chunk_boundaries(data)
+
+    position = 0
+    for offset, length in chunks:
+        assert offset == position
+        assert length <= update_delta.MAX_CHUNK_SIZE
+        position += length
+    assert position == len(data)
+    assert all(length >= update_delta.MIN_CHUNK_SIZE for _, length in chunks[:-1])
+
+
+def test_boundaries_do_not_depend_on_scan_block_size(monkeypatch):
+    data = make_data(2, 1_000_000)
+    expected = update_delta.chunk_boundaries(data)
+
+    monkeypatch.setattr(update_delta, 'SCAN_BLOCK_SIZE', 65_537)
+    assert update_delta.chunk_boundaries(data) == expected
+
+
+@pytest.mark.parametrize('edit', ['insert', 'delete', 'replace'])
+def test_chunks_survive_edits_that_shift_the_data(edit):
+    data = make_data(3, 2_000_000)
+    position = 300_000
+    if edit == 'insert':
+        changed = data[:position] + make_data(4, 1_234) + data[position:]
+    elif edit == 'delete':
+        changed = data[:position] + data[position + 1_234:]
+    else:
+        changed = data[:position] + make_data(4, 1_234) + data[position + 1_234:]
+
+    before, after = chunk_hashes(data), set(chunk_hashes(changed))
+    reused = sum(1 for digest in before if digest in after)
+    # Only the chunks around the edit change; everything after it is found again despite the shift
+    assert len(before) - reused <= 3
+
+
+def manifest_for(chunks):
+    return {'chunks': [[offset, length, digest] for offset, length, digest in chunks]}
+
+
+def test_plan_delta_merges_adjacent_missing_chunks():
+    chunk_manifest = manifest_for([(0, 10, 'a'), (10, 10, 'b'), (20, 10, 'c'), (30, 10, 'd'), (40, 10, 'e')])
+    local_index = {'a': (100, 10), 'd': (200, 10)}
+
+    assert update_delta.plan_delta(chunk_manifest, local_index) == [
+        ('local', 100, 10),
+        ('remote', 10, 20),
+        ('local', 200, 10),
+        ('remote', 40, 10)
+    ]
+
+
+def test_plan_delta_caps_merged_ranges(monkeypatch):
+    monkeypatch.setattr(update_delta, 'MAX_REMOTE_RUN', 25)
+    chunk_manifest = manifest_for([(offset, 10, str(offset)) for offset in range(0, 60, 10)])
+
+    assert update_delta.plan_delta(chunk_manifest, {}) == [
+        ('remote', 0, 20),
+        ('remote', 20, 20),
+        ('remote', 40, 20)
+    ]
+
+
+def test_validate_chunk_manifest_rejects_gaps():
+    chunk_manifest = {'format': update_delta.CHUNK_MANIFEST_VERSION, 'size': 30, 'sha256': 'ab',
+                      'chunks': [[0, 10, 'a'], [15, 15, 'b']]}
+    with pytest.raises(update_transfer.TransferError):
+        update_delta.validate_chunk_manifest(chunk_manifest, 30, 'ab')
+
+
+@pytest.fixture
+def release(tmp_path):
+    """An installed executable and a newer published one that shares most of its content"""
+    old = make_data(5, 1_500_000)
+    new = old[:200_000] + make_data(6, 5_000) + old[200_000:900_000] + old[950_000:]
+    installed = tmp_path / "installed.exe"
+    published = tmp_path / "published.exe"
+    installed.write_bytes(old)
+    published.write_bytes(new)
+    chunk_manifest = update_delta.build_chunk_manifest(str(published))
+    return installed, published, new, chunk_manifest
+
+
+def test_build_from_delta_round_trip(release, tmp_path):
+    installed, published, new, chunk_manifest = release
+    destination = str(tmp_path / "staged.exe")
+    update_delta.validate_chunk_manifest(chunk_manifest, len(new), hashlib.sha256(new).hexdigest())
+
+    _, fetched = update_delta.build_from_delta(update_transfer.DirectorySource(str(published)), chunk_manifest,
+                                               str(installed), destination)
+
+    with open(destination, 'rb') as f:
+        assert f.read() == new
+    assert 0 < fetched < len(new) // 10
+    assert not os.path.exists(update_delta.delta_part_path(destination))
+
+
+def test_build_from_delta_fetches_capped_ranges_with_progress(release, tmp_path, monkeypatch):
+    installed, published, new, chunk_manifest = release
+    installed.write_bytes(make_data(7, 500_000))  # Nothing in common, so every byte is fetched
+    monkeypatch.setattr(update_delta, 'MAX_REMOTE_RUN', 200_000)
+    fetches = []
+    monkeypatch.setattr(update_delta, '_read_exact',
+                        lambda stream, length: fetches.append(length) or stream.read(length))
+    progress = []
+
+    destination = str(tmp_path / "staged.exe")
+    _, fetched = update_delta.build_from_delta(update_transfer.DirectorySource(str(published)), chunk_manifest,
+                                               str(installed), destination,
+                                               progress_callback=lambda done, total, rate: progress.append(done))
+
+    with open(destination, 'rb') as f:
+        assert f.read() == new
+    assert fetched == len(new) == sum(fetches)
+    assert max(fetches) <= 200_000
+    assert progress == list(itertools.accumulate(fetches))
+
+
+def test_corrupt_source_is_rejected_without_touching_full_download_state(release, tmp_path):
+    installed, published, new, chunk_manifest = release
+    corrupt = bytearray(new)
+    corrupt[202_000] ^= 0xFF
+    published.write_bytes(bytes(corrupt))
+
+    destination = str(tmp_path / "staged.exe")
+    with open(f"{destination}.part", 'wb') as f:
+        f.write(new[:100_000])
+    state = {'size': len(new), 'sha256': chunk_manifest['sha256'], 'offset': 100_000}
+    with open(f"{destination}.part.json", 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+
+    with pytest.raises(update_transfer.TransferError):
+        update_delta.build_from_delta(update_transfer.DirectorySource(str(published)), chunk_manifest,
+                                      str(installed), destination)
+
+    assert not os.path.exists(destination)
+    assert not os.path.exists(update_delta.delta_part_path(destination))
+    with open(f"{destination}.part", 'rb') as f:
+        assert f.read() == new[:100_000]
+    with open(f"{destination}.part.json", 'r', encoding='utf-8') as f:
+        assert json.load(f) == state
+    assert update_transfer.has_partial(destination, len(new), chunk_manifest['sha256'])
@@ -0,0 +1,102 @@
+import json
+import os
+
+import pytest
+
+import update_manifest
+
+
+def make_manifest(version="1.0.6", **fields):
+    manifest = {
+        'version': version,
+        'minimum_version': "1.0.0",
+        'build_date': "2025-08-07T12:00:00",
+        'executable': update_manifest.DEFAULT_EXECUTABLE,
+        'size': 1234,
+        'sha256': "ab" * 32
+    }
+    manifest.update(fields)
+    return manifest
+
+
+@pytest.fixture
+def share(tmp_path):
+    share = tmp_path / "share"
+    share.mkdir()
+    return share
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return update_manifest.ManifestCache(str(tmp_path / "user"))
+
+
+def publish(share, manifest, mtime_ns=None):
+    path = share / update_manifest.MANIFEST_FILENAME
+    path.write_text(json.dumps(manifest), encoding='utf-8')
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def test_first_read_parses_the_share_and_caches_it(share, cache):
+    publish(share, make_manifest())
+
+    assert cache.read(str(share))['version'] == "1.0.6"
+    with open(cache.cache_file, encoding='utf-8') as f:
+        assert json.load(f)['manifest']['version'] == "1.0.6"
+
+
+def test_unchanged_manifest_is_served_from_the_cache(share, cache):
+    publish(share, make_manifest("1.0.6"), mtime_ns=1_700_000_000_000_000_000)
+    cache.read(str(share))
+
+    # Same size and modification time: only the stat of the share is consulted
+    publish(share, make_manifest("1.0.7"), mtime_ns=1_700_000_000_000_000_000)
+
+    assert cache.read(str(share))['version'] == "1.0.6"
+
+
+def test_changed_manifest_is_read_again(share, cache):
+    publish(share, make_manifest("1.0.6"), mtime_ns=1_700_000_000_000_000_000)
+    cache.read(str(share))
+
+    publish(share, make_manifest("1.0.7"), mtime_ns=1_700_000_001_000_000_000)
+
+    assert cache.read(str(share))['version'] == "1.0.7"
+
+
+def test_corrupt_cache_falls_back_to_the_share(share, cache):
+    publish(share, make_manifest())
+    cache.read(str(share))
+    with open(cache.cache_file, 'w', encoding='utf-8') as f:
+        f.write("{truncated")
+
+    assert cache.read(str(share))['version'] == "1.0.6"
+
+
+def test_invalid_cached_manifest_is_replaced(share, cache):
+    path = publish(share, make_manifest())
+    cache.read(str(share))
+    with open(cache.cache_file, encoding='utf-8') as f:
+        cached = json.load(f)
+    cached['manifest']['size'] = "large"
+    update_manifest.write_manifest(cached, cache.cache_file)
+
+    assert cache.read(str(share))['size'] == 1234
+    with open(cache.cache_file, encoding='utf-8') as f:
+        assert json.load(f)['source']['size'] == os.path.getsize(path)
+
+
+def test_missing_manifest_raises_file_not_found(share, cache):
+    with pytest.raises(FileNotFoundError):
+        cache.read(str(share))
+
+
+@pytest.mark.parametrize('content', ["not json", json.dumps(make_manifest(version="one"))])
+def test_invalid_manifest_raises_manifest_error(share, cache, content):
+    (share / update_manifest.MANIFEST_FILENAME).write_text(content, encoding='utf-8')
+
+    with pytest.raises(update_manifest.ManifestError):
+        cache.read(str(share))
+    assert not os.path.exists(cache.cache_file)
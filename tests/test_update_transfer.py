@@ -0,0 +1,186 @@
+import hashlib
+import http.server
+import io
+import json
+import os
+import threading
+
+import pytest
+
+import update_transfer
+
+
+PAYLOAD = os.urandom(300_000)
+PAYLOAD_SHA256 = hashlib.sha256(PAYLOAD).hexdigest()
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    """Serves PAYLOAD, honouring single open-ended Range requests unless the server says otherwise"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(PAYLOAD)))
+        self.end_headers()
+
+    def do_GET(self):
+        range_header = self.headers.get('Range')
+        self.server.ranges.append(range_header)
+        if range_header and self.server.honour_range:
+            start = int(range_header.split('=')[1].rstrip('-'))
+            body = PAYLOAD[start:]
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{len(PAYLOAD) - 1}/{len(PAYLOAD)}")
+        else:
+            body = PAYLOAD
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+    httpd.ranges = []
+    httpd.honour_range = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def url_for(httpd):
+    return f"http://127.0.0.1:{httpd.server_address[1]}/update.exe"
+
+
+def write_partial(destination, offset):
+    """Leave a partial download of the first offset bytes, as an interrupted transfer would"""
+    with open(f"{destination}.part", 'wb') as f:
+        f.write(PAYLOAD[:offset])
+    with open(f"{destination}.part.json", 'w', encoding='utf-8') as f:
+        json.dump({'size': len(PAYLOAD), 'sha256': PAYLOAD_SHA256, 'offset': offset}, f)
+
+
+def test_http_source_reports_size(server):
+    assert update_transfer.open_source(url_for(server)).size() == len(PAYLOAD)
+
+
+def test_resumes_from_recorded_offset(server, tmp_path):
+    destination = str(tmp_path / "update.exe")
+    write_partial(destination, 100_000)
+    progress = []
+
+    update_transfer.download(update_transfer.open_source(url_for(server)), destination, len(PAYLOAD),
+                             PAYLOAD_SHA256, progress_callback=lambda done, total, rate: progress.append(done),
+                             chunk_size=64 * 1024)
+
+    assert server.ranges == ["bytes=100000-"]
+    assert progress[0] > 100_000 and progress[-1] == len(PAYLOAD)
+    with open(destination, 'rb') as f:
+        assert f.read() == PAYLOAD
+    assert not os.path.exists(f"{destination}.part")
+    assert not os.path.exists(f"{destination}.part.json")
+
+
+def test_resume_skips_ahead_when_server_ignores_range(server, tmp_path):
+    server.honour_range = False
+    destination = str(tmp_path / "update.exe")
+    write_partial(destination, 100_000)
+
+    update_transfer.download(update_transfer.open_source(url_for(server)), destination, len(PAYLOAD),
+                             PAYLOAD_SHA256, chunk_size=64 * 1024)
+
+    assert server.ranges == ["bytes=100000-"]
+    with open(destination, 'rb') as f:
+        assert f.read() == PAYLOAD
+
+
+def test_stale_state_for_another_file_starts_over(server, tmp_path):
+    destination = str(tmp_path / "update.exe")
+    write_partial(destination, 100_000)
+    with open(f"{destination}.part.json", 'w', encoding='utf-8') as f:
+        json.dump({'size': len(PAYLOAD), 'sha256': '0' * 64, 'offset': 100_000}, f)
+
+    update_transfer.download(update_transfer.open_source(url_for(server)), destination, len(PAYLOAD),
+                             PAYLOAD_SHA256)
+
+    assert server.ranges == [None]
+    with open(destination, 'rb') as f:
+        assert f.read() == PAYLOAD
+
+
+def test_hash_mismatch_discards_partial(server, tmp_path):
+    destination = str(tmp_path / "update.exe")
+
+    with pytest.raises(update_transfer.TransferError):
+        update_transfer.download(update_transfer.open_source(url_for(server)), destination, len(PAYLOAD),
+                                 hashlib.sha256(b"something else").hexdigest())
+
+    assert not os.path.exists(destination)
+    assert not os.path.exists(f"{destination}.part")
+    assert not os.path.exists(f"{destination}.part.json")
+
+
+class FlakySource:
+    """Directory-like source whose first stream drops after a number of bytes"""
+
+    def __init__(self, drop_after):
+        self.drop_after = drop_after
+        self.offsets = []
+
+    def open(self, offset):
+        self.offsets.append(offset)
+        stream = io.BytesIO(PAYLOAD)
+        stream.seek(offset)
+        if len(self.offsets) > 1:
+            return stream
+
+        remaining = [self.drop_after]
+
+        class Dropping:
+            def read(self, size):
+                if remaining[0] <= 0:
+                    raise ConnectionResetError("link dropped")
+                block = stream.read(min(size, remaining[0]))
+                remaining[0] -= len(block)
+                return block
+
+            def close(self):
+                pass
+
+        return Dropping()
+
+
+def test_reconnects_from_verified_offset_after_drop(tmp_path):
+    destination = str(tmp_path / "update.exe")
+    source = FlakySource(drop_after=128 * 1024)
+
+    update_transfer.download(source, destination, len(PAYLOAD), PAYLOAD_SHA256, chunk_size=64 * 1024,
+                             retry_delay=0)
+
+    assert source.offsets == [0, 128 * 1024]
+    with open(destination, 'rb') as f:
+        assert f.read() == PAYLOAD
+
+
+def test_cancel_keeps_partial_for_resume(tmp_path):
+    destination = str(tmp_path / "update.exe")
+    cancel_event = threading.Event()
+
+    def cancel_after_first_block(done, total, rate):
+        cancel_event.set()
+
+    source_path = tmp_path / "source.exe"
+    source_path.write_bytes(PAYLOAD)
+
+    with pytest.raises(update_transfer.TransferCancelled):
+        update_transfer.download(update_transfer.open_source(str(source_path)), destination, len(PAYLOAD),
+                                 PAYLOAD_SHA256, progress_callback=cancel_after_first_block,
+                                 cancel_event=cancel_event, chunk_size=64 * 1024)
+
+    with open(f"{destination}.part.json", 'r', encoding='utf-8') as f:
+        assert json.load(f)['offset'] == 64 * 1024
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+import versioned_install
+
+
+@pytest.fixture
+def install(tmp_path):
+    return versioned_install.VersionedInstall(str(tmp_path))
+
+
+def stage(install, version, content):
+    path = install.stage_path(version)
+    with open(path, 'wb') as f:
+        f.write(content)
+    return path
+
+
+def test_activate_adopts_running_executable_with_a_hard_link(install, tmp_path):
+    legacy = tmp_path / "Primus Implant Report Generator.exe"
+    legacy.write_bytes(b"old")
+    stage(install, "1.0.6", b"new")
+
+    current = install.activate("1.0.6", "1.0.5", str(legacy), hashlib.sha256(b"new").hexdigest())
+
+    assert current == {'version': "1.0.6", 'path': install.executable_path("1.0.6")}
+    assert install.previous() == {'version': "1.0.5", 'path': install.executable_path("1.0.5")}
+    assert os.path.samefile(str(legacy), install.executable_path("1.0.5"))
+
+
+def test_activate_rejects_hash_mismatch_without_switching(install, tmp_path):
+    legacy = tmp_path / "app.exe"
+    legacy.write_bytes(b"old")
+    stage(install, "1.0.6", b"tampered")
+
+    with pytest.raises(versioned_install.InstallError):
+        install.activate("1.0.6", "1.0.5", str(legacy), hashlib.sha256(b"new").hexdigest())
+
+    assert install.current() is None
+    assert not os.path.exists(install.version_dir("1.0.6"))
+
+
+def test_rollback_swaps_current_and_previous(install):
+    stage(install, "1.0.5", b"old")
+    stage(install, "1.0.6", b"new")
+    install.activate("1.0.6", "1.0.5", install.executable_path("1.0.5"))
+
+    restored = install.rollback()
+
+    assert restored['version'] == "1.0.5"
+    assert install.current()['version'] == "1.0.5"
+    assert install.previous()['version'] == "1.0.6"
+    assert install.launch_target(install.executable_path("1.0.6")) == install.executable_path("1.0.5")
+
+
+def test_prune_without_pointer_keeps_running_newer_and_resumable_versions(install):
+    for version in ("1.0.3", "1.0.4", "1.0.5", "1.0.6"):
+        os.makedirs(install.version_dir(version))
+    # An interrupted download of the next release
+    with open(os.path.join(install.version_dir("1.0.6"), "app.exe.part.json"), 'w', encoding='utf-8') as f:
+        json.dump({'offset': 1}, f)
+
+    removed = install.prune("1.0.5")
+
+    assert sorted(os.path.basename(path) for path in removed) == ["1.0.3", "1.0.4"]
+    assert sorted(os.listdir(install.versions_dir)) == ["1.0.5", "1.0.6"]
+
+
+def test_prune_keeps_rollback_target(install):
+    stage(install, "1.0.4", b"older")
+    stage(install, "1.0.5", b"old")
+    stage(install, "1.0.6", b"new")
+    install.activate("1.0.6", "1.0.5", install.executable_path("1.0.5"))
+
+    install.prune("1.0.6")
+
+    assert sorted(os.listdir(install.versions_dir)) == ["1.0.5", "1.0.6"]
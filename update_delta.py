@@ -0,0 +1,322 @@
+"""Delta updates built from content-defined chunks of the installed executable.
+
+Most of a PyInstaller one-file executable (the bundled pandas, reportlab and
+customtkinter payload) is byte-identical between releases, but it moves
+around as the rest of the archive changes. Both sides therefore cut the
+executable at content-defined boundaries: a rolling gear hash over the last
+32 bytes, cutting wherever its top bits are zero. Unchanged regions produce
+the same chunks no matter where they sit in the file.
+
+The publisher writes a chunk manifest (offset, length and SHA-256 of every
+chunk of the new executable) next to it on the share. The client chunks its
+own executable the same way, copies every chunk it already has, and fetches
+only the missing byte ranges from the published executable. The rebuilt
+file is verified against the full SHA-256 before it is swapped in.
+
+Usage (deployment)::
+
+    python update_delta.py --exe "dist\\App.exe" --output update_chunks.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import update_transfer
+
+if TYPE_CHECKING:
+    import numpy as np
+
+CHUNK_MANIFEST_FILENAME = "update_chunks.json"
+CHUNK_MANIFEST_VERSION = 1
+
+MIN_CHUNK_SIZE = 4 * 1024
+MAX_CHUNK_SIZE = 64 * 1024
+BOUNDARY_BITS = 14  # Average chunk size of about 2**14 = 16 KB above the minimum
+SCAN_BLOCK_SIZE = 8 * 1024 * 1024  # Bytes hashed per numpy pass
+WINDOW = 32  # Bytes that influence the rolling hash at each position
+MAX_REMOTE_RUN = 4 * 1024 * 1024  # Largest merged range fetched (and held in memory) per request
+
+# Gear table derived from SHA-256 so that publisher and clients always agree on it
+GEAR: List[int] = [int.from_bytes(hashlib.sha256(bytes([value])).digest()[:4], 'little') for value in range(256)]
+
+
+def find_boundary_candidates(data: bytes) -> "np.ndarray":
+    """Return the positions after which the rolling gear hash allows a cut"""
+    import numpy as np
+
+    gear = np.array(GEAR, dtype=np.uint32)
+    boundary_mask = np.uint32(((1 << BOUNDARY_BITS) - 1) << (32 - BOUNDARY_BITS))
+    view = np.frombuffer(data, dtype=np.uint8)
+    candidates = []
+
+    for start in range(0, len(view), SCAN_BLOCK_SIZE):
+        # Include the preceding window so hashes at the block start see their full context
+        context = min(start, WINDOW - 1)
+        block = view[start - context:start + SCAN_BLOCK_SIZE]
+
+        # h[i] = sum(gear[b[i - k]] << k for k in 0..31), built by doubling in five passes
+        hashes = gear[block]
+        span = 1
+        while span < WINDOW:
+            shifted = np.zeros_like(hashes)
+            shifted[span:] = hashes[:-span] << np.uint32(span)
+            hashes += shifted
+            span *= 2
+
+        positions = np.flatnonzero((hashes & boundary_mask) == 0)
+        positions = positions[positions >= context]
+        candidates.append(positions + (start - context))
+
+    return np.concatenate(candidates) if candidates else np.zeros(0, dtype=np.int64)
+
+
+def chunk_boundaries(data: bytes) -> List[Tuple[int, int]]:
+    """Split data into content-defined (offset, length) chunks within the size limits"""
+    import numpy as np
+
+    candidates = find_boundary_candidates(data)
+    chunks: List[Tuple[int, int]] = []
+    offset = 0
+    size = len(data)
+
+    while offset < size:
+        # First candidate cut at least MIN_CHUNK_SIZE in, capped at MAX_CHUNK_SIZE
+        index = np.searchsorted(candidates, offset + MIN_CHUNK_SIZE - 1)
+        end = int(candidates[index]) + 1 if index < len(candidates) else size
+        end = min(end, offset + MAX_CHUNK_SIZE, size)
+        chunks.append((offset, end - offset))
+        offset = end
+
+    return chunks
+
+
+def build_chunk_manifest(exe_path: str) -> Dict[str, Any]:
+    """Chunk an executable and describe every chunk"""
+    with open(exe_path, 'rb') as f:
+        data = f.read()
+
+    return {
+        'format': CHUNK_MANIFEST_VERSION,
+        'size': len(data),
+        'sha256': hashlib.sha256(data).hexdigest(),
+        'chunks': [[offset, length, hashlib.sha256(data[offset:offset + length]).hexdigest()]
+                   for offset, length in chunk_boundaries(data)]
+    }
+
+
+def index_local_chunks(path: str) -> Tuple[bytes, Dict[str, Tuple[int, int]]]:
+    """Read a local executable and map each of its chunks' SHA-256 to (offset, length)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    index: Dict[str, Tuple[int, int]] = {}
+    for offset, length in chunk_boundaries(data):
+        index.setdefault(hashlib.sha256(data[offset:offset + length]).hexdigest(), (offset, length))
+    return data, index
+
+
+def plan_delta(chunk_manifest: Dict[str, Any], local_index: Dict[str, Tuple[int, int]]) -> List[Tuple[str, int, int]]:
+    """Turn a chunk manifest into copy steps: ('local', offset, length) or ('remote', offset, length).
+
+    Adjacent remote chunks are merged into ranges of up to MAX_REMOTE_RUN
+    bytes, so a missing run takes few requests without being read into
+    memory all at once.
+    """
+    steps: List[Tuple[str, int, int]] = []
+    for offset, length, digest in chunk_manifest['chunks']:
+        local = local_index.get(digest)
+        if local is not None:
+            steps.append(('local', local[0], length))
+        elif (steps and steps[-1][0] == 'remote' and steps[-1][1] + steps[-1][2] == offset
+              and steps[-1][2] + length <= MAX_REMOTE_RUN):
+            steps[-1] = ('remote', steps[-1][1], steps[-1][2] + length)
+        else:
+            steps.append(('remote', offset, length))
+    return steps
+
+
+def chunk_manifest_location(update_path: str) -> str:
+    """Return where the chunk manifest for the executable at update_path is published"""
+    if update_path.lower().startswith(('http://', 'https://')):
+        from urllib.parse import urljoin
+
+        return urljoin(update_path, CHUNK_MANIFEST_FILENAME)
+    return os.path.join(os.path.dirname(update_path), CHUNK_MANIFEST_FILENAME)
+
+
+def validate_chunk_manifest(chunk_manifest: Any, expected_size: int, expected_sha256: str) -> Dict[str, Any]:
+    """Check that a chunk manifest describes the expected executable, raising TransferError if not"""
+    if not isinstance(chunk_manifest, dict) or chunk_manifest.get('format') != CHUNK_MANIFEST_VERSION:
+        raise update_transfer.TransferError("Unsupported chunk manifest")
+    if chunk_manifest.get('size') != expected_size or str(chunk_manifest.get('sha256')).lower() != expected_sha256:
+        raise update_transfer.TransferError("Chunk manifest does not describe the published executable")
+
+    position = 0
+    for offset, length, _ in chunk_manifest.get('chunks', []):
+        if offset != position or length <= 0:
+            raise update_transfer.TransferError("Chunk manifest has gaps or overlapping chunks")
+        position += length
+    if position != expected_size:
+        raise update_transfer.TransferError("Chunk manifest does not cover the whole executable")
+    return chunk_manifest
+
+
+def read_chunk_manifest(location: str, expected_size: int, expected_sha256: str) -> Dict[str, Any]:
+    """Read and validate the chunk manifest at a file path or URL"""
+    try:
+        if location.lower().startswith(('http://', 'https://')):
+            import urllib.request
+
+            with urllib.request.urlopen(location, timeout=update_transfer.HTTP_TIMEOUT) as response:
+                chunk_manifest = json.loads(response.read().decode('utf-8'))
+        else:
+            with open(location, 'r', encoding='utf-8') as f:
+                chunk_manifest = json.load(f)
+    except ValueError as e:
+        raise update_transfer.TransferError(f"Chunk manifest is not valid JSON: {e}")
+
+    return validate_chunk_manifest(chunk_manifest, expected_size, expected_sha256.lower())
+
+
+def _read_exact(stream: Any, length: int) -> bytes:
+    parts = []
+    while length:
+        block = stream.read(min(update_transfer.CHUNK_SIZE, length))
+        if not block:
+            raise update_transfer.TransferError("Update file is smaller than its chunk manifest")
+        parts.append(block)
+        length -= len(block)
+    return b''.join(parts)
+
+
+def delta_part_path(destination: str) -> str:
+    """Return the temporary file a delta build of destination is written to"""
+    return f"{destination}.delta.part"
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def build_from_delta(source, chunk_manifest: Dict[str, Any], current_exe: str, destination: str,
+                     progress_callback: Optional[update_transfer.ProgressCallback] = None,
+                     cancel_event: Optional[threading.Event] = None,
+                     max_retries: int = update_transfer.MAX_RETRIES,
+                     retry_delay: float = update_transfer.RETRY_DELAY) -> Tuple[str, int]:
+    """Rebuild the new executable from local chunks of current_exe plus missing ranges fetched from source.
+
+    Every fetched range is checked against its chunk hashes and the result
+    against the full SHA-256 before it is renamed to destination. The file is
+    built under its own temporary name, so the .part file and resume state of
+    an earlier full download of destination are left alone. Returns
+    (destination, bytes fetched from source).
+    """
+    expected_size = chunk_manifest['size']
+    expected_sha256 = chunk_manifest['sha256'].lower()
+    chunk_hashes = {offset: digest for offset, _, digest in chunk_manifest['chunks']}
+    chunk_lengths = {offset: length for offset, length, _ in chunk_manifest['chunks']}
+
+    local_data, local_index = index_local_chunks(current_exe)
+    steps = plan_delta(chunk_manifest, local_index)
+
+    part_path = delta_part_path(destination)
+    digest = hashlib.sha256()
+    done = fetched = 0
+    start_time = time.perf_counter()
+
+    try:
+        with open(part_path, 'wb') as part:
+            for kind, offset, length in steps:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise update_transfer.TransferCancelled("Update download cancelled")
+
+                if kind == 'local':
+                    block = local_data[offset:offset + length]
+                else:
+                    block = _fetch_range(source, offset, length, max_retries, retry_delay, cancel_event)
+                    # Verify each fetched chunk so a bad range is reported where it happened
+                    position = offset
+                    while position < offset + length:
+                        chunk_length = chunk_lengths[position]
+                        chunk = block[position - offset:position - offset + chunk_length]
+                        if hashlib.sha256(chunk).hexdigest() != chunk_hashes[position]:
+                            raise update_transfer.TransferError(f"Fetched chunk at offset {position} failed verification")
+                        position += chunk_length
+                    fetched += length
+
+                part.write(block)
+                digest.update(block)
+                done += length
+
+                if progress_callback is not None:
+                    elapsed = time.perf_counter() - start_time
+                    progress_callback(done, expected_size, fetched / elapsed if elapsed > 0 else 0.0)
+
+            part.flush()
+            os.fsync(part.fileno())
+    except BaseException:
+        # Nothing is resumable here; the next attempt rebuilds from local chunks again
+        _remove(part_path)
+        raise
+
+    if done != expected_size or digest.hexdigest() != expected_sha256:
+        _remove(part_path)
+        raise update_transfer.TransferError("Rebuilt update does not match the published SHA-256; it has been discarded")
+
+    os.replace(part_path, destination)
+    return destination, fetched
+
+
+def _fetch_range(source, offset: int, length: int, max_retries: int, retry_delay: float,
+                 cancel_event: Optional[threading.Event]) -> bytes:
+    """Read one byte range from the source, reconnecting on dropped connections"""
+    retries = 0
+    while True:
+        try:
+            stream = source.open(offset)
+            try:
+                return _read_exact(stream, length)
+            finally:
+                stream.close()
+        except update_transfer.RETRYABLE_ERRORS as e:
+            retries = update_transfer._retry_or_raise(e, retries, max_retries, retry_delay, cancel_event)
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser used by deploy_update.bat"""
+    parser = argparse.ArgumentParser(description="Write the delta-update chunk manifest for a built executable.")
+    parser.add_argument('--exe', required=True, help="Built executable to chunk")
+    parser.add_argument('--output', required=True, help="Chunk manifest file to write")
+    parser.add_argument('--compare', metavar='OLD_EXE',
+                        help="Also report how much of the new executable a client running OLD_EXE would fetch")
+    return parser
+
+
+def main(argv: List[str]) -> int:
+    args = build_arg_parser().parse_args(argv)
+
+    chunk_manifest = build_chunk_manifest(args.exe)
+    temp_path = f"{args.output}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(chunk_manifest, f, separators=(',', ':'))
+    os.replace(temp_path, args.output)
+    print(f"Wrote {args.output}: {len(chunk_manifest['chunks'])} chunks, {chunk_manifest['size']} bytes")
+
+    if args.compare:
+        _, local_index = index_local_chunks(args.compare)
+        remote = sum(length for kind, _, length in plan_delta(chunk_manifest, local_index) if kind == 'remote')
+        print(f"A client running {args.compare} would fetch {remote} of {chunk_manifest['size']} bytes "
+              f"({remote / max(chunk_manifest['size'], 1):.1%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,213 @@
+"""Update manifest published next to the update executable.
+
+deploy_update.bat writes update_manifest.json with the version, build date,
+size and SHA-256 of the executable and the oldest version that may update to
+it automatically. Clients read that one small file instead of listing the
+share and comparing modification times, and keep a local copy that is only
+re-read when the manifest's size or modification time changes.
+
+Usage (deployment)::
+
+    python update_manifest.py --exe "dist\\App.exe" --version 1.0.5 --minimum-version 1.0.0 --output manifest.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+MANIFEST_FILENAME = "update_manifest.json"
+MANIFEST_CACHE_FILENAME = "update_manifest_cache.json"
+DEFAULT_EXECUTABLE = "Primus Implant Report Generator.exe"
+
+REQUIRED_FILES: List[str] = [
+    DEFAULT_EXECUTABLE,
+    "Primus Implant List - Primus Implant List.csv",
+    "inosys_logo.png",
+    "icon.ico"
+]
+
+# Manifest fields and their expected types
+MANIFEST_FIELDS: Dict[str, type] = {
+    'version': str,
+    'minimum_version': str,
+    'build_date': str,
+    'executable': str,
+    'size': int,
+    'sha256': str
+}
+
+
+class ManifestError(Exception):
+    """Raised when an update manifest is missing fields or malformed"""
+
+
+def parse_version(version: str) -> Tuple[int, ...]:
+    """Parse an x.y.z version string, raising ValueError if it is not numeric"""
+    return tuple(int(part) for part in str(version).strip().split('.'))
+
+
+def is_newer_version(version1: str, version2: str) -> bool:
+    """Compare two version strings (e.g., '1.0.2' vs '1.0.1')"""
+    try:
+        v1_parts = list(parse_version(version1))
+        v2_parts = list(parse_version(version2))
+    except ValueError:
+        return False
+
+    # Pad shorter version with zeros
+    max_len = max(len(v1_parts), len(v2_parts))
+    v1_parts.extend([0] * (max_len - len(v1_parts)))
+    v2_parts.extend([0] * (max_len - len(v2_parts)))
+    return v1_parts > v2_parts
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(exe_path: str, version: str, minimum_version: str, executable: str = DEFAULT_EXECUTABLE,
+                   build_date: Optional[str] = None) -> Dict[str, Any]:
+    """Describe an update executable"""
+    return {
+        'version': version,
+        'minimum_version': minimum_version,
+        'build_date': build_date or datetime.now().isoformat(timespec='seconds'),
+        'executable': executable,
+        'size': os.path.getsize(exe_path),
+        'sha256': file_sha256(exe_path),
+        'required_files': REQUIRED_FILES
+    }
+
+
+def validate_manifest(manifest: Any) -> Dict[str, Any]:
+    """Check that a manifest has every field with the right type, returning it"""
+    if not isinstance(manifest, dict):
+        raise ManifestError("Manifest must be a JSON object")
+
+    for field, field_type in MANIFEST_FIELDS.items():
+        if not isinstance(manifest.get(field), field_type):
+            raise ManifestError(f"Manifest field '{field}' is missing or not a {field_type.__name__}")
+
+    for field in ('version', 'minimum_version'):
+        try:
+            parse_version(manifest[field])
+        except ValueError:
+            raise ManifestError(f"Manifest field '{field}' is not a version number: {manifest[field]}")
+
+    return manifest
+
+
+def write_manifest(manifest: Dict[str, Any], path: str) -> None:
+    """Write a manifest atomically, so clients never read a half-written file"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def check_manifest(manifest: Dict[str, Any], current_version: str) -> str:
+    """Compare a manifest with the running version.
+
+    Returns "update_available", "up_to_date", or "unsupported" when the
+    running version is older than the manifest's minimum version.
+    """
+    if not is_newer_version(manifest['version'], current_version):
+        return "up_to_date"
+    if is_newer_version(manifest['minimum_version'], current_version):
+        return "unsupported"
+    return "update_available"
+
+
+class ManifestCache:
+    """Local copy of the share's manifest, re-read only when the manifest file changes"""
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_file: str = os.path.join(cache_dir, MANIFEST_CACHE_FILENAME)
+        self._lock = threading.Lock()
+
+    def read(self, share_path: str) -> Dict[str, Any]:
+        """Return the manifest published in share_path.
+
+        Raises FileNotFoundError if there is none and ManifestError if it is
+        invalid. Costs one stat of the share when the cached copy is current.
+        """
+        manifest_path = os.path.join(share_path, MANIFEST_FILENAME)
+        stat = os.stat(manifest_path)
+        source = {'path': manifest_path, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+        with self._lock:
+            cached = self._load()
+            if cached.get('source') == source:
+                try:
+                    return validate_manifest(cached.get('manifest'))
+                except ManifestError:
+                    pass  # Fall through and re-read the share
+
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except ValueError as e:
+            raise ManifestError(f"Manifest is not valid JSON: {e}")
+        manifest = validate_manifest(data)
+
+        with self._lock:
+            self._save({'source': source, 'manifest': manifest})
+        return manifest
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if isinstance(cached, dict):
+                return cached
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save(self, cached: Dict[str, Any]) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            write_manifest(cached, self.cache_file)
+        except OSError as e:
+            print(f"Failed to cache update manifest: {e}")
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser used by deploy_update.bat"""
+    parser = argparse.ArgumentParser(description="Write the update manifest for a built executable.")
+    parser.add_argument('--exe', required=True, help="Built executable to describe")
+    parser.add_argument('--version', required=True, help="Version of the executable")
+    parser.add_argument('--minimum-version', required=True,
+                        help="Oldest installed version that may update to this one automatically")
+    parser.add_argument('--executable', default=DEFAULT_EXECUTABLE,
+                        help="File name the executable is published under on the share")
+    parser.add_argument('--output', required=True, help="Manifest file to write")
+    return parser
+
+
+def main(argv: List[str]) -> int:
+    args = build_arg_parser().parse_args(argv)
+    for version in (args.version, args.minimum_version):
+        try:
+            parse_version(version)
+        except ValueError:
+            print(f"Not a version number: {version}")
+            return 1
+
+    manifest = build_manifest(args.exe, args.version, args.minimum_version, args.executable)
+    write_manifest(manifest, args.output)
+    print(f"Wrote {args.output}: version {manifest['version']}, {manifest['size']} bytes, sha256 {manifest['sha256']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,146 @@
+"""Discovery of the update share without blocking the UI.
+
+Probing a UNC path with os.path.exists can hang for 20-60 seconds when its
+server is unreachable, e.g. on a laptop off the VPN. Probes here run on daemon
+threads with a hard timeout, and the chosen path and whether it was reachable
+are cached in the user directory for a limited time, so startup and update
+checks read the cache instead of touching the share.
+"""
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+# Update locations, in order of preference
+NETWORK_UPDATE_PATH = r"\\CDIMANQ30\Creoman-Active\CADCAM\Software\Primus Implant Report Generator\UserUpdates"
+LOCAL_UPDATE_PATH = r"C:\Shared\PrimusUpdates"
+
+UPDATE_SHARE_CACHE_FILENAME = "update_share.json"
+PROBE_TIMEOUT = 3.0  # Seconds to wait for a single path probe
+REACHABILITY_TTL = 15 * 60  # Seconds a probe result is trusted
+
+# Probes that have not finished yet, so a hung path is not probed by a second thread
+_probes: Dict[str, threading.Thread] = {}
+_probe_results: Dict[str, bool] = {}
+_probe_lock = threading.Lock()
+
+
+def path_exists(path: str, timeout: float = PROBE_TIMEOUT) -> Optional[bool]:
+    """Check whether a path exists, giving up after timeout seconds.
+
+    Returns None on timeout; the probe keeps running in the background and a
+    later call for the same path waits on it instead of starting another.
+    """
+    with _probe_lock:
+        thread = _probes.get(path)
+        if thread is None:
+            def probe() -> None:
+                exists = os.path.exists(path)
+                with _probe_lock:
+                    _probe_results[path] = exists
+                    _probes.pop(path, None)
+
+            _probe_results.pop(path, None)
+            thread = threading.Thread(target=probe, name="UpdateShareProbe", daemon=True)
+            _probes[path] = thread
+            thread.start()
+
+    thread.join(timeout)
+    with _probe_lock:
+        return _probe_results.get(path) if path not in _probes else None
+
+
+class UpdateShare:
+    """The update location in use, with its reachability cached on disk"""
+
+    def __init__(self, cache_dir: str, candidates: Sequence[str] = (NETWORK_UPDATE_PATH, LOCAL_UPDATE_PATH),
+                 ttl: float = REACHABILITY_TTL, timeout: float = PROBE_TIMEOUT) -> None:
+        self.cache_file: str = os.path.join(cache_dir, UPDATE_SHARE_CACHE_FILENAME)
+        self.candidates: Tuple[str, ...] = tuple(candidates)
+        # Final fallback: updates subfolder of the user directory
+        self.fallback_path: str = os.path.join(cache_dir, 'updates')
+        self.ttl: float = ttl
+        self.timeout: float = timeout
+        self._lock = threading.Lock()
+        self._status: Dict[str, Any] = self._load_status()
+
+    @property
+    def path(self) -> str:
+        """The last chosen update path (never blocks)"""
+        with self._lock:
+            return self._status.get('path') or self.fallback_path
+
+    @property
+    def reachable(self) -> bool:
+        """Whether the last probe found the update path (never blocks)"""
+        with self._lock:
+            return bool(self._status.get('reachable'))
+
+    def is_fresh(self) -> bool:
+        """Check whether the cached result is recent enough to trust"""
+        with self._lock:
+            checked_at = self._status.get('checked_at') or 0
+        return 0 <= time.time() - checked_at < self.ttl
+
+    def status(self) -> Dict[str, Any]:
+        """Return the cached path, reachability and check time"""
+        with self._lock:
+            return dict(self._status)
+
+    def resolve(self, refresh: bool = False) -> Tuple[str, bool]:
+        """Return (path, reachable), probing the candidates only when the cache is stale or refresh is set.
+
+        Each probe is bounded by the timeout, but several may run in turn, so
+        call this from a worker thread rather than the UI thread.
+        """
+        if not refresh and self.is_fresh():
+            with self._lock:
+                return self._status.get('path') or self.fallback_path, bool(self._status.get('reachable'))
+
+        path, reachable = self.fallback_path, False
+        for candidate in self.candidates:
+            if path_exists(candidate, self.timeout):
+                path, reachable = candidate, True
+                break
+        else:
+            reachable = os.path.exists(self.fallback_path)  # Local directory, safe to check directly
+
+        with self._lock:
+            self._status = {'path': path, 'reachable': reachable, 'checked_at': time.time()}
+            status = dict(self._status)
+        self._save_status(status)
+        return path, reachable
+
+    def refresh_in_background(self, callback: Optional[Callable[[str, bool], None]] = None) -> threading.Thread:
+        """Probe the candidates on a daemon thread, calling callback(path, reachable) from it when done"""
+        def worker() -> None:
+            try:
+                path, reachable = self.resolve(refresh=True)
+            except Exception as e:
+                print(f"Update share probe failed: {e}")
+                return
+            if callback is not None:
+                callback(path, reachable)
+
+        thread = threading.Thread(target=worker, name="UpdateShareRefresh", daemon=True)
+        thread.start()
+        return thread
+
+    def _load_status(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                status = json.load(f)
+            if isinstance(status, dict):
+                return status
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save_status(self, status: Dict[str, Any]) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(status, f, indent=2)
+        except OSError as e:
+            print(f"Failed to save update share status: {e}")
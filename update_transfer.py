@@ -0,0 +1,237 @@
+"""Chunked, resumable and hash-verified download of the update executable.
+
+The executable is streamed in large blocks into a .part file next to the
+destination while its SHA-256 is computed incrementally. After every block
+the verified offset is recorded in a small state file, so an interrupted
+transfer (a dropped Wi-Fi connection, the app being closed) resumes from
+there instead of starting over. The .part file is only renamed into place
+once its size and hash match the update manifest.
+
+Sources are a plain directory path (the update share) or an http(s):// URL
+served with Range request support.
+"""
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.request
+from typing import BinaryIO, Callable, Optional
+
+CHUNK_SIZE = 4 * 1024 * 1024  # Bytes read per block
+MAX_RETRIES = 3  # Reconnect attempts after a read error before giving up
+RETRY_DELAY = 2.0  # Seconds before the first reconnect, doubled on each further attempt
+HTTP_TIMEOUT = 30.0  # Seconds to wait for an HTTP response or block
+
+ProgressCallback = Callable[[int, int, float], None]  # (bytes done, total bytes, bytes per second)
+
+# Errors that mean the connection dropped and the transfer should reconnect (URLError is an OSError)
+RETRYABLE_ERRORS = (OSError, http.client.HTTPException)
+
+
+class TransferError(Exception):
+    """Raised when an update cannot be downloaded or fails verification"""
+
+
+class TransferCancelled(TransferError):
+    """Raised when a transfer is cancelled; the partial download is kept for resuming"""
+
+
+class DirectorySource:
+    """Update executable on a local or network file system path"""
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+
+    def __str__(self) -> str:
+        return self.path
+
+    def size(self) -> int:
+        return os.path.getsize(self.path)
+
+    def open(self, offset: int) -> BinaryIO:
+        """Open the source positioned at offset"""
+        f = open(self.path, 'rb')
+        f.seek(offset)
+        return f
+
+
+class HttpSource:
+    """Update executable served over HTTP(S); resuming needs Range request support"""
+
+    def __init__(self, url: str, timeout: float = HTTP_TIMEOUT) -> None:
+        self.url: str = url
+        self.timeout: float = timeout
+
+    def __str__(self) -> str:
+        return self.url
+
+    def size(self) -> int:
+        request = urllib.request.Request(self.url, method='HEAD')
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            length = response.headers.get('Content-Length')
+        if length is None:
+            raise TransferError(f"Server did not report the size of {self.url}")
+        return int(length)
+
+    def open(self, offset: int) -> BinaryIO:
+        """Open the source positioned at offset, using a Range request when resuming"""
+        request = urllib.request.Request(self.url)
+        if offset:
+            request.add_header('Range', f"bytes={offset}-")
+        response = urllib.request.urlopen(request, timeout=self.timeout)
+
+        if offset and response.status != 206:
+            # The server ignored the Range header and is sending the whole file; skip what we already have
+            remaining = offset
+            while remaining:
+                block = response.read(min(CHUNK_SIZE, remaining))
+                if not block:
+                    response.close()
+                    raise TransferError(f"Update file on the server is smaller than expected: {self.url}")
+                remaining -= len(block)
+        return response
+
+
+def open_source(location: str):
+    """Return the source for an update location: an http(s):// URL or a file path"""
+    if location.lower().startswith(('http://', 'https://')):
+        return HttpSource(location)
+    return DirectorySource(location)
+
+
+def _state_path(destination: str) -> str:
+    return f"{destination}.part.json"
+
+
+def _load_resume_offset(part_path: str, state_path: str, expected_size: int, expected_sha256: str) -> int:
+    """Return the verified offset of a previous partial download of the same file, or 0"""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('sha256') != expected_sha256 or state.get('size') != expected_size:
+            return 0
+        offset = int(state.get('offset', 0))
+        if not 0 <= offset <= os.path.getsize(part_path):
+            return 0
+        return offset
+    except (OSError, ValueError, TypeError, AttributeError):
+        return 0
+
+
+def _save_state(state_path: str, expected_size: int, expected_sha256: str, offset: int) -> None:
+    temp_path = f"{state_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'size': expected_size, 'sha256': expected_sha256, 'offset': offset}, f)
+    os.replace(temp_path, state_path)
+
+
+def has_partial(destination: str, expected_size: int, expected_sha256: str) -> bool:
+    """Check whether an interrupted download of this file can be resumed"""
+    return _load_resume_offset(f"{destination}.part", _state_path(destination), expected_size,
+                               expected_sha256.lower()) > 0
+
+
+def discard_partial(destination: str) -> None:
+    """Delete any partial download for destination"""
+    for path in (f"{destination}.part", _state_path(destination)):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def download(source, destination: str, expected_size: int, expected_sha256: str,
+             progress_callback: Optional[ProgressCallback] = None, cancel_event: Optional[threading.Event] = None,
+             chunk_size: int = CHUNK_SIZE, max_retries: int = MAX_RETRIES, retry_delay: float = RETRY_DELAY) -> str:
+    """Download source to destination, resuming a previous partial download and verifying the result.
+
+    Raises TransferError if the source cannot be read after max_retries
+    reconnects or its size or SHA-256 does not match, and TransferCancelled
+    if cancel_event is set. Returns destination.
+    """
+    expected_sha256 = expected_sha256.lower()
+    part_path = f"{destination}.part"
+    state_path = _state_path(destination)
+
+    offset = _load_resume_offset(part_path, state_path, expected_size, expected_sha256)
+    digest = hashlib.sha256()
+
+    # Re-hash the verified prefix from local disk; hash state cannot be saved between runs
+    mode = 'r+b' if offset else 'wb'
+    with open(part_path, mode) as part:
+        if offset:
+            remaining = offset
+            while remaining:
+                block = part.read(min(chunk_size, remaining))
+                if not block:
+                    raise TransferError("Partial download is shorter than its recorded offset")
+                digest.update(block)
+                remaining -= len(block)
+            part.truncate(offset)
+        part.seek(offset)
+
+        start_offset = offset
+        start_time = time.perf_counter()
+        retries = 0
+
+        while offset < expected_size:
+            try:
+                stream = source.open(offset)
+            except RETRYABLE_ERRORS as e:
+                retries = _retry_or_raise(e, retries, max_retries, retry_delay, cancel_event)
+                continue
+
+            try:
+                while offset < expected_size:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise TransferCancelled("Update download cancelled")
+
+                    block = stream.read(min(chunk_size, expected_size - offset))
+                    if not block:
+                        raise TransferError(f"Update file is smaller than expected ({offset} of {expected_size} bytes)")
+
+                    part.write(block)
+                    part.flush()
+                    os.fsync(part.fileno())
+                    digest.update(block)
+                    offset += len(block)
+                    retries = 0
+                    _save_state(state_path, expected_size, expected_sha256, offset)
+
+                    if progress_callback is not None:
+                        elapsed = time.perf_counter() - start_time
+                        rate = (offset - start_offset) / elapsed if elapsed > 0 else 0.0
+                        progress_callback(offset, expected_size, rate)
+            except RETRYABLE_ERRORS as e:
+                retries = _retry_or_raise(e, retries, max_retries, retry_delay, cancel_event)
+            finally:
+                stream.close()
+
+    if digest.hexdigest() != expected_sha256:
+        discard_partial(destination)
+        raise TransferError("Downloaded update does not match the published SHA-256; it has been discarded")
+
+    os.replace(part_path, destination)
+    try:
+        os.remove(state_path)
+    except OSError:
+        pass
+    return destination
+
+
+def _retry_or_raise(error: Exception, retries: int, max_retries: int, retry_delay: float,
+                    cancel_event: Optional[threading.Event]) -> int:
+    """Wait before reconnecting after a read error, or raise once the retries are used up"""
+    if retries >= max_retries:
+        raise TransferError(f"Update download interrupted: {error}")
+
+    print(f"Update download interrupted ({error}), retrying")
+    delay = retry_delay * (2 ** retries)
+    if cancel_event is not None:
+        if cancel_event.wait(delay):
+            raise TransferCancelled("Update download cancelled")
+    else:
+        time.sleep(delay)
+    return retries + 1
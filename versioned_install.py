@@ -0,0 +1,204 @@
+"""Side-by-side versioned installs switched through a pointer file.
+
+Each version lives in its own directory under the user installation::
+
+    versions/1.0.5/Primus Implant Report Generator.exe
+    versions/1.0.6/Primus Implant Report Generator.exe
+    current_version.json
+
+current_version.json names the active version and the one before it and is
+replaced atomically, so switching to an update or rolling back is a single
+rename and never leaves a half-copied executable behind. Updates are
+downloaded straight into their version directory, the running executable is
+adopted with a hard link instead of a copy, and the new version is started
+directly instead of from a batch script that waits for this one to exit.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+import update_manifest
+
+VERSIONS_DIRNAME = "versions"
+POINTER_FILENAME = "current_version.json"
+
+
+class InstallError(Exception):
+    """Raised when a version cannot be installed, activated or rolled back to"""
+
+
+class VersionedInstall:
+    """The versions installed under a user directory and the pointer to the active one"""
+
+    def __init__(self, root_dir: str, executable: str = update_manifest.DEFAULT_EXECUTABLE) -> None:
+        self.root_dir: str = root_dir
+        self.executable: str = executable
+        self.versions_dir: str = os.path.join(root_dir, VERSIONS_DIRNAME)
+        self.pointer_file: str = os.path.join(root_dir, POINTER_FILENAME)
+
+    def version_dir(self, version: str) -> str:
+        return os.path.join(self.versions_dir, version)
+
+    def executable_path(self, version: str) -> str:
+        return os.path.join(self.version_dir(version), self.executable)
+
+    def read_pointer(self) -> Dict[str, Any]:
+        """Return the pointer file contents, or {} if there is none or it is unreadable"""
+        try:
+            with open(self.pointer_file, 'r', encoding='utf-8') as f:
+                pointer = json.load(f)
+            if isinstance(pointer, dict):
+                return pointer
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def current(self) -> Optional[Dict[str, str]]:
+        """Return {'version', 'path'} of the active version, or None"""
+        return self._entry('current')
+
+    def previous(self) -> Optional[Dict[str, str]]:
+        """Return {'version', 'path'} of the version to roll back to, or None"""
+        return self._entry('previous')
+
+    def _entry(self, key: str) -> Optional[Dict[str, str]]:
+        entry = self.read_pointer().get(key)
+        if isinstance(entry, dict) and isinstance(entry.get('version'), str) and isinstance(entry.get('path'), str):
+            return entry
+        return None
+
+    def _write_pointer(self, current: Dict[str, str], previous: Optional[Dict[str, str]]) -> None:
+        """Replace the pointer file atomically"""
+        os.makedirs(self.root_dir, exist_ok=True)
+        temp_path = f"{self.pointer_file}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'current': current, 'previous': previous}, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.pointer_file)
+
+    def adopt(self, version: str, exe_path: str) -> Dict[str, str]:
+        """Record an executable installed outside versions/ (an older single-file install) as a version.
+
+        The executable is hard-linked into its version directory, so the
+        original can later be replaced or removed without losing it. Where
+        hard links are not possible the original path is recorded instead.
+        """
+        target = self.executable_path(version)
+        if os.path.normcase(os.path.abspath(exe_path)) == os.path.normcase(os.path.abspath(target)):
+            return {'version': version, 'path': target}
+
+        if not os.path.exists(target):
+            os.makedirs(self.version_dir(version), exist_ok=True)
+            try:
+                os.link(exe_path, target)
+            except OSError as e:
+                print(f"Could not link {exe_path} into {target}: {e}")
+                return {'version': version, 'path': exe_path}
+        return {'version': version, 'path': target}
+
+    def stage_path(self, version: str) -> str:
+        """Return the path an update for version should be downloaded to, creating its directory"""
+        os.makedirs(self.version_dir(version), exist_ok=True)
+        return self.executable_path(version)
+
+    def activate(self, version: str, running_version: str, running_exe: str,
+                 expected_sha256: Optional[str] = None) -> Dict[str, str]:
+        """Make an installed version the active one; the running version becomes the rollback target.
+
+        The staged executable is checked against expected_sha256 before the
+        pointer is switched. Returns the new current entry.
+        """
+        exe_path = self.executable_path(version)
+        if not os.path.isfile(exe_path):
+            raise InstallError(f"Version {version} is not installed")
+        if expected_sha256 and update_manifest.file_sha256(exe_path) != expected_sha256.lower():
+            shutil.rmtree(self.version_dir(version), ignore_errors=True)
+            raise InstallError("Update file does not match the published SHA-256; it has been discarded")
+
+        current = {'version': version, 'path': exe_path}
+        previous = self.current()
+        if previous is None or previous['version'] != running_version:
+            previous = self.adopt(running_version, running_exe)
+        if previous['version'] == version:
+            previous = self.previous()
+
+        self._write_pointer(current, previous)
+        return current
+
+    def rollback(self) -> Dict[str, str]:
+        """Swap the active and previous versions, returning the entry that is now current"""
+        current, previous = self.current(), self.previous()
+        if previous is None or not os.path.isfile(previous['path']):
+            raise InstallError("No previous version is installed")
+        self._write_pointer(previous, current)
+        return previous
+
+    def is_managed(self, exe_path: str) -> bool:
+        """Check whether an executable is one of the installed versions"""
+        versions_dir = os.path.normcase(os.path.abspath(self.versions_dir)) + os.sep
+        return os.path.normcase(os.path.abspath(exe_path)).startswith(versions_dir)
+
+    def launch_target(self, running_exe: str) -> Optional[str]:
+        """Return the active executable if it exists and is not the running one, else None"""
+        current = self.current()
+        if current is None or not os.path.isfile(current['path']):
+            return None
+        if os.path.normcase(os.path.abspath(current['path'])) == os.path.normcase(os.path.abspath(running_exe)):
+            return None
+        return current['path']
+
+    def prune(self, running_version: str) -> List[str]:
+        """Delete version directories older than the running version, returning those removed.
+
+        The current, previous and running versions are always kept, as is any
+        newer version or directory holding a download that can still resume.
+        Directories still in use (a running executable) are skipped and
+        retried next time.
+        """
+        if not os.path.isdir(self.versions_dir):
+            return []
+
+        kept = {os.path.normcase(os.path.abspath(os.path.dirname(entry['path'])))
+                for entry in (self.current(), self.previous()) if entry is not None}
+        kept.add(os.path.normcase(os.path.abspath(self.version_dir(running_version))))
+
+        removed = []
+        for name in os.listdir(self.versions_dir):
+            path = os.path.join(self.versions_dir, name)
+            if not os.path.isdir(path) or os.path.normcase(os.path.abspath(path)) in kept:
+                continue
+            # Only versions known to be older than the running one are candidates
+            if not update_manifest.is_newer_version(running_version, name):
+                continue
+            if self._has_resumable_download(path):
+                continue
+            try:
+                shutil.rmtree(path)
+                removed.append(path)
+            except OSError as e:
+                print(f"Could not remove old version {path}: {e}")
+        return removed
+
+    @staticmethod
+    def _has_resumable_download(path: str) -> bool:
+        try:
+            return any(name.endswith('.part.json') for name in os.listdir(path))
+        except OSError:
+            return True
+
+
+def launch(exe_path: str, cwd: str, args: Tuple[str, ...] = ()) -> subprocess.Popen:
+    """Start an installed version detached from this process.
+
+    cwd should be the user installation directory: data files, the logo and
+    the window icon are looked up relative to it, not to versions/<version>/.
+    """
+    creationflags = 0
+    if sys.platform.startswith('win'):
+        creationflags = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    return subprocess.Popen([exe_path, *args], cwd=cwd, close_fds=True,
+                            creationflags=creationflags)